@@ -0,0 +1,173 @@
+"""Decode uploaded audio straight to mono float32 at the analysis sample rate.
+
+``librosa.load`` on a ``BytesIO`` falls back to audioread for anything libsndfile
+cannot read, which spawns ffmpeg, writes a temporary file and then resamples in
+Python. Here WAV/FLAC/OGG are read by libsndfile into a preallocated buffer, and
+compressed formats go through a single ffmpeg process that reads the upload on
+stdin and writes 16 kHz mono ``f32le`` on stdout, so ffmpeg does the resampling
+and nothing touches disk.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+AUDIO_DECODE_TIMEOUT_SECONDS = float(os.getenv("AUDIO_DECODE_TIMEOUT_SECONDS", "30"))
+
+SNDFILE_TYPES = {"audio/wav", "audio/flac", "audio/ogg"}
+FFMPEG_TYPES = {"audio/mpeg", "audio/webm", "audio/aac"}
+
+_READ_CHUNK_SAMPLES = 64 * 1024
+_FEED_CHUNK_BYTES = 64 * 1024
+
+AudioSource = Union[bytes, BinaryIO]
+
+logger = logging.getLogger("namo_nexus.audio_decoder")
+
+
+class AudioDecodeError(ValueError):
+    """Raised when no decoder could turn the upload into samples."""
+
+
+def _open(source: AudioSource) -> BinaryIO:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def _decode_sndfile(source: AudioSource, sample_rate: int) -> np.ndarray:
+    with sf.SoundFile(_open(source)) as handle:
+        native_rate = handle.samplerate
+        channels = handle.channels
+        buffer = np.empty((handle.frames, channels), dtype=np.float32)
+        read = handle.read(out=buffer)
+    frames = read.shape[0]
+    if channels == 1:
+        y = buffer[:frames, 0]
+    else:
+        y = np.empty(frames, dtype=np.float32)
+        np.mean(buffer[:frames], axis=1, out=y)
+    if native_rate != sample_rate:
+        import librosa
+
+        y = librosa.resample(y, orig_sr=native_rate, target_sr=sample_rate)
+    return np.ascontiguousarray(y, dtype=np.float32)
+
+
+def _decode_ffmpeg(source: AudioSource, sample_rate: int) -> np.ndarray:
+    binary = shutil.which(FFMPEG_BINARY)
+    if binary is None:
+        raise AudioDecodeError(f"{FFMPEG_BINARY} not found")
+    process = subprocess.Popen(
+        [
+            binary,
+            "-nostdin",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            "pipe:0",
+            "-f",
+            "f32le",
+            "-acodec",
+            "pcm_f32le",
+            "-ac",
+            "1",
+            "-ar",
+            str(sample_rate),
+            "pipe:1",
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    def _feed() -> None:
+        try:
+            shutil.copyfileobj(_open(source), process.stdin, _FEED_CHUNK_BYTES)
+        except (BrokenPipeError, OSError):
+            pass  # ffmpeg exited early; its return code carries the error
+        finally:
+            process.stdin.close()
+
+    stderr: List[bytes] = []
+    feeder = threading.Thread(target=_feed, name="ffmpeg-feed", daemon=True)
+    drainer = threading.Thread(
+        target=lambda: stderr.append(process.stderr.read()),
+        name="ffmpeg-stderr",
+        daemon=True,
+    )
+    feeder.start()
+    drainer.start()
+
+    # Output is read straight into a float32 buffer that doubles when full.
+    timer = threading.Timer(AUDIO_DECODE_TIMEOUT_SECONDS, process.kill)
+    timer.start()
+    try:
+        samples = np.empty(max(sample_rate * 10, _READ_CHUNK_SAMPLES), dtype=np.float32)
+        filled = 0  # bytes
+        while True:
+            view = memoryview(samples).cast("B")
+            if filled == len(view):
+                grown = np.empty(samples.size * 2, dtype=np.float32)
+                grown[: samples.size] = samples
+                samples = grown
+                continue
+            count = process.stdout.readinto(view[filled:])
+            if not count:
+                break
+            filled += count
+        returncode = process.wait()
+    finally:
+        timer.cancel()
+        process.stdout.close()
+        feeder.join()
+        drainer.join()
+    if returncode != 0:
+        message = b"".join(stderr).decode("utf-8", "replace").strip()
+        raise AudioDecodeError(f"ffmpeg exited with {returncode}: {message[-500:]}")
+    return samples[: filled // 4]
+
+
+_Decoder = Callable[[AudioSource, int], np.ndarray]
+_DECODERS: Dict[str, _Decoder] = {"sndfile": _decode_sndfile, "ffmpeg": _decode_ffmpeg}
+
+
+def _decoder_order(content_type: Optional[str]) -> Tuple[str, ...]:
+    # The declared type picks the first decoder; the other covers mislabelled
+    # uploads, and libsndfile reads MP3 itself when ffmpeg is not installed.
+    if content_type in FFMPEG_TYPES:
+        return ("ffmpeg", "sndfile")
+    return ("sndfile", "ffmpeg")
+
+
+def decode_audio(
+    source: AudioSource, sample_rate: int = 16000, content_type: Optional[str] = None
+) -> np.ndarray:
+    """Decode ``source`` to a mono float32 waveform at ``sample_rate``.
+
+    ``source`` is the encoded file as bytes or as a seekable binary file
+    object, which is read in place (e.g. an upload's spooled temporary file).
+
+    Raises:
+        AudioDecodeError: if neither libsndfile nor ffmpeg could decode it
+    """
+    errors = []
+    for name in _decoder_order(content_type):
+        try:
+            return _DECODERS[name](source, sample_rate)
+        except Exception as exc:  # noqa: BLE001 - try the next decoder
+            errors.append(f"{name}: {exc}")
+    logger.debug("audio_decode_failed content_type=%s errors=%s", content_type, errors)
+    raise AudioDecodeError("; ".join(errors))
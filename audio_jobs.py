@@ -0,0 +1,387 @@
+"""Asynchronous audio triage jobs.
+
+``POST /triage/audio/jobs`` copies the upload into a spooled temporary file,
+records a ``queued`` job and answers 202 with its id straight away, so the time
+a client holds a connection no longer grows with the length of the recording.
+``AudioJobRunner`` workers on the event loop then run the same decode,
+transcription and triage path as ``/triage/audio``. Clients poll
+``GET /triage/audio/jobs/{job_id}`` or pass a ``callback_url``, which is POSTed
+the finished job; callbacks are only sent to hosts in
+``AUDIO_JOB_CALLBACK_HOSTS`` (local by default).
+
+Job state lives in Redis when ``REDIS_URL`` is set, otherwise in the SQLite
+file ``AUDIO_JOB_DB_PATH``, so any API worker can answer a poll. Jobs expire
+``AUDIO_JOB_TTL_SECONDS`` after their last update: Redis drops the key, SQLite
+rows are purged by the runner every ``AUDIO_JOB_CLEANUP_INTERVAL_SECONDS``.
+Queued jobs are held in memory by the worker that accepted them and do not
+survive a restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import redis
+
+from metrics import AUDIO_JOBS
+
+AUDIO_JOB_WORKERS = int(os.getenv("AUDIO_JOB_WORKERS", "2"))
+AUDIO_JOB_QUEUE_SIZE = int(os.getenv("AUDIO_JOB_QUEUE_SIZE", "32"))
+AUDIO_JOB_TTL_SECONDS = int(os.getenv("AUDIO_JOB_TTL_SECONDS", "3600"))
+AUDIO_JOB_CLEANUP_INTERVAL_SECONDS = float(
+    os.getenv("AUDIO_JOB_CLEANUP_INTERVAL_SECONDS", "60")
+)
+AUDIO_JOB_DB_PATH = os.getenv(
+    "AUDIO_JOB_DB_PATH", os.path.join("data", "audio_jobs.db")
+)
+AUDIO_JOB_CALLBACK_HOSTS = os.getenv(
+    "AUDIO_JOB_CALLBACK_HOSTS", "localhost,127.0.0.1,::1"
+)
+AUDIO_JOB_CALLBACK_TIMEOUT_SECONDS = float(
+    os.getenv("AUDIO_JOB_CALLBACK_TIMEOUT_SECONDS", "5")
+)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# Same as Starlette's upload spool: small clips stay in memory.
+_SPOOL_MAX_BYTES = 1024 * 1024
+
+logger = logging.getLogger("namo_nexus.audio_jobs")
+
+# (spooled audio, sniffed content type, form fields) -> JSON-ready result
+JobProcessor = Callable[[BinaryIO, str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class AudioJobQueueFull(RuntimeError):
+    """Raised when every job worker is busy and the queue is full."""
+
+    def __init__(self) -> None:
+        super().__init__("Audio job queue is full")
+
+
+@dataclass
+class AudioJob:
+    job_id: str
+    status: str
+    created_at: float
+    updated_at: float
+    callback_url: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AudioJob":
+        return cls(**data)
+
+
+class AudioJobStore:
+    def save(self, job: AudioJob, ttl_seconds: int) -> None:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[AudioJob]:
+        raise NotImplementedError
+
+    def purge_expired(self) -> int:
+        """Delete expired jobs; returns how many were removed."""
+        return 0
+
+    def ping(self) -> bool:
+        raise NotImplementedError
+
+
+class SQLiteAudioJobStore(AudioJobStore):
+    def __init__(self, db_path: str = AUDIO_JOB_DB_PATH) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS audio_jobs ("
+                "job_id TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_audio_jobs_expires ON audio_jobs(expires_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; store calls run via asyncio.to_thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, job: AudioJob, ttl_seconds: int) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO audio_jobs (job_id, payload, expires_at) VALUES (?, ?, ?)",
+                (job.job_id, json.dumps(job.to_dict()), job.updated_at + ttl_seconds),
+            )
+
+    def get(self, job_id: str) -> Optional[AudioJob]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT payload FROM audio_jobs WHERE job_id = ? AND expires_at > ?",
+                (job_id, time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return AudioJob.from_dict(json.loads(row[0]))
+
+    def purge_expired(self) -> int:
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM audio_jobs WHERE expires_at <= ?", (time.time(),)
+            )
+        return cursor.rowcount
+
+    def ping(self) -> bool:
+        self._connection().execute("SELECT 1")
+        return True
+
+
+class RedisAudioJobStore(AudioJobStore):
+    def __init__(self, client: redis.Redis, prefix: str = "namo:audio_job:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def save(self, job: AudioJob, ttl_seconds: int) -> None:
+        self.client.set(
+            name=self.prefix + job.job_id,
+            value=json.dumps(job.to_dict()),
+            ex=ttl_seconds,
+        )
+
+    def get(self, job_id: str) -> Optional[AudioJob]:
+        raw = self.client.get(self.prefix + job_id)
+        if raw is None:
+            return None
+        return AudioJob.from_dict(json.loads(raw))
+
+    def ping(self) -> bool:
+        return bool(self.client.ping())
+
+
+def build_job_store_from_env() -> AudioJobStore:
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return SQLiteAudioJobStore()
+    client = redis.Redis.from_url(redis_url, decode_responses=False)
+    return RedisAudioJobStore(client)
+
+
+def validate_callback_url(url: str, allowed_hosts: List[str]) -> str:
+    """Return ``url`` if it is http(s) to an allowed host, else raise ValueError."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("callback_url must be an http(s) URL")
+    if parts.hostname.lower() not in allowed_hosts:
+        raise ValueError(f"callback_url host {parts.hostname!r} is not allowed")
+    return url
+
+
+class AudioJobRunner:
+    def __init__(
+        self,
+        store: AudioJobStore,
+        process: JobProcessor,
+        workers: int = AUDIO_JOB_WORKERS,
+        queue_size: int = AUDIO_JOB_QUEUE_SIZE,
+        ttl_seconds: int = AUDIO_JOB_TTL_SECONDS,
+        cleanup_interval: float = AUDIO_JOB_CLEANUP_INTERVAL_SECONDS,
+        callback_hosts: str = AUDIO_JOB_CALLBACK_HOSTS,
+        callback_timeout: float = AUDIO_JOB_CALLBACK_TIMEOUT_SECONDS,
+    ) -> None:
+        self.store = store
+        self.process = process
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.ttl_seconds = ttl_seconds
+        self.cleanup_interval = cleanup_interval
+        self.callback_hosts = [
+            h.strip().lower() for h in callback_hosts.split(",") if h.strip()
+        ]
+        self.callback_timeout = callback_timeout
+        self._queue: Optional[
+            "asyncio.Queue[Tuple[AudioJob, BinaryIO, str, Dict[str, Any]]]"
+        ] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the workers on the running loop; call from inside it."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._work(), name=f"audio-job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._tasks.append(loop.create_task(self._cleanup(), name="audio-job-cleanup"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                job, audio, _, _ = self._queue.get_nowait()
+                audio.close()
+                await self._finish(
+                    job, JOB_FAILED, error="Server shut down before the job ran"
+                )
+            self._queue = None
+
+    def saturated(self) -> bool:
+        return self._queue is None or self._queue.full()
+
+    async def submit(
+        self,
+        audio: BinaryIO,
+        content_type: str,
+        params: Dict[str, Any],
+        callback_url: Optional[str] = None,
+    ) -> AudioJob:
+        """Spool ``audio`` and queue it; returns the ``queued`` job.
+
+        Raises:
+            AudioJobQueueFull: when the runner cannot take more jobs
+            ValueError: when ``callback_url`` is not an allowed local URL
+        """
+        if callback_url:
+            validate_callback_url(callback_url, self.callback_hosts)
+        if self.saturated():
+            AUDIO_JOBS.labels(status="rejected").inc()
+            raise AudioJobQueueFull()
+        spool = await asyncio.to_thread(_spool, audio)
+        now = time.time()
+        job = AudioJob(uuid.uuid4().hex, JOB_QUEUED, now, now, callback_url or None)
+        try:
+            await asyncio.to_thread(self.store.save, job, self.ttl_seconds)
+            self._queue.put_nowait((job, spool, content_type, params))
+        except asyncio.QueueFull:
+            # Filled up while the upload was being spooled.
+            spool.close()
+            job.status, job.error = JOB_FAILED, "Audio job queue is full"
+            await asyncio.to_thread(self.store.save, job, self.ttl_seconds)
+            AUDIO_JOBS.labels(status="rejected").inc()
+            raise AudioJobQueueFull() from None
+        except BaseException:
+            spool.close()
+            raise
+        AUDIO_JOBS.labels(status=JOB_QUEUED).inc()
+        return job
+
+    async def get(self, job_id: str) -> Optional[AudioJob]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def _work(self) -> None:
+        while True:
+            job, audio, content_type, params = await self._queue.get()
+            try:
+                await self._run(job, audio, content_type, params)
+            except Exception:
+                logger.exception("audio_job_failed job_id=%s", job.job_id)
+            finally:
+                audio.close()
+                self._queue.task_done()
+
+    async def _run(
+        self, job: AudioJob, audio: BinaryIO, content_type: str, params: Dict[str, Any]
+    ) -> None:
+        job.status = JOB_RUNNING
+        job.updated_at = time.time()
+        await asyncio.to_thread(self.store.save, job, self.ttl_seconds)
+        try:
+            result = await self.process(audio, content_type, params)
+        except Exception as exc:
+            detail = getattr(exc, "detail", None) or str(exc) or type(exc).__name__
+            logger.warning("audio_job_error job_id=%s error=%s", job.job_id, detail)
+            await self._finish(job, JOB_FAILED, error=str(detail))
+        else:
+            await self._finish(job, JOB_SUCCEEDED, result=result)
+
+    async def _finish(
+        self,
+        job: AudioJob,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        job.status = status
+        job.result = result
+        job.error = error
+        job.updated_at = time.time()
+        await asyncio.to_thread(self.store.save, job, self.ttl_seconds)
+        AUDIO_JOBS.labels(status=status).inc()
+        if job.callback_url:
+            await self._notify(job)
+
+    async def _notify(self, job: AudioJob) -> None:
+        try:
+            async with httpx.AsyncClient(timeout=self.callback_timeout) as client:
+                response = await client.post(job.callback_url, json=job.to_dict())
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            # The result stays pollable; a failed callback is not retried.
+            logger.warning(
+                "audio_job_callback_failed job_id=%s error=%s", job.job_id, exc
+            )
+
+    async def _cleanup(self) -> None:
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            try:
+                removed = await asyncio.to_thread(self.store.purge_expired)
+            except Exception:
+                logger.exception("audio_job_cleanup_failed")
+                continue
+            if removed:
+                logger.info("audio_jobs_purged count=%d", removed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+        }
+
+
+def _spool(audio: BinaryIO) -> BinaryIO:
+    # The upload's own spool is closed when the request ends, so copy it.
+    audio.seek(0)
+    spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES)
+    shutil.copyfileobj(audio, spool)
+    spool.seek(0)
+    return spool
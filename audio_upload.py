@@ -0,0 +1,123 @@
+"""Bounded intake for audio uploads.
+
+``BodySizeLimitMiddleware`` enforces the size cap while the request is being
+received: a declared ``Content-Length`` over the limit is refused before any of
+the body is read, and a chunked body is cut off with 413 the moment it crosses
+the limit. Under the cap, Starlette's multipart parser spools the file part to a
+``SpooledTemporaryFile`` that keeps at most 1 MB in memory and rolls over to
+disk, and the decoder reads from that file object directly, so the payload is
+never copied into ``bytes``. ``sniff_audio_type`` checks the container magic
+bytes so non-audio content is rejected before any decoding starts.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Dict, Optional
+
+from starlette.exceptions import HTTPException
+
+MAX_AUDIO_SIZE = 5 * 1024 * 1024  # 5MB
+# Room for the other form fields (message is capped at 5k characters) and the
+# multipart boundaries around the file part.
+AUDIO_FORM_OVERHEAD_BYTES = 64 * 1024
+SNIFF_BYTES = 16
+
+
+class RequestBodyTooLarge(HTTPException):
+    """Raised from ``receive`` once the body crosses the limit.
+
+    An ``HTTPException`` so FastAPI re-raises it from form parsing unchanged
+    (anything else becomes a 400) and the exception handlers render the 413.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(status_code=413, detail="File too large")
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies over a per-path byte limit while they stream in."""
+
+    def __init__(self, app, limits: Dict[str, int]) -> None:  # type: ignore[no-untyped-def]
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):  # type: ignore[no-untyped-def]
+        limit = (
+            self.limits.get(scope.get("path", "")) if scope["type"] == "http" else None
+        )
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > limit:
+                    await _send_too_large(send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():  # type: ignore[no-untyped-def]
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise RequestBodyTooLarge()
+            return message
+
+        async def tracking_send(message):  # type: ignore[no-untyped-def]
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except RequestBodyTooLarge:
+            if response_started:
+                raise
+            await _send_too_large(send)
+
+
+async def _send_too_large(send) -> None:  # type: ignore[no-untyped-def]
+    body = json.dumps({"detail": "File too large"}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def sniff_audio_type(header: bytes) -> Optional[str]:
+    """Audio MIME type from the first ``SNIFF_BYTES`` of a file, or None."""
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "audio/wav"
+    if header[:4] == b"fLaC":
+        return "audio/flac"
+    if header[:4] == b"OggS":
+        return "audio/ogg"
+    if header[:4] == b"\x1a\x45\xdf\xa3":  # EBML, the Matroska/WebM container
+        return "audio/webm"
+    if header[:3] == b"ID3":
+        return "audio/mpeg"
+    if header[:4] == b"ADIF" or header[4:8] == b"ftyp":  # raw AAC, or AAC in MP4/M4A
+        return "audio/aac"
+    if len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0:
+        # Frame sync: layer bits 00 mean an ADTS (AAC) header, anything else MPEG audio.
+        return "audio/aac" if header[1] & 0x06 == 0 else "audio/mpeg"
+    return None
@@ -7,6 +7,8 @@ from typing import Any, Optional
 
 import redis
 
+from stage_timing import timed
+
 DEFAULT_CACHE_TTL = int(os.getenv("CACHE_TTL_SECONDS", "30"))
 
 
@@ -23,12 +25,14 @@ class CacheBackend:
     def ping(self) -> bool:
         raise NotImplementedError
 
+    @timed("cache.get")
     def get_json(self, key: str) -> Optional[Any]:
         raw = self.get(key)
         if raw is None:
             return None
         return json.loads(raw)
 
+    @timed("cache.set")
     def set_json(self, key: str, value: Any, ttl_seconds: int) -> None:
         self.set(key, json.dumps(value), ttl_seconds)
 
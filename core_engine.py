@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from models import MultiModalAnalysis
 from src.i18n import load_locale
+from stage_timing import Span, timed
 
 PHI = (1 + 5**0.5) / 2
 INV_PHI = PHI - 1
@@ -22,6 +24,11 @@ def calculate_harmonic_risk(primary_risk: float, secondary_risk: float) -> float
     return max(0.0, min(1.0, blended))
 
 
+def _insight_key(prefix: str) -> str:
+    """Lake key that stays unique when many insights share a timestamp (batches)."""
+    return f"{prefix}_{datetime.utcnow().timestamp()}_{uuid.uuid4().hex[:12]}"
+
+
 class DhammicDataLake:
     """Central dharma ruleset and lightweight insight store."""
 
@@ -32,6 +39,7 @@ class DhammicDataLake:
         self.logger = logging.getLogger("namo_nexus.datalake")
         self.cache: Dict[str, Dict[str, Any]] = {}
 
+    @timed("lake.store_insight")
     async def store_insight(self, key: str, data: Any) -> bool:
         try:
             self.cache[key] = {
@@ -103,6 +111,7 @@ class MultiModalTriageEngine:
         if facial_features is not None and not isinstance(facial_features, dict):
             raise TypeError(f"Facial features must be dict, got {type(facial_features)}")
 
+    @timed("triage.text")
     async def _analyze_text_ml_ready(self, text: str) -> Dict[str, Any]:
         # ML-ready hook: swap keyword matching with transformer inference later.
         text_lower = text.lower()
@@ -154,6 +163,12 @@ class MultiModalTriageEngine:
             "method": "keyword_matching",
         }
 
+    async def _analyze_text_batch_ml_ready(self, texts: List[str]) -> List[Dict[str, Any]]:
+        # ML-ready hook: one batched inference call per micro-batch once a model
+        # replaces keyword matching; until then, message by message.
+        return [await self._analyze_text_ml_ready(text) for text in texts]
+
+    @timed("triage.voice")
     async def _analyze_voice_ml_ready(self, voice_features: Dict[str, float]) -> Dict[str, Any]:
         if not voice_features:
             return {
@@ -202,6 +217,7 @@ class MultiModalTriageEngine:
             "method": "feature_heuristics",
         }
 
+    @timed("triage.facial")
     async def _analyze_facial_ml_ready(self, facial_features: Dict[str, float]) -> Dict[str, Any]:
         if not facial_features:
             return {"risk_score": 0.0, "confidence": 0.0, "method": "no_data"}
@@ -234,6 +250,7 @@ class MultiModalTriageEngine:
         analysis = await self._analyze_facial_ml_ready(facial_features or {})
         return analysis["risk_score"]
 
+    @timed("governor.fusion")
     async def multimodal_fusion(
         self,
         text: str,
@@ -282,7 +299,7 @@ class MultiModalTriageEngine:
             )
 
             await self.dhammic_lake.store_insight(
-                key=f"triage_{datetime.utcnow().timestamp()}",
+                key=_insight_key("triage"),
                 data={
                     "text": text_analysis,
                     "voice": voice_analysis,
@@ -296,6 +313,7 @@ class MultiModalTriageEngine:
                 "Multimodal fusion complete score=%.3f confidence=%.2f",
                 combined,
                 confidence,
+                extra={"log_key": "triage.fusion", "crisis": combined > 0.7},
             )
             return result
         except Exception as exc:
@@ -303,6 +321,59 @@ class MultiModalTriageEngine:
             raise
 
 
+    @timed("governor.fusion_batch")
+    async def multimodal_fusion_batch(
+        self,
+        items: Sequence[Tuple[str, Optional[Dict], Optional[Dict]]],
+    ) -> List[Union[MultiModalAnalysis, Exception]]:
+        """``multimodal_fusion`` for many messages, with the numeric part vectorized.
+
+        Gives the same analyses, and stores the same lake insights, as the scalar
+        path (see fusion_kernel); an item that fails validation gets its
+        exception in its place.
+        """
+        from fusion_kernel import FACIAL_FEATURES, VOICE_FEATURES, fuse, pack_features
+
+        results: List[Union[MultiModalAnalysis, Exception]] = []
+        valid = []
+        for item in items:
+            try:
+                self._validate_input(*item)
+            except (TypeError, ValueError) as exc:
+                results.append(exc)
+            else:
+                results.append(None)
+                valid.append(item)
+        if not valid:
+            return results
+
+        text_analyses = await self._analyze_text_batch_ml_ready([text for text, _, _ in valid])
+        voice_values, voice_present = pack_features([v for _, v, _ in valid], VOICE_FEATURES)
+        facial_values, facial_present = pack_features([f for _, _, f in valid], FACIAL_FEATURES)
+        batch = fuse(
+            [analysis["risk_score"] for analysis in text_analyses],
+            [analysis["confidence"] for analysis in text_analyses],
+            voice_values,
+            voice_present,
+            facial_values,
+            facial_present,
+        )
+        for insight in batch.insights(text_analyses):
+            await self.dhammic_lake.store_insight(key=_insight_key("triage"), data=insight)
+        analyses = iter(batch.analyses())
+        results = [next(analyses) if result is None else result for result in results]
+        for result in results:
+            if isinstance(result, MultiModalAnalysis):
+                # Same line as the scalar path, so crisis sampling treats them alike.
+                self.logger.info(
+                    "Multimodal fusion complete score=%.3f confidence=%.2f",
+                    result.combined_risk,
+                    result.confidence,
+                    extra={"log_key": "triage.fusion", "crisis": result.combined_risk > 0.7},
+                )
+        return results
+
+
 class EthicalCalibrationKernel:
     """Dhammic moat calibration for tone and safety."""
 
@@ -321,6 +392,7 @@ class EthicalCalibrationKernel:
             return "scheduled_support"
         return "monitoring"
 
+    @timed("governor.calibrate")
     async def calibrate(self, text: str, multimodal: MultiModalAnalysis) -> Dict[str, Any]:
         text_lower = text.lower()
         dharma = self.lake.calculate_dharma_alignment(text)
@@ -361,6 +433,7 @@ class EthicalCalibrationKernel:
             "Ethics calibrated risk=%s recommendation=%s",
             result["risk_level"],
             recommendation,
+            extra={"log_key": "ethics.calibrated", "crisis": result["requires_human"]},
         )
         return result
 
@@ -389,6 +462,7 @@ class HarmonicGovernor:
 
         return Auditor()
 
+    @timed("governor.orchestrate")
     async def orchestrate(
         self,
         message: str,
@@ -400,32 +474,64 @@ class HarmonicGovernor:
             multimodal = await self.agents["triage"].multimodal_fusion(
                 message, voice_features, facial_features
             )
-            ethics = await self.agents["ethics"].calibrate(message, multimodal)
+            return await self._govern(message, multimodal, timestamp)
+        except Exception as exc:
+            self.logger.error("Orchestration failed: %s", exc, exc_info=True)
+            raise
+
+    async def _govern(
+        self, message: str, multimodal: MultiModalAnalysis, timestamp: str
+    ) -> Dict[str, Any]:
+        """Ethics calibration and audit of a fused analysis."""
+        ethics = await self.agents["ethics"].calibrate(message, multimodal)
+        with Span("governor.audit"):
             audit = self.agents["auditor"].audit(ethics)
 
-            if audit["needs_healing"]:
-                ethics["dharma_score"] = 0.5
+        if audit["needs_healing"]:
+            ethics["dharma_score"] = 0.5
 
-            await self.agents["triage"].dhammic_lake.store_insight(
-                key=f"orchestrate_{datetime.utcnow().timestamp()}",
-                data={
-                    "ethics": ethics,
-                    "audit": audit,
-                    "multimodal": {
-                        "combined_risk": multimodal.combined_risk,
-                        "confidence": multimodal.confidence,
-                        "risk_factors": multimodal.risk_factors or [],
-                    },
-                },
-            )
-
-            return {
-                "multimodal": multimodal,
+        await self.agents["triage"].dhammic_lake.store_insight(
+            key=_insight_key("orchestrate"),
+            data={
                 "ethics": ethics,
                 "audit": audit,
-                "timestamp": timestamp,
-                "phi_version": f"{PHI:.11f}",
-            }
-        except Exception as exc:
-            self.logger.error("Orchestration failed: %s", exc, exc_info=True)
-            raise
+                "multimodal": {
+                    "combined_risk": multimodal.combined_risk,
+                    "confidence": multimodal.confidence,
+                    "risk_factors": multimodal.risk_factors or [],
+                },
+            },
+        )
+
+        return {
+            "multimodal": multimodal,
+            "ethics": ethics,
+            "audit": audit,
+            "timestamp": timestamp,
+            "phi_version": f"{PHI:.11f}",
+        }
+
+    @timed("governor.orchestrate_batch")
+    async def orchestrate_batch(
+        self,
+        items: Sequence[Tuple[str, Optional[Dict], Optional[Dict]]],
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Orchestrate ``(message, voice_features, facial_features)`` items in order.
+
+        Fusion runs once for the whole batch (``multimodal_fusion_batch``). An
+        item that fails gets its exception in its place, so one bad item does
+        not cost the rest of the batch.
+        """
+        timestamp = datetime.utcnow().isoformat()
+        fused = await self.agents["triage"].multimodal_fusion_batch(items)
+        results: List[Union[Dict[str, Any], Exception]] = []
+        for (message, _, _), multimodal in zip(items, fused):
+            if isinstance(multimodal, Exception):
+                results.append(multimodal)
+                continue
+            try:
+                results.append(await self._govern(message, multimodal, timestamp))
+            except Exception as exc:  # noqa: BLE001 - reported per item
+                self.logger.error("Orchestration failed: %s", exc, exc_info=True)
+                results.append(exc)
+        return results
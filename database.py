@@ -14,6 +14,7 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from cache import CacheBackend, DEFAULT_CACHE_TTL, InMemoryCache
 from src.i18n import load_locale
+from stage_timing import timed
 
 try:
     from pysqlcipher3 import dbapi2 as sqlcipher
@@ -252,6 +253,12 @@ class DatabaseConnectionPool:
         raise last_error or RuntimeError("Database query failed")
 
     def execute_many(self, query: str, params_list: List[Tuple[Any, ...]]) -> int:
+        return self.execute_batch([(query, params_list)])
+
+    def execute_batch(
+        self, statements: Sequence[Tuple[str, Sequence[Tuple[Any, ...]]]]
+    ) -> int:
+        """Run each ``(query, params_list)`` with executemany in one transaction."""
         if self._closed:
             raise RuntimeError("Database connection pool is closed")
         last_error: Optional[Exception] = None
@@ -261,9 +268,15 @@ class DatabaseConnectionPool:
                 with self._acquire_with_timeout():
                     conn = self._get_or_create_conn()
                     cursor = conn.cursor()
-                    cursor.executemany(query, params_list)
-                    conn.commit()
-                    affected_rows = cursor.rowcount
+                    affected_rows = 0
+                    try:
+                        for query, params_list in statements:
+                            cursor.executemany(query, params_list)
+                            affected_rows += cursor.rowcount
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
                     with self._stats_lock:
                         self._stats["successful_queries"] += 1
                         if attempt > 1:
@@ -313,6 +326,11 @@ class DatabaseConnectionPool:
     ) -> int:
         return await asyncio.to_thread(self.execute_many, query, params_list)
 
+    async def execute_batch_async(
+        self, statements: Sequence[Tuple[str, Sequence[Tuple[Any, ...]]]]
+    ) -> int:
+        return await asyncio.to_thread(self.execute_batch, statements)
+
     def get_stats(self) -> Dict[str, float]:
         with self._stats_lock:
             stats = dict(self._stats)
@@ -368,24 +386,32 @@ class GridIntelligence:
     def _set_cache(self, key: str, value: Any) -> None:
         self.cache.set_json(key, value, self.cache_ttl)
 
+    @timed("cache.invalidate")
     def _invalidate_session_cache(self, session_id: str) -> None:
         self.cache.delete(self._cache_key("session_history", session_id))
         self.cache.delete(self._cache_key("session_alerts", session_id))
 
+    @timed("cache.invalidate")
     def _invalidate_global_cache(self) -> None:
         self.cache.delete(self._cache_key("global_metrics"))
         self.cache.delete(self._cache_key("recent_sessions"))
         self.cache.delete(self._cache_key("all_alerts"))
 
-    def store_sovereign(self, data: Dict[str, Any]) -> None:
-        """Store conversation data; embeddings can be added later."""
-        query = """
-            INSERT INTO conversations
-            (user_id, session_id, message, response, risk_level,
-             dharma_score, multimodal_data, timestamp, node_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        params = (
+    _CONVERSATION_INSERT = """
+        INSERT INTO conversations
+        (user_id, session_id, message, response, risk_level,
+         dharma_score, multimodal_data, timestamp, node_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _ALERT_INSERT = """
+        INSERT INTO crisis_alerts
+        (user_id, session_id, risk_level, alert_type, empathy_prompts, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _conversation_params(data: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (
             data["user_id"],
             data["session_id"],
             data["message"],
@@ -396,30 +422,49 @@ class GridIntelligence:
             datetime.now().isoformat(),
             "TH-GRID-01",
         )
-        self.db_pool.execute(query, params, fetch_results=False)
-        self._invalidate_session_cache(data["session_id"])
-        self._invalidate_global_cache()
 
-    def create_crisis_alert(self, data: Dict[str, Any]) -> List[str]:
-        empathy_prompts = self._generate_empathy_prompts(data["risk_level"])
-        query = """
-            INSERT INTO crisis_alerts
-            (user_id, session_id, risk_level, alert_type, empathy_prompts, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """
-        params = (
+    def _alert_params(self, data: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (
             data["user_id"],
             data["session_id"],
             data["risk_level"],
             "immediate_intervention",
-            json.dumps(empathy_prompts),
+            json.dumps(self._generate_empathy_prompts(data["risk_level"])),
             datetime.now().isoformat(),
         )
-        self.db_pool.execute(query, params, fetch_results=False)
+
+    @timed("grid.store_sovereign")
+    def store_sovereign(self, data: Dict[str, Any]) -> None:
+        """Store conversation data; embeddings can be added later."""
+        self.db_pool.execute(
+            self._CONVERSATION_INSERT, self._conversation_params(data), fetch_results=False
+        )
+        self._invalidate_session_cache(data["session_id"])
+        self._invalidate_global_cache()
+
+    @timed("grid.create_crisis_alert")
+    def create_crisis_alert(self, data: Dict[str, Any]) -> List[str]:
+        empathy_prompts = self._generate_empathy_prompts(data["risk_level"])
+        self.db_pool.execute(self._ALERT_INSERT, self._alert_params(data), fetch_results=False)
         self._invalidate_session_cache(data["session_id"])
         self._invalidate_global_cache()
         return empathy_prompts
 
+    @timed("grid.store_sovereign_batch")
+    def store_sovereign_batch(
+        self, conversations: List[Dict[str, Any]], alerts: List[Dict[str, Any]]
+    ) -> None:
+        """Store many conversations and crisis alerts in one transaction."""
+        statements = [
+            (self._CONVERSATION_INSERT, [self._conversation_params(d) for d in conversations])
+        ]
+        if alerts:
+            statements.append((self._ALERT_INSERT, [self._alert_params(d) for d in alerts]))
+        self.db_pool.execute_batch(statements)
+        for session_id in {data["session_id"] for data in conversations + alerts}:
+            self._invalidate_session_cache(session_id)
+        self._invalidate_global_cache()
+
     async def create_crisis_alert_async(self, data: Dict[str, Any]) -> List[str]:
         return await asyncio.to_thread(self.create_crisis_alert, data)
 
@@ -427,6 +472,7 @@ class GridIntelligence:
         prompts = _LOCALE["database"]["empathy_prompts"]
         return prompts.get(risk_level, prompts["low"])
 
+    @timed("grid.get_session_history")
     def get_session_history(self, session_id: str) -> List[Dict[str, Any]]:
         cache_key = self._cache_key("session_history", session_id)
         cached = self.cache.get_json(cache_key)
@@ -455,6 +501,7 @@ class GridIntelligence:
     async def get_session_history_async(self, session_id: str) -> List[Dict[str, Any]]:
         return await asyncio.to_thread(self.get_session_history, session_id)
 
+    @timed("grid.get_alerts")
     def get_alerts(self, session_id: str) -> List[Dict[str, Any]]:
         cache_key = self._cache_key("session_alerts", session_id)
         cached = self.cache.get_json(cache_key)
@@ -484,6 +531,7 @@ class GridIntelligence:
     async def get_alerts_async(self, session_id: str) -> List[Dict[str, Any]]:
         return await asyncio.to_thread(self.get_alerts, session_id)
 
+    @timed("grid.get_global_metrics")
     def get_global_metrics(self) -> List[Dict[str, Any]]:
         """Fetch historical risk levels and dharma scores for graph visualization."""
         cache_key = self._cache_key("global_metrics")
@@ -507,6 +555,7 @@ class GridIntelligence:
     async def get_global_metrics_async(self) -> List[Dict[str, Any]]:
         return await asyncio.to_thread(self.get_global_metrics)
 
+    @timed("grid.get_recent_sessions")
     def get_recent_sessions(self) -> List[Dict[str, Any]]:
         """Fetch unique recent sessions for the monitor."""
         cache_key = self._cache_key("recent_sessions")
@@ -537,6 +586,7 @@ class GridIntelligence:
     async def get_recent_sessions_async(self) -> List[Dict[str, Any]]:
         return await asyncio.to_thread(self.get_recent_sessions)
 
+    @timed("grid.get_all_alerts")
     def get_all_alerts(self) -> List[Dict[str, Any]]:
         """Fetch all active crisis alerts."""
         cache_key = self._cache_key("all_alerts")
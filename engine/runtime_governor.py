@@ -1,16 +1,25 @@
 """Runtime governor aggregating core metrics."""
 from __future__ import annotations
 
+import weakref
 from dataclasses import dataclass, field
 from statistics import mean
 from typing import Any
 
+from memory_diagnostics import register_size
+
+# Dataclass instances are unhashable, so track them with plain weak references.
+_instances: list[weakref.ref] = []
+
 
 @dataclass
 class RuntimeGovernor:
     energy_state: float = 1.0
     history: list[dict[str, float]] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        _instances.append(weakref.ref(self, _instances.remove))
+
     def composite_score(self, metrics: dict[str, float]) -> float:
         weights = {"clarity": 0.3, "coherence": 0.3, "stability": 0.2, "growth_index": 0.2}
         score = 0.0
@@ -22,3 +31,9 @@ class RuntimeGovernor:
 
     def snapshot(self) -> dict[str, Any]:
         return {"energy_state": self.energy_state, "history": self.history[-5:]}
+
+
+register_size(
+    "runtime_governor.history",
+    lambda: sum(len(governor.history) for ref in list(_instances) if (governor := ref()) is not None),
+)
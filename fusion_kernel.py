@@ -0,0 +1,228 @@
+"""Vectorized voice/facial heuristics and multimodal fusion for batches.
+
+The array version of ``MultiModalTriageEngine._analyze_voice_ml_ready``,
+``_analyze_facial_ml_ready`` and the weighted blend in ``multimodal_fusion``.
+Features are packed into ``(N, k)`` float64 arrays (columns in
+``VOICE_FEATURES`` / ``FACIAL_FEATURES`` order, missing keys filled with the
+scalar path's defaults) plus a per-row "present" mask, since an absent or empty
+feature dict drops that modality's weight. Threshold rules become masks and
+risk factors a bitmask over ``RISK_FACTORS``.
+
+Every operation is done in the same order as the scalar code, so results are
+bit-for-bit equal to it (tests/unit/test_fusion_kernel.py enforces this); change
+both together. Text analysis stays per message (keyword matching on strings)
+and comes in as ``text_risk`` / ``text_confidence`` arrays.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core_engine import INV_PHI, REMAINDER
+from models import MultiModalAnalysis
+
+# Column order and the default the scalar path uses when a key is missing.
+VOICE_FEATURES: Tuple[Tuple[str, float], ...] = (
+    ("energy", 0.5),
+    ("pitch_variance", 0.0),
+    ("tremor", 0.0),
+    ("speech_rate", 1.0),
+    ("pause_duration", 0.0),
+)
+FACIAL_FEATURES: Tuple[Tuple[str, float], ...] = (
+    ("au1", 0.0),
+    ("au2", 0.0),
+    ("au15", 0.0),
+)
+# Bit i of a risk_factors mask; listed in the order the scalar path appends them.
+RISK_FACTORS = (
+    "very_low_energy",
+    "low_energy",
+    "high_pitch_variance",
+    "voice_tremor",
+    "abnormal_speech_rate",
+    "long_pauses",
+)
+
+
+def pack_features(
+    features: Iterable[Optional[Dict[str, float]]],
+    columns: Tuple[Tuple[str, float], ...],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """``(values, present)`` arrays from per-message feature dicts (None for none)."""
+    rows = [features_row or {} for features_row in features]
+    values = np.array(
+        [[row.get(name, default) for name, default in columns] for row in rows],
+        dtype=np.float64,
+    ).reshape(len(rows), len(columns))
+    present = np.array([bool(row) for row in rows], dtype=bool)
+    return values, present
+
+
+def voice_kernel(
+    values: np.ndarray, present: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Voice ``(risk, confidence, risk_factors)`` for packed ``VOICE_FEATURES``."""
+    energy, pitch_variance, tremor, speech_rate, pause_duration = values.T
+    very_low_energy = energy < 0.2
+    low_energy = ~very_low_energy & (energy < 0.4)
+    high_pitch_variance = pitch_variance > 0.8
+    voice_tremor = tremor > 0.7
+    abnormal_speech_rate = (speech_rate < 0.5) | (speech_rate > 2.0)
+    long_pauses = pause_duration > 0.7
+
+    risk = np.zeros(len(values))
+    risk += np.where(very_low_energy, 0.5, np.where(low_energy, 0.3, 0.0))
+    risk += np.where(high_pitch_variance, 0.4, 0.0)
+    risk += np.where(voice_tremor, 0.3, 0.0)
+    risk += np.where(abnormal_speech_rate, 0.2, 0.0)
+    risk += np.where(long_pauses, 0.2, 0.0)
+    risk = np.where(present, np.minimum(risk, 1.0), 0.0)
+
+    masks = (
+        very_low_energy,
+        low_energy,
+        high_pitch_variance,
+        voice_tremor,
+        abnormal_speech_rate,
+        long_pauses,
+    )
+    factors = np.zeros(len(values), dtype=np.uint8)
+    for bit, mask in enumerate(masks):
+        factors |= mask.astype(np.uint8) << bit
+    factors[~present] = 0
+    confidence = np.where(present, 0.6, 0.0)
+    return risk, confidence, factors
+
+
+def facial_kernel(
+    values: np.ndarray, present: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Facial ``(risk, confidence)`` for packed ``FACIAL_FEATURES``."""
+    au1, au2, au15 = values.T
+    risk = np.maximum(np.maximum(au1, au15), au2 * 0.5)
+    confidence = np.where(risk > 0.7, 0.8, 0.55)
+    return np.where(present, np.minimum(risk, 1.0), 0.0), np.where(
+        present, confidence, 0.0
+    )
+
+
+class FusionBatch(NamedTuple):
+    text_risk: np.ndarray
+    voice_stress: np.ndarray
+    facial_distress: np.ndarray
+    combined_risk: np.ndarray
+    confidence: np.ndarray
+    text_confidence: np.ndarray
+    voice_confidence: np.ndarray
+    facial_confidence: np.ndarray
+    risk_factors: np.ndarray  # uint8 bitmask over RISK_FACTORS
+    voice_present: np.ndarray
+    facial_present: np.ndarray
+
+    def analyses(self) -> List[MultiModalAnalysis]:
+        """One MultiModalAnalysis per row, as ``multimodal_fusion`` returns them."""
+        return [
+            MultiModalAnalysis(
+                text_risk=float(self.text_risk[i]),
+                voice_stress=float(self.voice_stress[i]),
+                facial_distress=float(self.facial_distress[i]),
+                combined_risk=float(self.combined_risk[i]),
+                confidence=float(self.confidence[i]),
+                text_confidence=float(self.text_confidence[i]),
+                voice_confidence=float(self.voice_confidence[i]),
+                facial_confidence=float(self.facial_confidence[i]),
+                risk_factors=decode_risk_factors(int(self.risk_factors[i])),
+            )
+            for i in range(len(self.combined_risk))
+        ]
+
+    def insights(self, text_analyses: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Per-row lake insight data, as ``multimodal_fusion`` stores it."""
+        insights = []
+        for i, text_analysis in enumerate(text_analyses):
+            if self.voice_present[i]:
+                voice = {
+                    "risk_score": float(self.voice_stress[i]),
+                    "confidence": float(self.voice_confidence[i]),
+                    "risk_factors": decode_risk_factors(int(self.risk_factors[i])),
+                    "method": "feature_heuristics",
+                }
+            else:
+                voice = {
+                    "risk_score": 0.0,
+                    "confidence": 0.0,
+                    "risk_factors": [],
+                    "method": "no_data",
+                }
+            if self.facial_present[i]:
+                facial = {
+                    "risk_score": float(self.facial_distress[i]),
+                    "confidence": float(self.facial_confidence[i]),
+                    "method": "facial_heuristics",
+                }
+            else:
+                facial = {"risk_score": 0.0, "confidence": 0.0, "method": "no_data"}
+            insights.append(
+                {
+                    "text": text_analysis,
+                    "voice": voice,
+                    "facial": facial,
+                    "combined": float(self.combined_risk[i]),
+                    "confidence": float(self.confidence[i]),
+                }
+            )
+        return insights
+
+
+def decode_risk_factors(mask: int) -> List[str]:
+    return [name for bit, name in enumerate(RISK_FACTORS) if mask >> bit & 1]
+
+
+def fuse(
+    text_risk: np.ndarray,
+    text_confidence: np.ndarray,
+    voice_values: np.ndarray,
+    voice_present: np.ndarray,
+    facial_values: np.ndarray,
+    facial_present: np.ndarray,
+) -> FusionBatch:
+    """Golden-ratio blend of the three modalities, weights normalized per row."""
+    text_risk = np.asarray(text_risk, dtype=np.float64)
+    text_confidence = np.asarray(text_confidence, dtype=np.float64)
+    voice_risk, voice_confidence, risk_factors = voice_kernel(
+        voice_values, voice_present
+    )
+    facial_risk, facial_confidence = facial_kernel(facial_values, facial_present)
+
+    voice_weight = np.where(voice_present, INV_PHI, 0.0)
+    facial_weight = np.where(facial_present, INV_PHI, 0.0)
+    # REMAINDER > 0, so the scalar path's "or 1.0" never applies.
+    total = REMAINDER + voice_weight + facial_weight
+    text_norm = REMAINDER / total
+    voice_norm = voice_weight / total
+    facial_norm = facial_weight / total
+
+    combined = (
+        text_risk * text_norm + voice_risk * voice_norm + facial_risk * facial_norm
+    )
+    confidence = (
+        text_confidence * text_norm
+        + voice_confidence * voice_norm
+        + facial_confidence * facial_norm
+    )
+    return FusionBatch(
+        text_risk=text_risk,
+        voice_stress=voice_risk,
+        facial_distress=facial_risk,
+        combined_risk=np.minimum(np.maximum(combined, 0.0), 1.0),
+        confidence=np.minimum(np.maximum(confidence, 0.0), 1.0),
+        text_confidence=text_confidence,
+        voice_confidence=voice_confidence,
+        facial_confidence=facial_confidence,
+        risk_factors=risk_factors,
+        voice_present=voice_present,
+        facial_present=facial_present,
+    )
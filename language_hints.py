@@ -0,0 +1,113 @@
+"""Per-user/session language hints so Whisper can skip language detection.
+
+The first clip from a user or session runs detection. When the detected
+language's probability clears ``LANGUAGE_HINT_MIN_PROBABILITY`` it is remembered
+under both the session and the user for ``LANGUAGE_HINT_TTL_SECONDS`` and passed
+as the language on later clips. If a hinted transcript comes back with a mean
+segment log-probability under ``LANGUAGE_HINT_MIN_LOGPROB`` (the speaker probably
+switched language) the hint is replaced by a marker that forces detection on the
+next clip. ``WHISPER_DEFAULT_LANGUAGE`` is the hint for speakers with no entry.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from metrics import LANGUAGE_HINTS
+from transcription_backends import Transcription
+
+LANGUAGE_HINT_TTL_SECONDS = float(os.getenv("LANGUAGE_HINT_TTL_SECONDS", "3600"))
+LANGUAGE_HINT_MIN_PROBABILITY = float(os.getenv("LANGUAGE_HINT_MIN_PROBABILITY", "0.8"))
+LANGUAGE_HINT_MIN_LOGPROB = float(os.getenv("LANGUAGE_HINT_MIN_LOGPROB", "-1.0"))
+LANGUAGE_HINT_MAX_ENTRIES = int(os.getenv("LANGUAGE_HINT_MAX_ENTRIES", "10000"))
+WHISPER_DEFAULT_LANGUAGE = os.getenv("WHISPER_DEFAULT_LANGUAGE", "") or None
+
+logger = logging.getLogger("namo_nexus.language_hints")
+
+# Entry value None means "detect on the next clip".
+_Entry = Tuple[Optional[str], float]
+
+
+class LanguageHintCache:
+    def __init__(
+        self,
+        ttl_seconds: float = LANGUAGE_HINT_TTL_SECONDS,
+        min_probability: float = LANGUAGE_HINT_MIN_PROBABILITY,
+        min_logprob: float = LANGUAGE_HINT_MIN_LOGPROB,
+        default_language: Optional[str] = WHISPER_DEFAULT_LANGUAGE,
+        max_entries: int = LANGUAGE_HINT_MAX_ENTRIES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.min_probability = min_probability
+        self.min_logprob = min_logprob
+        self.default_language = default_language
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+    @staticmethod
+    def _keys(user_id: str, session_id: Optional[str]) -> List[str]:
+        keys = [f"session:{session_id}"] if session_id else []
+        keys.append(f"user:{user_id}")
+        return keys
+
+    def hint(self, user_id: str, session_id: Optional[str] = None) -> Optional[str]:
+        """Language to pass to the backend, or None to let it detect."""
+        now = time.monotonic()
+        with self._lock:
+            for key in self._keys(user_id, session_id):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                language, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    continue
+                return language
+        return self.default_language
+
+    def observe(
+        self,
+        user_id: str,
+        session_id: Optional[str],
+        hint: Optional[str],
+        transcription: Transcription,
+    ) -> None:
+        """Update the entry from a transcription made with ``hint``."""
+        if hint is None:
+            probability = transcription.language_probability
+            if probability is not None and probability >= self.min_probability:
+                LANGUAGE_HINTS.labels(outcome="learned").inc()
+                self._store(user_id, session_id, transcription.language)
+            else:
+                LANGUAGE_HINTS.labels(outcome="uncertain").inc()
+                self._store(user_id, session_id, None)
+            return
+        logprob = transcription.avg_logprob
+        if logprob is not None and logprob < self.min_logprob:
+            LANGUAGE_HINTS.labels(outcome="invalidated").inc()
+            logger.info(
+                "language_hint_invalidated hint=%s avg_logprob=%.2f", hint, logprob
+            )
+            self._store(user_id, session_id, None)
+        else:
+            LANGUAGE_HINTS.labels(outcome="hinted").inc()
+
+    def _store(
+        self, user_id: str, session_id: Optional[str], language: Optional[str]
+    ) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for key in self._keys(user_id, session_id):
+                self._entries[key] = (language, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,176 @@
+"""Event-loop lag histogram plus a watchdog that catches blocking callbacks.
+
+A task on the loop sleeps for ``interval`` and records how late it woke up into
+``namo_nexus_event_loop_lag_ms``. A daemon thread checks the task's heartbeat;
+when the loop has been stuck for longer than ``threshold_ms`` it samples the loop
+thread's stack via ``sys._current_frames()`` and logs it once per stall, tagged
+with the trace id of the task that was running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from typing import Any, Optional
+
+from metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+from structured_logging import trace_id_var
+
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "0.25"))
+LOOP_BLOCK_THRESHOLD_MS = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "250"))
+STACK_LIMIT = 30
+
+logger = logging.getLogger("namo_nexus.loop_monitor")
+
+# Python < 3.12 has no Task.get_context(); remember each task's context instead.
+_task_contexts: "weakref.WeakKeyDictionary[asyncio.Task, contextvars.Context]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _recording_task_factory(loop, coro, context=None):  # type: ignore[no-untyped-def]
+    # Called synchronously by create_task, so copy_context() is what the task inherits.
+    context = context if context is not None else contextvars.copy_context()
+    task = asyncio.Task(coro, loop=loop, context=context)
+    _task_contexts[task] = context
+    return task
+
+
+def _task_trace_id(task: Optional[asyncio.Task]) -> str:
+    if task is None:
+        return "-"
+    get_context = getattr(task, "get_context", None)
+    context = get_context() if get_context is not None else _task_contexts.get(task)
+    if context is None:
+        return "-"
+    return context.get(trace_id_var, "-")
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        interval: float = LOOP_LAG_INTERVAL_SECONDS,
+        threshold_ms: float = LOOP_BLOCK_THRESHOLD_MS,
+    ) -> None:
+        self.interval = interval
+        self.threshold_ms = threshold_ms
+        self.stalls = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._heartbeat = 0.0
+        self._reported_heartbeat = -1.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running loop; call from inside it."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        if (
+            not hasattr(asyncio.Task, "get_context")
+            and self._loop.get_task_factory() is None
+        ):
+            self._loop.set_task_factory(_recording_task_factory)
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(
+            self._measure_lag(), name="loop-lag-monitor"
+        )
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+        if (
+            self._loop is not None
+            and self._loop.get_task_factory() is _recording_task_factory
+        ):
+            self._loop.set_task_factory(None)
+
+    async def _measure_lag(self) -> None:
+        interval = self.interval
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            lag_ms = max(0.0, (now - self._heartbeat - interval) * 1000.0)
+            self._heartbeat = now
+            EVENT_LOOP_LAG.observe(lag_ms)
+
+    def _watch(self) -> None:
+        check_every = max(self.threshold_ms / 2000.0, 0.01)
+        while not self._stop.wait(check_every):
+            heartbeat = self._heartbeat
+            blocked_ms = (time.monotonic() - heartbeat - self.interval) * 1000.0
+            if (
+                blocked_ms >= self.threshold_ms
+                and heartbeat != self._reported_heartbeat
+            ):
+                self._reported_heartbeat = heartbeat
+                self._report_stall(blocked_ms)
+
+    def _report_stall(self, blocked_ms: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        self.stalls += 1
+        EVENT_LOOP_BLOCKED.inc()
+        logger.warning(
+            "event_loop_blocked blocked_ms=%.1f task=%s\n%s",
+            blocked_ms,
+            task.get_name() if task is not None else "-",
+            stack,
+            extra={"trace_id": _task_trace_id(task)},
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "threshold_ms": self.threshold_ms,
+            "stalls": self.stalls,
+        }
+
+
+loop_monitor = LoopMonitor()
+
+
+def start_loop_monitor() -> None:
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
+
+async def stop_loop_monitor() -> None:
+    await loop_monitor.stop()
@@ -9,8 +9,9 @@ import secrets
 import threading
 import time
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
 # Fix imports for new structure (api/main.py -> root)
@@ -19,37 +20,76 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 from dotenv import load_dotenv
 from fastapi import (
     BackgroundTasks,
+    Body,
     Depends,
     FastAPI,
     File,
     Form,
     HTTPException,
+    Query,
     Request,
     UploadFile,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from pydantic import ValidationError
 from sqlalchemy.orm import sessionmaker
 
 # Load environment variables
 load_dotenv()
 
+from audio_jobs import AudioJobQueueFull, AudioJobRunner, build_job_store_from_env
+from audio_upload import (
+    AUDIO_FORM_OVERHEAD_BYTES,
+    MAX_AUDIO_SIZE,
+    SNIFF_BYTES,
+    BodySizeLimitMiddleware,
+    sniff_audio_type,
+)
 from cache import build_cache_from_env
-from core_engine import HarmonicGovernor
+from core_engine import DhammicDataLake, HarmonicGovernor
 from database import GridIntelligence
-from metrics import record_metrics
+from loop_monitor import loop_monitor, start_loop_monitor, stop_loop_monitor
+from memory_diagnostics import (
+    TRACEMALLOC_FRAMES,
+    memory_diagnostics,
+    register_size,
+    registry_sizes,
+)
+from metrics import (
+    CONTENT_TYPE_LATEST,
+    LOG_RECORDS_DROPPED,
+    LOG_RECORDS_SUPPRESSED,
+    UNMATCHED_ROUTE,
+    record_metrics,
+    render_metrics,
+)
+from micro_batcher import TRIAGE_MICROBATCH_ENABLED, MicroBatcher
 from models import MultiModalAnalysis, TriageResponse
 from rate_limiter import (
     TokenBucketRateLimiter,
     build_rate_limiter_store,
     load_rate_limit_settings,
 )
+from sampling_profiler import (
+    PROFILER_MAX_HZ,
+    PROFILER_MAX_SECONDS,
+    ProfilerBusyError,
+    profiler,
+)
 from sanitization import sanitize_text
-from structured_logging import configure_logging, trace_id_var
+from stage_timing import Span, collect_stage_timings
+from structured_logging import (
+    configure_logging,
+    get_log_pipeline,
+    get_sampling_filter,
+    trace_id_var,
+)
+from transcription_pool import TranscriptionQueueFull
+from voice_extractor import WHISPER_WARMUP, voice_extractor
 from src.audit_log import Base as AuditBase, ensure_retention_policy
 from src.audit_middleware import AuditMiddleware
 from src.auth_utils import verify_token
@@ -58,7 +98,10 @@ from src.i18n import load_locale
 from src.schemas_day2 import InteractRequest, ReflectRequest, TriageRequest
 # from src.security_patch import add_https_redirect
 
-configure_logging()
+configure_logging(
+    on_drop=LOG_RECORDS_DROPPED.inc,
+    on_suppress=lambda reason: LOG_RECORDS_SUPPRESSED.labels(reason=reason).inc(),
+)
 logger = logging.getLogger("namo_nexus")
 uvicorn_logger = logging.getLogger("uvicorn")
 _LOCALE = load_locale("th")
@@ -77,11 +120,37 @@ def load_cors_origins() -> list[str]:
     return [o.strip() for o in raw.split(",") if o.strip()]
 
 DB_PATH = os.getenv("DB_PATH", os.path.join("data", "namo_nexus_sovereign.db"))
+# POST /triage/batch: most items per call, and items scored between yields to the loop.
+TRIAGE_BATCH_MAX_ITEMS = int(os.getenv("TRIAGE_BATCH_MAX_ITEMS", "500"))
+TRIAGE_BATCH_CHUNK_SIZE = max(1, int(os.getenv("TRIAGE_BATCH_CHUNK_SIZE", "50")))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_loop_monitor()
+    audio_job_runner.start()
+    # Loads Whisper off the event loop; /ready answers 503 until it finishes.
+    warmup = voice_extractor.schedule_warm_up() if WHISPER_WARMUP else None
+    yield
+    if warmup is not None and not warmup.done():
+        logger.warning("whisper_warmup_unfinished_at_shutdown")
+    await audio_job_runner.stop()
+    await stop_loop_monitor()
+
 
 app = FastAPI(
     title="NamoNexus Enterprise API",
     version="3.5.1",
     description="Mental Health Infrastructure AI - Production Hardened",
+    lifespan=lifespan,
+)
+
+# Refuse oversized audio uploads while they stream in, before form parsing.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        "/triage/audio": MAX_AUDIO_SIZE + AUDIO_FORM_OVERHEAD_BYTES,
+        "/triage/audio/jobs": MAX_AUDIO_SIZE + AUDIO_FORM_OVERHEAD_BYTES,
+    },
 )
 
 # --- [NEW] เปิดประตูให้หน้าเว็บเข้าถึงได้ (CORS) ---
@@ -157,6 +226,10 @@ class NamoNexusEnterprise:
         self.identity = self._load_identity_capsule()
         self.governor = HarmonicGovernor(identity_patterns=self.identity)
         self.grid = GridIntelligence(db_path, cache=cache_backend)
+        # Concurrent /triage calls are scored together through orchestrate_batch.
+        self.batcher = (
+            MicroBatcher(self.governor.orchestrate_batch) if TRIAGE_MICROBATCH_ENABLED else None
+        )
 
     def _load_identity_capsule(self) -> Dict:
         """Loads the core identity patterns from the capsule."""
@@ -173,20 +246,33 @@ class NamoNexusEnterprise:
             return {}
 
     async def process_triage(
-        self, request: TriageRequest, background_tasks: BackgroundTasks
+        self,
+        request: TriageRequest,
+        background_tasks: BackgroundTasks,
+        debug_timings: bool = False,
     ) -> TriageResponse:
         start = time.time()
         session_id = request.session_id or self._generate_session_id()
 
-        result = await self.governor.orchestrate(
-            request.message,
-            request.voice_features,
-            request.facial_features,
-        )
-
-        multimodal = result["multimodal"]
-        ethics = result["ethics"]
-        response_text = self._generate_response(request.message, ethics, multimodal)
+        with collect_stage_timings() as timings:
+            # Batched scoring runs in the batcher's task, outside this request's
+            # stage timings, so debug-timing requests are scored on their own.
+            if self.batcher is not None and not debug_timings:
+                result = await self.batcher.submit(
+                    (request.message, request.voice_features, request.facial_features),
+                    urgent=DhammicDataLake.check_safety(request.message)["risk_level"] != "low",
+                )
+            else:
+                result = await self.governor.orchestrate(
+                    request.message,
+                    request.voice_features,
+                    request.facial_features,
+                )
+
+            multimodal = result["multimodal"]
+            ethics = result["ethics"]
+            with Span("api.generate_response"):
+                response_text = self._generate_response(request.message, ethics, multimodal)
         human_required = ethics["requires_human"] or multimodal.combined_risk > 0.7
 
         background_tasks.add_task(
@@ -201,16 +287,83 @@ class NamoNexusEnterprise:
 
         latency = (time.time() - start) * 1000
 
+        return self._triage_response(
+            response_text,
+            ethics,
+            multimodal,
+            latency,
+            session_id,
+            human_required,
+            stage_timings_ms=(
+                {stage: round(ms, 3) for stage, ms in timings.items()} if debug_timings else None
+            ),
+        )
+
+    async def process_triage_batch(
+        self, requests: List[TriageRequest]
+    ) -> AsyncIterator[Union[TriageResponse, Exception]]:
+        """Triage ``requests`` in order, yielding a response or the item's exception.
+
+        Items are orchestrated TRIAGE_BATCH_CHUNK_SIZE at a time. Each chunk's
+        records (and crisis alerts) are written in one transaction, off the event
+        loop, before its responses are yielded, so a client that disconnects
+        mid-stream never leaves already-scored items unpersisted.
+        """
+        start = time.time()
+        for offset in range(0, len(requests), TRIAGE_BATCH_CHUNK_SIZE):
+            chunk = requests[offset : offset + TRIAGE_BATCH_CHUNK_SIZE]
+            results = await self.governor.orchestrate_batch(
+                [(r.message, r.voice_features, r.facial_features) for r in chunk]
+            )
+            records: List[Tuple] = []
+            outcomes: List[Union[TriageResponse, Exception]] = []
+            for request, result in zip(chunk, results):
+                if isinstance(result, Exception):
+                    outcomes.append(result)
+                    continue
+                session_id = request.session_id or self._generate_session_id()
+                multimodal = result["multimodal"]
+                ethics = result["ethics"]
+                response_text = self._generate_response(request.message, ethics, multimodal)
+                human_required = ethics["requires_human"] or multimodal.combined_risk > 0.7
+                records.append(
+                    (request, session_id, response_text, ethics, multimodal, human_required)
+                )
+                outcomes.append(
+                    self._triage_response(
+                        response_text,
+                        ethics,
+                        multimodal,
+                        (time.time() - start) * 1000,
+                        session_id,
+                        human_required,
+                    )
+                )
+            await asyncio.to_thread(self._persist_batch, records)
+            for outcome in outcomes:
+                yield outcome
+
+    def _triage_response(
+        self,
+        response_text: str,
+        ethics: Dict,
+        multimodal: MultiModalAnalysis,
+        latency_ms: float,
+        session_id: str,
+        human_required: bool,
+        stage_timings_ms: Optional[Dict[str, float]] = None,
+    ) -> TriageResponse:
         return TriageResponse(
             response=response_text,
             risk_level=ethics["risk_level"],
             dharma_score=ethics["dharma_score"],
             emotional_tone=ethics["emotional_tone"],
             multimodal_confidence=multimodal.confidence,
-            latency_ms=latency,
+            latency_ms=latency_ms,
             session_id=session_id,
             human_handoff_required=human_required,
-            empathy_prompts=self.grid._generate_empathy_prompts(ethics["risk_level"]) if human_required else None
+            empathy_prompts=self.grid._generate_empathy_prompts(ethics["risk_level"]) if human_required else None,
+            stage_timings_ms=stage_timings_ms,
         )
 
     def _generate_response(
@@ -252,40 +405,86 @@ class NamoNexusEnterprise:
         ethics: Dict,
         multimodal: MultiModalAnalysis,
         human_required: bool,
+    ) -> None:
+        with Span("api.background_persist"):
+            self._persist(request, session_id, response, ethics, multimodal, human_required)
+
+    def _persist(
+        self,
+        request: TriageRequest,
+        session_id: str,
+        response: str,
+        ethics: Dict,
+        multimodal: MultiModalAnalysis,
+        human_required: bool,
     ) -> None:
         self.grid.store_sovereign(
-            {
-                "user_id": request.user_id,
-                "session_id": session_id,
-                "message": request.message,
-                "response": response,
-                "risk_level": ethics["risk_level"],
-                "dharma_score": ethics["dharma_score"],
-                "multimodal": {
-                    "combined_risk": multimodal.combined_risk,
-                    "confidence": multimodal.confidence,
-                },
-            }
+            self._conversation_record(request, session_id, response, ethics, multimodal)
         )
 
         if human_required:
-            self.grid.create_crisis_alert(
-                {
-                    "user_id": request.user_id,
-                    "session_id": session_id,
-                    "risk_level": ethics["risk_level"],
-                }
-            )
+            self.grid.create_crisis_alert(self._alert_record(request, session_id, ethics))
             logger.warning(
                 f"Crisis alert: User {request.user_id} requires immediate human intervention"
             )
 
+    def _persist_batch(self, records: List[Tuple]) -> None:
+        """Store the ``_persist`` arguments of many triages in one transaction."""
+        if not records:
+            return
+        conversations, alerts = [], []
+        for request, session_id, response, ethics, multimodal, human_required in records:
+            conversations.append(
+                self._conversation_record(request, session_id, response, ethics, multimodal)
+            )
+            if human_required:
+                alerts.append(self._alert_record(request, session_id, ethics))
+                logger.warning(
+                    f"Crisis alert: User {request.user_id} requires immediate human intervention"
+                )
+        with Span("api.batch_persist"):
+            self.grid.store_sovereign_batch(conversations, alerts)
+
+    @staticmethod
+    def _conversation_record(
+        request: TriageRequest,
+        session_id: str,
+        response: str,
+        ethics: Dict,
+        multimodal: MultiModalAnalysis,
+    ) -> Dict:
+        return {
+            "user_id": request.user_id,
+            "session_id": session_id,
+            "message": request.message,
+            "response": response,
+            "risk_level": ethics["risk_level"],
+            "dharma_score": ethics["dharma_score"],
+            "multimodal": {
+                "combined_risk": multimodal.combined_risk,
+                "confidence": multimodal.confidence,
+            },
+        }
+
+    @staticmethod
+    def _alert_record(request: TriageRequest, session_id: str, ethics: Dict) -> Dict:
+        return {
+            "user_id": request.user_id,
+            "session_id": session_id,
+            "risk_level": ethics["risk_level"],
+        }
+
     @staticmethod
     def _generate_session_id() -> str:
         return f"session_{uuid.uuid4().hex[:12]}"
 
 
 engine = NamoNexusEnterprise(DB_PATH)
+
+
+def _wants_debug_timings(request: Request) -> bool:
+    """Authenticated callers may ask for per-stage timings with ``X-Debug-Timings: 1``."""
+    return request.headers.get("x-debug-timings", "").lower() in {"1", "true", "yes"}
 rate_limit_capacity, rate_limit_refill = load_rate_limit_settings()
 rate_limit_store = build_rate_limiter_store()
 rate_limiter = TokenBucketRateLimiter(
@@ -295,6 +494,16 @@ rate_limiter = TokenBucketRateLimiter(
 )
 rate_limit_per_minute = int(round(rate_limit_refill * 60))
 
+register_size(
+    "triage.dhammic_lake.cache",
+    lambda: len(engine.governor.agents["triage"].dhammic_lake.cache),
+)
+register_size("ethics.lake.cache", lambda: len(engine.governor.agents["ethics"].lake.cache))
+if hasattr(engine.grid.cache, "_store"):
+    register_size("grid.cache._store", lambda: len(engine.grid.cache._store))
+if hasattr(rate_limit_store, "_state"):
+    register_size("rate_limiter._state", lambda: len(rate_limit_store._state))
+
 
 @app.post(
     "/triage",
@@ -309,6 +518,15 @@ async def triage_endpoint(
     triage_request: TriageRequest,
     background_tasks: BackgroundTasks,
 ):
+    return await engine.process_triage(
+        _sanitize_triage_request(triage_request),
+        background_tasks,
+        debug_timings=_wants_debug_timings(request),
+    )
+
+
+def _sanitize_triage_request(triage_request: TriageRequest) -> TriageRequest:
+    """Sanitized message, and feature models as the dicts the engine expects."""
     cleaned_message = sanitize_text(triage_request.message)
     voice_features = triage_request.voice_features
     if hasattr(voice_features, "model_dump"):
@@ -316,14 +534,63 @@ async def triage_endpoint(
     facial_features = triage_request.facial_features
     if hasattr(facial_features, "model_dump"):
         facial_features = facial_features.model_dump()
-    sanitized_request = triage_request.model_copy(
+    return triage_request.model_copy(
         update={
             "message": cleaned_message,
             "voice_features": voice_features,
             "facial_features": facial_features,
         }
     )
-    return await engine.process_triage(sanitized_request, background_tasks)
+
+
+@app.post(
+    "/triage/batch",
+    dependencies=[
+        Depends(verify_token),
+    ],
+)
+@limiter.limit("10/minute")
+async def triage_batch_endpoint(
+    request: Request,
+    items: List[Dict[str, Any]] = Body(..., embed=True),
+):
+    """Triage ``{"items": [TriageRequest, ...]}``; streams NDJSON lines in item order.
+
+    Each line is ``{"index", "status": "ok", "result"}`` or
+    ``{"index", "status": "error", "error"}``; an invalid or failed item does not
+    affect the others.
+    """
+    if not items:
+        raise HTTPException(status_code=422, detail="Batch is empty")
+    if len(items) > TRIAGE_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"Batch exceeds {TRIAGE_BATCH_MAX_ITEMS} items"
+        )
+
+    errors: Dict[int, str] = {}
+    valid: List[Tuple[int, TriageRequest]] = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, _sanitize_triage_request(TriageRequest.model_validate(item))))
+        except ValidationError as exc:
+            errors[index] = "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors()
+            )
+
+    async def _lines():
+        results = engine.process_triage_batch([r for _, r in valid])
+        for index in range(len(items)):
+            if index in errors:
+                line = {"index": index, "status": "error", "error": errors[index]}
+            else:
+                result = await results.__anext__()
+                if isinstance(result, Exception):
+                    line = {"index": index, "status": "error", "error": str(result)}
+                else:
+                    line = {"index": index, "status": "ok", "result": result.model_dump(mode="json")}
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
 
 
 @app.post(
@@ -396,7 +663,6 @@ ALLOWED_AUDIO_TYPES = {
     "audio/wav", "audio/mpeg", "audio/flac", 
     "audio/ogg", "audio/webm", "audio/aac"
 }
-MAX_AUDIO_SIZE = 5 * 1024 * 1024  # 5MB
 
 
 @app.post(
@@ -431,34 +697,75 @@ async def triage_audio_endpoint(
     Max file size: 5MB
     """
     selected_audio = audio_file or audio
+    sniffed_type = await _accept_audio_upload(selected_audio)
+    return await _triage_audio(
+        selected_audio.file,
+        sniffed_type,
+        user_id=user_id,
+        session_id=session_id,
+        message=message,
+        background_tasks=background_tasks,
+        debug_timings=_wants_debug_timings(request),
+    )
+
+
+async def _accept_audio_upload(selected_audio: UploadFile | None) -> str:
+    """Validate an audio upload and return its sniffed content type."""
     if selected_audio is None:
         raise HTTPException(status_code=422, detail="Audio file is required")
     # Validate content type
     if not selected_audio.content_type or selected_audio.content_type not in ALLOWED_AUDIO_TYPES:
         raise HTTPException(status_code=422, detail="Only .wav / .mp3 allowed")
     
-    # Read and validate size
-    audio_bytes = await selected_audio.read()
-    if len(audio_bytes) > MAX_AUDIO_SIZE:
+    # BodySizeLimitMiddleware capped the body while it was received and the file
+    # part is spooled (1MB in memory, the rest on disk); it is decoded in place.
+    audio_size = selected_audio.size
+    if audio_size is None:
+        audio_size = selected_audio.file.seek(0, os.SEEK_END)
+    if audio_size > MAX_AUDIO_SIZE:
         raise HTTPException(status_code=413, detail="File too large")
     
-    if len(audio_bytes) < 1000:
+    if audio_size < 1000:
         raise HTTPException(status_code=422, detail="Audio file too small or empty")
     
-    # Extract voice features (run in thread pool to not block)
+    await selected_audio.seek(0)
+    sniffed_type = sniff_audio_type(await selected_audio.read(SNIFF_BYTES))
+    if sniffed_type is None:
+        raise HTTPException(status_code=422, detail="Unrecognized audio content")
+    await selected_audio.seek(0)
+    return sniffed_type
+
+
+async def _triage_audio(
+    source,
+    sniffed_type: str,
+    user_id: str,
+    session_id: str | None,
+    message: str | None,
+    background_tasks: BackgroundTasks,
+    debug_timings: bool = False,
+) -> TriageResponse:
+    """Voice analysis, transcription and triage of one validated recording."""
+    # Extract voice features on the audio threads and transcribe in the Whisper
+    # worker pool, so audio load never queues behind (or ahead of) text triage.
+    # Repeated uploads of the same audio are answered from the voice result cache,
+    # and the user's remembered language spares Whisper its detection pass.
     # BYPASS: Wrap in broad try/except to ensure 200 OK even if audio libs fail
     try:
-        from core.voice_extractor import voice_extractor
-        voice_result = await asyncio.to_thread(
-            voice_extractor.extract_from_bytes,
-            audio_bytes,
-            transcribe=True,
+        voice_result = await voice_extractor.extract_async(
+            source, sniffed_type, user_id=user_id, session_id=session_id
         )
         logger.info(
             "voice_extraction_complete duration=%.1f transcription_len=%d",
             voice_result.duration_seconds,
             len(voice_result.transcription or ""),
         )
+    except TranscriptionQueueFull as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="Transcription capacity exhausted, retry later",
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        ) from exc
     except Exception as e:
         logger.error(f"Voice extraction failed (using fallback): {e}")
         # Create a dummy result object to allow the request to proceed
@@ -489,7 +796,9 @@ async def triage_audio_endpoint(
     )
     
     # Process triage
-    response = await engine.process_triage(triage_request, background_tasks)
+    response = await engine.process_triage(
+        triage_request, background_tasks, debug_timings=debug_timings
+    )
     
     # Add transcription to response if available
     if voice_result.transcription:
@@ -500,6 +809,76 @@ async def triage_audio_endpoint(
     return response
 
 
+async def _process_audio_job(audio, sniffed_type: str, params: Dict) -> Dict:
+    background_tasks = BackgroundTasks()
+    response = await _triage_audio(audio, sniffed_type, background_tasks=background_tasks, **params)
+    # No response to attach them to: persist the triage record now.
+    await background_tasks()
+    return response.model_dump(mode="json")
+
+
+audio_job_runner = AudioJobRunner(build_job_store_from_env(), _process_audio_job)
+
+
+@app.post(
+    "/triage/audio/jobs",
+    status_code=202,
+    dependencies=[
+        Depends(verify_token),
+    ],
+)
+@limiter.limit("10/minute")
+async def create_audio_job(
+    request: Request,
+    response: Response,
+    audio: UploadFile | None = File(None, description="Audio file (WAV, MP3)"),
+    audio_file: UploadFile | None = File(None, description="Audio file (WAV, MP3)"),
+    user_id: str = Form(..., min_length=1, max_length=255, description="User identifier"),
+    session_id: str | None = Form(
+        None, max_length=255, description="Optional session ID"
+    ),
+    message: str | None = Form(
+        None,
+        max_length=5_000,
+        description="Optional text message (will transcribe if empty)",
+    ),
+    callback_url: str | None = Form(
+        None, max_length=2_048, description="Optional local URL to POST the finished job to"
+    ),
+):
+    """Queue an audio triage job and return its id without waiting for the result.
+    
+    Takes the same form as ``/triage/audio``. Poll ``status_url`` (or wait for
+    the callback) for the ``TriageResponse`` once the job has ``succeeded``.
+    """
+    selected_audio = audio_file or audio
+    sniffed_type = await _accept_audio_upload(selected_audio)
+    try:
+        job = await audio_job_runner.submit(
+            selected_audio.file,
+            sniffed_type,
+            {"user_id": user_id, "session_id": session_id, "message": message},
+            callback_url=callback_url,
+        )
+    except AudioJobQueueFull as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="Audio job queue is full, retry later",
+            headers={"Retry-After": "5"},
+        ) from exc
+    status_url = f"/triage/audio/jobs/{job.job_id}"
+    response.headers["Location"] = status_url
+    return {"job_id": job.job_id, "status": job.status, "status_url": status_url}
+
+
+@app.get("/triage/audio/jobs/{job_id}", dependencies=[Depends(verify_token)])
+async def get_audio_job(job_id: str):
+    job = await audio_job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_dict()
+
+
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
     if request.url.path in {"/health", "/healthz", "/ready", "/readyz", "/metrics"}:
@@ -547,7 +926,8 @@ async def observability_middleware(request: Request, call_next):
         raise
     finally:
         latency_ms = (time.time() - start) * 1000
-        record_metrics(request.method, request.url.path, status_code, latency_ms)
+        route = getattr(request.scope.get("route"), "path", UNMATCHED_ROUTE)
+        record_metrics(request.method, route, status_code, latency_ms)
         logger.info(
             "request_completed method=%s path=%s status=%s latency_ms=%.2f",
             request.method,
@@ -588,8 +968,19 @@ async def readiness_check():
         cache_ready = engine.grid.cache.ping()
     except Exception:
         logger.exception("readiness_cache_failed")
-    status = "ready" if db_ready and cache_ready else "degraded"
-    return {"status": status, "db_ready": db_ready, "cache_ready": cache_ready}
+    model_status = voice_extractor.model_status
+    payload = {
+        "db_ready": db_ready,
+        "cache_ready": cache_ready,
+        "model_status": model_status,
+    }
+    if model_status == "loading":
+        # Keep traffic away until the first audio request no longer pays for the load.
+        return JSONResponse(status_code=503, content={"status": "warming_up", **payload})
+    if model_status == "failed":
+        payload["model_error"] = voice_extractor.model_error
+    ready = db_ready and cache_ready and model_status != "failed"
+    return {"status": "ready" if ready else "degraded", **payload}
 
 
 @app.get("/readyz")
@@ -599,12 +990,77 @@ async def readyz():
 
 @app.get("/metrics")
 async def metrics_endpoint():
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    # Merging every worker's files is blocking I/O; keep it off the event loop.
+    payload = await asyncio.to_thread(render_metrics)
+    return Response(content=payload, media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/stats", dependencies=[Depends(verify_token)])
 async def stats_endpoint():
-    return engine.grid.get_stats()
+    stats = engine.grid.get_stats()
+    pipeline = get_log_pipeline()
+    if pipeline is not None:
+        stats["log_pipeline"] = pipeline.stats()
+    stats["event_loop"] = loop_monitor.stats()
+    stats["audio_jobs"] = audio_job_runner.stats()
+    if engine.batcher is not None:
+        stats["triage_batcher"] = engine.batcher.stats()
+    return stats
+
+
+@app.get("/admin/profile", dependencies=[Depends(verify_token)])
+async def profile_endpoint(
+    seconds: float = Query(10.0, gt=0, le=PROFILER_MAX_SECONDS),
+    hz: int = Query(100, ge=1, le=PROFILER_MAX_HZ),
+    idle: bool = False,
+):
+    """Sample all threads for ``seconds`` and return collapsed stacks for flamegraphs."""
+    try:
+        collapsed = await asyncio.to_thread(profiler.collect, seconds, hz, idle)
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return Response(content=collapsed, media_type="text/plain; charset=utf-8")
+
+
+@app.get("/admin/memory", dependencies=[Depends(verify_token)])
+async def memory_endpoint(
+    top: int = Query(20, ge=1, le=200),
+    group_by: str = Query("lineno", pattern="^(filename|lineno|traceback)$"),
+    rebase: bool = False,
+):
+    """Registry sizes, plus top allocation deltas against the baseline while tracing."""
+    payload = {"tracemalloc": memory_diagnostics.status(), "registries": registry_sizes()}
+    if payload["tracemalloc"]["tracing"]:
+        payload["top"] = await asyncio.to_thread(
+            memory_diagnostics.diff, top, group_by, rebase
+        )
+        payload["tracemalloc"] = memory_diagnostics.status()
+    return payload
+
+
+@app.post("/admin/memory/tracemalloc/start", dependencies=[Depends(verify_token)])
+async def tracemalloc_start(frames: int = Query(TRACEMALLOC_FRAMES, ge=1, le=25)):
+    return memory_diagnostics.start(frames)
+
+
+@app.post("/admin/memory/tracemalloc/stop", dependencies=[Depends(verify_token)])
+async def tracemalloc_stop():
+    return memory_diagnostics.stop()
+
+
+@app.get("/admin/log-sampling", dependencies=[Depends(verify_token)])
+async def get_log_sampling():
+    return get_sampling_filter().stats()
+
+
+@app.put("/admin/log-sampling", dependencies=[Depends(verify_token)])
+async def put_log_sampling(config: Dict[str, Dict[str, Dict[str, float]]]):
+    """Replace this worker's sampling rules; use LOG_SAMPLING_FILE to reach every worker."""
+    try:
+        get_sampling_filter().configure(config)
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return get_sampling_filter().stats()
 
 
 def _remove_route(path: str) -> None:
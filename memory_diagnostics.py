@@ -0,0 +1,124 @@
+"""tracemalloc snapshot diffing plus sizes of in-process registries.
+
+Modules that own a structure which can grow without bound register a size getter
+with ``register_size``. ``MemoryDiagnostics`` starts tracemalloc on demand (one
+frame by default, which keeps its overhead low), keeps a baseline snapshot and
+reports the top allocation deltas against it, grouped by file or by line.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "1"))
+GROUP_BY_CHOICES = {"filename", "lineno", "traceback"}
+
+_size_getters: Dict[str, Callable[[], int]] = {}
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def register_size(name: str, getter: Callable[[], int]) -> None:
+    """Report ``getter()`` (usually a ``len``) under ``name`` in diagnostics."""
+    _size_getters[name] = getter
+
+
+def registry_sizes() -> Dict[str, Optional[int]]:
+    sizes: Dict[str, Optional[int]] = {}
+    for name, getter in sorted(_size_getters.items()):
+        try:
+            sizes[name] = int(getter())
+        except Exception:  # noqa: BLE001 - one broken getter must not hide the rest
+            sizes[name] = None
+    return sizes
+
+
+def current_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryDiagnostics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._baseline_at: Optional[float] = None
+
+    def start(self, frames: int = TRACEMALLOC_FRAMES) -> Dict[str, Any]:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(max(1, frames))
+                self._baseline = None
+                self._baseline_at = None
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        with self._lock:
+            tracemalloc.stop()
+            self._baseline = None
+            self._baseline_at = None
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "baseline_at": self._baseline_at,
+            "rss_bytes": current_rss_bytes(),
+        }
+
+    def diff(
+        self, top: int = 20, group_by: str = "lineno", rebase: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Top allocation deltas against the baseline.
+
+        The first call (or ``rebase=True``) records the baseline and returns the
+        largest live allocations instead of deltas.
+        """
+        if group_by not in GROUP_BY_CHOICES:
+            raise ValueError(f"group_by must be one of {sorted(GROUP_BY_CHOICES)}")
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is not running; start it first")
+            snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            baseline = None if rebase else self._baseline
+            if baseline is None:
+                self._baseline = snapshot
+                self._baseline_at = time.time()
+                return [
+                    {
+                        "location": str(stat.traceback),
+                        "size_bytes": stat.size,
+                        "count": stat.count,
+                    }
+                    for stat in snapshot.statistics(group_by)[:top]
+                ]
+            return [
+                {
+                    "location": str(stat.traceback),
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in snapshot.compare_to(baseline, group_by)[:top]
+            ]
+
+
+memory_diagnostics = MemoryDiagnostics()
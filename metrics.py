@@ -1,6 +1,24 @@
 from __future__ import annotations
 
-from prometheus_client import Counter, Histogram
+import os
+import threading
+import time
+from typing import List, Optional, Set
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+METRICS_CACHE_TTL_SECONDS = float(os.getenv("METRICS_CACHE_TTL_SECONDS", "1.0"))
+# Label for requests that matched no route, so scanners cannot mint new series.
+UNMATCHED_ROUTE = "<unmatched>"
 
 REQUEST_COUNT = Counter(
     "namo_nexus_http_requests_total",
@@ -17,6 +35,70 @@ REQUEST_ERRORS = Counter(
     "Total HTTP error responses",
     ["method", "path", "status"],
 )
+STAGE_LATENCY = Histogram(
+    "namo_nexus_stage_latency_ms",
+    "Latency of internal pipeline stages in milliseconds",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000, 5000),
+)
+EVENT_LOOP_LAG = Histogram(
+    "namo_nexus_event_loop_lag_ms",
+    "Delay between a scheduled event-loop wakeup and when it ran, in milliseconds",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "namo_nexus_event_loop_blocked_total",
+    "Event-loop stalls longer than LOOP_BLOCK_THRESHOLD_MS",
+)
+TRANSCRIPTION_QUEUE_WAIT = Histogram(
+    "namo_nexus_transcription_queue_wait_ms",
+    "Time a transcription job waited for a worker process, in milliseconds",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000),
+)
+TRANSCRIPTION_INFERENCE = Histogram(
+    "namo_nexus_transcription_inference_ms",
+    "Whisper inference time per job in milliseconds",
+    buckets=(50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000),
+)
+TRANSCRIPTION_REJECTED = Counter(
+    "namo_nexus_transcription_rejected_total",
+    "Transcription jobs rejected because the worker queue was full",
+)
+VOICE_CACHE_LOOKUPS = Counter(
+    "namo_nexus_voice_cache_lookups_total",
+    "Voice analysis cache lookups by the tier that answered (memory, disk or miss)",
+    ["result"],
+)
+LANGUAGE_HINTS = Counter(
+    "namo_nexus_language_hints_total",
+    "Language hint outcomes: learned, uncertain, hinted or invalidated",
+    ["outcome"],
+)
+AUDIO_JOBS = Counter(
+    "namo_nexus_audio_jobs_total",
+    "Asynchronous audio triage jobs by status: queued, succeeded, failed or rejected",
+    ["status"],
+)
+TRIAGE_BATCH_QUEUE_WAIT = Histogram(
+    "namo_nexus_triage_batch_queue_wait_ms",
+    "Time a triage request waited for its micro-batch to be dispatched, in milliseconds",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+TRIAGE_BATCH_SIZE = Histogram(
+    "namo_nexus_triage_batch_size",
+    "Requests per micro-batch by what dispatched it: window, size or urgent",
+    ["trigger"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+LOG_RECORDS_DROPPED = Counter(
+    "namo_nexus_log_records_dropped_total",
+    "Log records discarded because the logging queue was full",
+)
+LOG_RECORDS_SUPPRESSED = Counter(
+    "namo_nexus_log_records_suppressed_total",
+    "Log records suppressed by sampling or rate-limit rules",
+    ["reason"],
+)
 
 
 def record_metrics(method: str, path: str, status: int, latency_ms: float) -> None:
@@ -24,3 +106,122 @@ def record_metrics(method: str, path: str, status: int, latency_ms: float) -> No
     REQUEST_LATENCY.labels(method=method, path=path).observe(latency_ms)
     if status >= 400:
         REQUEST_ERRORS.labels(method=method, path=path, status=str(status)).inc()
+
+
+def multiprocess_dir() -> Optional[str]:
+    """Return the shared mmap directory when multiprocess mode is enabled."""
+    return os.getenv(MULTIPROC_DIR_ENV) or os.getenv("prometheus_multiproc_dir") or None
+
+
+def build_registry(multiproc_dir: Optional[str] = None) -> CollectorRegistry:
+    """Registry to scrape: every worker's files when multiprocess, else this process."""
+    path = multiproc_dir or multiprocess_dir()
+    if not path:
+        return REGISTRY
+    os.makedirs(path, exist_ok=True)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=path)
+    return registry
+
+
+def pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _worker_pids(multiproc_dir: str) -> Set[int]:
+    pids: Set[int] = set()
+    for name in os.listdir(multiproc_dir):
+        stem, ext = os.path.splitext(name)
+        if ext != ".db" and not (ext == ".json" and stem.startswith("latency_")):
+            continue
+        suffix = stem.rsplit("_", 1)[-1]
+        if suffix.isdigit():
+            pids.add(int(suffix))
+    return pids
+
+
+def mark_worker_dead(pid: int, multiproc_dir: Optional[str] = None) -> None:
+    """Drop live-gauge and latency-sketch files of an exited worker.
+
+    Suitable for a gunicorn ``child_exit`` hook; scrapes also reap on their own.
+    """
+    path = multiproc_dir or multiprocess_dir()
+    if not path:
+        return
+    multiprocess.mark_process_dead(pid, path)
+    try:
+        os.remove(os.path.join(path, f"latency_{pid}.json"))
+    except FileNotFoundError:
+        pass
+
+
+def reset_multiprocess_dir(multiproc_dir: Optional[str] = None) -> None:
+    """Remove files left by a previous run. Call once from the master before forking."""
+    path = multiproc_dir or multiprocess_dir()
+    if not path:
+        return
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db") or (name.startswith("latency_") and name.endswith(".json")):
+            os.remove(os.path.join(path, name))
+
+
+class MetricsExporter:
+    """Renders the exposition payload, caching it briefly between scrapes."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = METRICS_CACHE_TTL_SECONDS,
+        multiproc_dir: Optional[str] = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.multiproc_dir = multiproc_dir or multiprocess_dir()
+        self.registry = build_registry(self.multiproc_dir)
+        self._lock = threading.Lock()
+        self._payload: Optional[bytes] = None
+        self._rendered_at = 0.0
+        self._reaped: Set[int] = set()
+
+    def reap_dead_workers(self) -> List[int]:
+        if not self.multiproc_dir or not os.path.isdir(self.multiproc_dir):
+            return []
+        own_pid = os.getpid()
+        pids = _worker_pids(self.multiproc_dir)
+        # Forget pids whose files are gone so the set tracks the directory.
+        self._reaped &= pids
+        dead = [
+            pid for pid in pids - self._reaped if pid != own_pid and not pid_alive(pid)
+        ]
+        for pid in dead:
+            mark_worker_dead(pid, self.multiproc_dir)
+            self._reaped.add(pid)
+        return dead
+
+    def render(self) -> bytes:
+        with self._lock:
+            now = time.monotonic()
+            if self._payload is not None and now - self._rendered_at < self.ttl_seconds:
+                return self._payload
+            self.reap_dead_workers()
+            self._payload = generate_latest(self.registry)
+            self._rendered_at = now
+            return self._payload
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._payload = None
+
+
+exporter = MetricsExporter()
+
+
+def render_metrics() -> bytes:
+    return exporter.render()
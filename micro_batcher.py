@@ -0,0 +1,121 @@
+"""Micro-batching of concurrent scoring calls.
+
+Callers ``await submit(item)``; items are collected until ``window_ms`` has
+passed since the first one, or ``max_size`` are waiting, and are then scored
+with one ``score_batch(items)`` call whose results resolve each caller's future
+in order. ``score_batch`` returns one result or exception per item (like
+``HarmonicGovernor.orchestrate_batch``); an exception raised by the call itself,
+or a result count that does not match the batch, fails the whole batch. An
+``urgent`` item (crisis-flagged) dispatches the batch at once, taking whatever
+is already waiting along with it.
+
+A lone request waits at most the window, so keep it at a few milliseconds;
+the wait and the batch sizes go to ``namo_nexus_triage_batch_queue_wait_ms``
+and ``namo_nexus_triage_batch_size``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Set, Tuple
+
+from metrics import TRIAGE_BATCH_QUEUE_WAIT, TRIAGE_BATCH_SIZE
+
+TRIAGE_MICROBATCH_ENABLED = (
+    os.getenv("TRIAGE_MICROBATCH_ENABLED", "false").lower() == "true"
+)
+TRIAGE_MICROBATCH_WINDOW_MS = float(os.getenv("TRIAGE_MICROBATCH_WINDOW_MS", "2"))
+TRIAGE_MICROBATCH_MAX_SIZE = int(os.getenv("TRIAGE_MICROBATCH_MAX_SIZE", "32"))
+
+logger = logging.getLogger("namo_nexus.micro_batcher")
+
+ScoreBatch = Callable[[List[Any]], Awaitable[Sequence[Any]]]
+# (item, caller's future, perf_counter() at submit)
+_Pending = Tuple[Any, "asyncio.Future[Any]", float]
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        score_batch: ScoreBatch,
+        window_ms: float = TRIAGE_MICROBATCH_WINDOW_MS,
+        max_size: int = TRIAGE_MICROBATCH_MAX_SIZE,
+    ) -> None:
+        self.score_batch = score_batch
+        self.window_seconds = max(0.0, window_ms) / 1000
+        self.max_size = max(1, max_size)
+        self._pending: List[_Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._batches = 0
+        self._items = 0
+
+    async def submit(self, item: Any, urgent: bool = False) -> Any:
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Any]" = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        if urgent:
+            self._dispatch("urgent")
+        elif len(self._pending) >= self.max_size:
+            self._dispatch("size")
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._dispatch, "window")
+        return await future
+
+    def _dispatch(self, trigger: str) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(batch, trigger))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[_Pending], trigger: str) -> None:
+        dispatched_at = time.perf_counter()
+        for _, _, submitted_at in batch:
+            TRIAGE_BATCH_QUEUE_WAIT.observe((dispatched_at - submitted_at) * 1000)
+        TRIAGE_BATCH_SIZE.labels(trigger=trigger).observe(len(batch))
+        self._batches += 1
+        self._items += len(batch)
+        try:
+            try:
+                results = await self.score_batch([item for item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"score_batch returned {len(results)} results "
+                        f"for {len(batch)} items"
+                    )
+            except Exception as exc:  # noqa: BLE001 - every caller gets it
+                logger.error("micro_batch_failed size=%d error=%s", len(batch), exc)
+                results = [exc] * len(batch)
+            for (_, future, _), result in zip(batch, results):
+                if future.done():  # the caller gave up (cancelled)
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            # Reached with callers still waiting only when scoring was interrupted by
+            # a BaseException (e.g. this task was cancelled); never leave them hanging.
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Micro-batch was not scored"))
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": self.window_seconds * 1000,
+            "max_size": self.max_size,
+            "pending": len(self._pending),
+            "in_flight_batches": len(self._tasks),
+            "batches": self._batches,
+            "avg_batch_size": (
+                round(self._items / self._batches, 2) if self._batches else 0.0
+            ),
+        }
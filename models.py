@@ -88,6 +88,7 @@ class TriageResponse(BaseModel):
     human_handoff_required: bool
     empathy_prompts: Optional[List[str]] = None
     transcription: Optional[str] = None  # Added for audio triage
+    stage_timings_ms: Optional[Dict[str, float]] = None  # Only for X-Debug-Timings callers
 
 
 @dataclass
@@ -0,0 +1,94 @@
+"""In-process statistical profiler producing collapsed stacks for flamegraphs.
+
+Nothing runs until ``collect()`` is called: it starts no thread of its own and
+simply walks ``sys._current_frames()`` from the calling thread at ``hz`` for
+``seconds``. Each output line is ``thread;outer;...;leaf count``, the format
+consumed by flamegraph.pl, speedscope and inferno.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Dict, Optional
+
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+PROFILER_MAX_HZ = int(os.getenv("PROFILER_MAX_HZ", "1000"))
+MAX_STACK_DEPTH = 128
+# Leaf frames in these modules mean the thread is parked, not doing work.
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+def _short_path(filename: str) -> str:
+    for prefix in sorted(sys.path, key=len, reverse=True):
+        if prefix and filename.startswith(prefix):
+            return filename.replace(prefix, "", 1).lstrip(os.sep)
+    return filename
+
+
+class SamplingProfiler:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._labels: Dict[CodeType, str] = {}
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)})"
+            self._labels[code] = label
+        return label
+
+    def _collapse(self, frame: Optional[FrameType]) -> tuple:
+        labels = []
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+    def collect(self, seconds: float, hz: int = 100, include_idle: bool = False) -> str:
+        """Sample every thread except the caller; blocks for ``seconds``."""
+        seconds = min(max(seconds, 0.0), PROFILER_MAX_SECONDS)
+        hz = min(max(hz, 1), PROFILER_MAX_HZ)
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            own_ident = threading.get_ident()
+            interval = 1.0 / hz
+            counts: Counter = Counter()
+            deadline = time.monotonic() + seconds
+            next_tick = time.monotonic()
+            while next_tick < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident:
+                        continue
+                    if not include_idle and frame.f_code.co_filename.endswith(
+                        _IDLE_MODULES
+                    ):
+                        continue
+                    counts[
+                        (names.get(ident, f"thread-{ident}"),) + self._collapse(frame)
+                    ] += 1
+                next_tick += interval
+                time.sleep(max(0.0, next_tick - time.monotonic()))
+        finally:
+            self._lock.release()
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in counts.most_common()
+        )
+
+
+profiler = SamplingProfiler()
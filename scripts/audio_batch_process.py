@@ -1,4 +1,13 @@
-"""Batch metadata extraction, transcription, and organization for MP3 files."""
+"""Batch metadata extraction, transcription, and organization for MP3 files.
+
+Every finished file is appended to ``manifest.ndjson`` in the output directory
+as soon as it completes, keyed by its SHA-256, so an interrupted run loses
+nothing and a re-run only processes new or changed recordings (files whose
+path, size and mtime match the manifest are not even re-hashed). Records with a
+transcription error, or transcribed with a different model, are redone.
+``--workers N`` analyses files in N processes, each loading its own Whisper
+model; ``metadata.json``/``metadata.csv`` are rebuilt from all records at the end.
+"""
 
 from __future__ import annotations
 
@@ -6,12 +15,16 @@ import argparse
 import csv
 import hashlib
 import json
+import multiprocessing
 import os
 import re
 import shutil
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from mutagen.mp3 import MP3
 
@@ -112,6 +125,222 @@ def build_groups(files: List[Path]) -> Dict[str, List[Path]]:
     return groups
 
 
+MANIFEST_NAME = "manifest.ndjson"
+
+METADATA_FIELDS = [
+    "original_path",
+    "organized_path",
+    "case_id",
+    "variant_index",
+    "sha256",
+    "file_size_bytes",
+    "duration_seconds",
+    "bitrate_kbps",
+    "sample_rate_hz",
+    "channels",
+    "tone_hint",
+    "test_hint",
+    "transcription_language",
+    "transcription_text",
+    "transcription_error",
+]
+
+# What analyze_file measures; reused as-is for files found in the manifest.
+ANALYSIS_FIELDS = [
+    "sha256",
+    "file_size_bytes",
+    "duration_seconds",
+    "bitrate_kbps",
+    "sample_rate_hz",
+    "channels",
+    "transcription_language",
+    "transcription_text",
+    "transcription_error",
+    "transcription_model",
+]
+
+# Whisper model of this worker process (or of the main process when serial).
+_worker_model = None
+
+
+def _init_worker(model_name: Optional[str], torch_threads: int) -> None:
+    global _worker_model
+    if model_name is None:
+        return
+    if torch_threads > 0:
+        try:
+            import torch  # type: ignore
+
+            # N processes x all cores each would oversubscribe the CPU.
+            torch.set_num_threads(torch_threads)
+        except ImportError:  # pragma: no cover - whisper depends on torch
+            pass
+    _worker_model = whisper.load_model(model_name, device="cpu")
+
+
+def analyze_file(path: str, checksum: Optional[str] = None) -> Dict[str, Any]:
+    """Hash, probe and (if a model is loaded) transcribe one MP3."""
+    source = Path(path)
+    stat = source.stat()
+    info = MP3(source)
+    transcription_text = None
+    transcription_language = None
+    transcription_error = None
+    if _worker_model is not None:
+        try:
+            result = _worker_model.transcribe(str(source), fp16=False)
+            transcription_text = (result.get("text") or "").strip()
+            transcription_language = result.get("language")
+        except Exception as exc:  # noqa: BLE001
+            transcription_error = str(exc)
+    return {
+        "sha256": checksum or sha256_file(source),
+        "file_size_bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "duration_seconds": round(info.info.length, 3) if info.info.length else None,
+        "bitrate_kbps": round(info.info.bitrate / 1000) if info.info.bitrate else None,
+        "sample_rate_hz": info.info.sample_rate or None,
+        "channels": info.info.channels or None,
+        "transcription_language": transcription_language,
+        "transcription_text": transcription_text,
+        "transcription_error": transcription_error,
+    }
+
+
+def load_manifest(path: Path) -> Dict[str, Dict[str, Any]]:
+    """sha256 -> latest record; a torn last line from a crash is ignored."""
+    records: Dict[str, Dict[str, Any]] = {}
+    if not path.exists():
+        return records
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and record.get("sha256"):
+                records[record["sha256"]] = record
+    return records
+
+
+def append_manifest(handle, record: Dict[str, Any]) -> None:  # type: ignore[no-untyped-def]
+    handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+def reusable(record: Optional[Dict[str, Any]], model_name: Optional[str]) -> bool:
+    if record is None or record.get("transcription_error"):
+        return False
+    return model_name is None or record.get("transcription_model") == model_name
+
+
+def find_done(
+    path: Path,
+    by_sha: Dict[str, Dict[str, Any]],
+    by_stat: Dict[Tuple[str, int, int], Dict[str, Any]],
+    model_name: Optional[str],
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """The reusable manifest record for ``path`` (or None) and its hash if computed."""
+    stat = path.stat()
+    record = by_stat.get((str(path), stat.st_size, stat.st_mtime_ns))
+    if reusable(record, model_name):
+        return record, record["sha256"]
+    # Renamed, copied or touched: fall back to the content hash.
+    checksum = sha256_file(path)
+    record = by_sha.get(checksum)
+    return (record if reusable(record, model_name) else None), checksum
+
+
+def write_outputs(record: Dict[str, Any], transcript_path: Path, transcribed: bool) -> None:
+    source, dest = Path(record["original_path"]), Path(record["organized_path"])
+    if not dest.exists() or dest.stat().st_size != record["file_size_bytes"]:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, dest)
+    if record["transcription_text"]:
+        transcript_path.write_text(record["transcription_text"], encoding="utf-8")
+    elif record["transcription_error"]:
+        transcript_path.write_text(
+            f"[transcription_error] {record['transcription_error']}",
+            encoding="utf-8",
+        )
+    elif not transcribed:
+        transcript_path.write_text(
+            "[transcription_skipped]",
+            encoding="utf-8",
+        )
+
+
+class Progress:
+    def __init__(self, total: int, skipped: int, interval: float = 5.0) -> None:
+        self.total = total
+        self.skipped = skipped
+        self.interval = interval
+        self.done = 0
+        self.audio_seconds = 0.0
+        self.started = time.monotonic()
+        self._reported = self.started
+
+    def update(self, record: Dict[str, Any]) -> None:
+        self.done += 1
+        self.audio_seconds += record.get("duration_seconds") or 0.0
+        now = time.monotonic()
+        if now - self._reported >= self.interval or self.done == self.total:
+            self._reported = now
+            self.report(now)
+
+    def report(self, now: Optional[float] = None) -> None:
+        elapsed = max((now or time.monotonic()) - self.started, 1e-9)
+        rate = self.done / elapsed
+        eta = (self.total - self.done) / rate if rate else float("inf")
+        print(
+            f"[{self.done}/{self.total}] {rate:.2f} files/s, "
+            f"{self.audio_seconds / elapsed:.1f} audio s/s, "
+            f"elapsed {elapsed:.0f}s, eta {eta:.0f}s ({self.skipped} already done)",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+def run_analysis(
+    pending: List[Tuple[Dict[str, Any], Optional[str]]],
+    model_name: Optional[str],
+    workers: int,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Yield (task, analysis) as files finish, serially or in a process pool."""
+    if workers <= 1:
+        _init_worker(model_name, 0)
+        for task, checksum in pending:
+            yield task, analyze_file(task["path"], checksum)
+        return
+
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    # spawn: whisper/torch do not survive a fork reliably.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_name, torch_threads),
+    ) as executor:
+        # Keep a bounded window in flight so thousands of files are not all queued.
+        queue = iter(pending)
+        running: Dict[Future, Dict[str, Any]] = {}
+
+        def _fill() -> None:
+            for task, checksum in queue:
+                running[executor.submit(analyze_file, task["path"], checksum)] = task
+                if len(running) >= workers * 2:
+                    break
+
+        _fill()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                yield task, future.result()
+            _fill()
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Extract metadata, transcribe, and organize MP3 files.",
@@ -136,6 +365,17 @@ def main() -> int:
         action="store_true",
         help="Skip transcription.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes, each loading its own model (default: 1, serial).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"Reprocess files already recorded in {MANIFEST_NAME}.",
+    )
     args = parser.parse_args()
 
     input_dir = Path(args.input).resolve()
@@ -157,109 +397,96 @@ def main() -> int:
     groups = build_groups(files)
 
     ffmpeg_path = None
-    model = None
+    model_name = None
     if not args.no_transcribe:
         if whisper is None:
             raise SystemExit("Whisper is not installed. Use --no-transcribe or install.")
         ffmpeg_path = ensure_ffmpeg_in_path(output_dir)
-        model = whisper.load_model(args.model, device="cpu")
+        model_name = args.model
 
-    records: List[Dict[str, object]] = []
-    for case_id, paths in groups.items():
-        case_dir = audio_dir / case_id
-        case_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    by_sha = {} if args.force else load_manifest(manifest_path)
+    by_stat = {
+        (record["original_path"], record["file_size_bytes"], record.get("mtime_ns")): record
+        for record in by_sha.values()
+    }
 
+    tasks: List[Dict[str, Any]] = []
+    for case_id, paths in groups.items():
         for idx, path in enumerate(paths, start=1):
-            dest_name = f"{case_id}_v{idx:02d}.mp3"
-            dest_path = case_dir / dest_name
-            shutil.copy2(path, dest_path)
-
-            info = MP3(path)
-            duration_seconds = round(info.info.length, 3) if info.info.length else None
-            bitrate_kbps = round(info.info.bitrate / 1000) if info.info.bitrate else None
-            sample_rate_hz = info.info.sample_rate or None
-            channels = info.info.channels or None
-            file_size_bytes = path.stat().st_size
-            checksum = sha256_file(path)
-
-            transcription_text = None
-            transcription_language = None
-            transcription_error = None
-            transcript_path = transcripts_dir / f"{case_id}_v{idx:02d}.txt"
-            if model is not None:
-                try:
-                    result = model.transcribe(str(path), fp16=False)
-                    transcription_text = (result.get("text") or "").strip()
-                    transcription_language = result.get("language")
-                except Exception as exc:  # noqa: BLE001
-                    transcription_error = str(exc)
-
-            if transcription_text:
-                transcript_path.write_text(transcription_text, encoding="utf-8")
-            elif transcription_error:
-                transcript_path.write_text(
-                    f"[transcription_error] {transcription_error}",
-                    encoding="utf-8",
-                )
-            elif model is None:
-                transcript_path.write_text(
-                    "[transcription_skipped]",
-                    encoding="utf-8",
-                )
-
             case_letter = extract_case_letter(case_id)
-            tone_hint = None
-            test_hint = None
-            if case_letter and case_letter in TONE_HINTS:
-                tone_hint = TONE_HINTS[case_letter]["tone_hint"]
-                test_hint = TONE_HINTS[case_letter]["test_hint"]
-
-            records.append(
+            hints = TONE_HINTS.get(case_letter or "", {})
+            tasks.append(
                 {
-                    "original_path": str(path),
-                    "organized_path": str(dest_path),
+                    "path": str(path),
                     "case_id": case_id,
                     "variant_index": idx,
-                    "sha256": checksum,
-                    "file_size_bytes": file_size_bytes,
-                    "duration_seconds": duration_seconds,
-                    "bitrate_kbps": bitrate_kbps,
-                    "sample_rate_hz": sample_rate_hz,
-                    "channels": channels,
-                    "tone_hint": tone_hint,
-                    "test_hint": test_hint,
-                    "transcription_language": transcription_language,
-                    "transcription_text": transcription_text,
-                    "transcription_error": transcription_error,
+                    "organized_path": str(audio_dir / case_id / f"{case_id}_v{idx:02d}.mp3"),
+                    "transcript_path": transcripts_dir / f"{case_id}_v{idx:02d}.txt",
+                    "tone_hint": hints.get("tone_hint"),
+                    "test_hint": hints.get("test_hint"),
                 }
             )
 
+    records_by_path: Dict[str, Dict[str, Any]] = {}
+    pending: List[Tuple[Dict[str, Any], Optional[str]]] = []
+    with manifest_path.open("a", encoding="utf-8") as manifest:
+
+        def _complete(task: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+            record = {
+                "original_path": task["path"],
+                "organized_path": task["organized_path"],
+                "case_id": task["case_id"],
+                "variant_index": task["variant_index"],
+                "transcription_model": model_name,
+                **analysis,
+                "tone_hint": task["tone_hint"],
+                "test_hint": task["test_hint"],
+            }
+            write_outputs(record, task["transcript_path"], model_name is not None)
+            records_by_path[task["path"]] = record
+            return record
+
+        for task in tasks:
+            done, checksum = (None, None) if args.force else find_done(
+                Path(task["path"]), by_sha, by_stat, model_name
+            )
+            if done is None:
+                pending.append((task, checksum))
+                continue
+            analysis = {key: done.get(key) for key in ANALYSIS_FIELDS}
+            analysis["mtime_ns"] = Path(task["path"]).stat().st_mtime_ns
+            record = _complete(task, analysis)
+            # Moved, renamed or touched: record it so the next run skips the hash.
+            if any(record[key] != done.get(key) for key in ("original_path", "organized_path", "mtime_ns")):
+                append_manifest(manifest, record)
+
+        skipped = len(tasks) - len(pending)
+        print(
+            f"{len(tasks)} files, {skipped} already in {MANIFEST_NAME}, "
+            f"{len(pending)} to process with {max(1, args.workers)} worker(s)",
+            file=sys.stderr,
+        )
+        progress = Progress(len(pending), skipped)
+        for task, analysis in run_analysis(pending, model_name, args.workers):
+            append_manifest(manifest, _complete(task, analysis))
+            progress.update(records_by_path[task["path"]])
+
+    records = [records_by_path[task["path"]] for task in tasks]
+
     metadata_path = output_dir / "metadata.json"
     metadata_path.write_text(
-        json.dumps(records, ensure_ascii=False, indent=2),
+        json.dumps(
+            [{key: record[key] for key in METADATA_FIELDS} for record in records],
+            ensure_ascii=False,
+            indent=2,
+        ),
         encoding="utf-8",
     )
 
     csv_path = output_dir / "metadata.csv"
-    fieldnames = [
-        "original_path",
-        "organized_path",
-        "case_id",
-        "variant_index",
-        "sha256",
-        "file_size_bytes",
-        "duration_seconds",
-        "bitrate_kbps",
-        "sample_rate_hz",
-        "channels",
-        "tone_hint",
-        "test_hint",
-        "transcription_language",
-        "transcription_text",
-        "transcription_error",
-    ]
     with csv_path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
+        writer = csv.DictWriter(handle, fieldnames=METADATA_FIELDS, extrasaction="ignore")
         writer.writeheader()
         writer.writerows(records)
 
@@ -269,8 +496,9 @@ def main() -> int:
         f"- Input directory: {input_dir}",
         f"- Output directory: {output_dir}",
         f"- Files processed: {len(files)}",
+        f"- Processed this run: {len(pending)} ({skipped} reused from {MANIFEST_NAME})",
         f"- Case groups: {len(groups)}",
-        f"- Transcription model: {args.model if model else 'skipped'}",
+        f"- Transcription model: {model_name or 'skipped'}",
         f"- FFMPEG path: {ffmpeg_path or 'not used'}",
         f"- Generated: {datetime.now(timezone.utc).isoformat()}",
         "",
@@ -9,13 +9,14 @@ from fastapi import FastAPI, Request, Response, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-from prometheus_client import Counter, Histogram, generate_latest
 from slowapi import _rate_limit_exceeded_handler
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
+from loop_monitor import start_loop_monitor, stop_loop_monitor
+from metrics import CONTENT_TYPE_LATEST, UNMATCHED_ROUTE, record_metrics, render_metrics
 from src.api import routes
 from src.api.limiter import limiter
 from src.config import config
@@ -44,7 +45,9 @@ async def lifespan(app: FastAPI):
             raise
     else:
         logger.info("Database auto-create disabled")
+    start_loop_monitor()
     yield
+    await stop_loop_monitor()
     logger.info("Application shutdown")
 
 
@@ -60,8 +63,6 @@ app.state.limiter = limiter
 app.add_exception_handler(429, _rate_limit_exceeded_handler)
 
 latency_metrics = LatencyMetricsStore()
-REQUEST_COUNT = Counter("namonexus_requests_total", "Total requests")
-REQUEST_LATENCY = Histogram("namonexus_latency_seconds", "Latency")
 
 
 @app.middleware("http")
@@ -69,9 +70,9 @@ async def record_latency(request, call_next):
     start_time = time.perf_counter()
     response = await call_next(request)
     duration = time.perf_counter() - start_time
-    latency_metrics.record(duration, response.status_code)
-    REQUEST_COUNT.inc()
-    REQUEST_LATENCY.observe(duration)
+    route = getattr(request.scope.get("route"), "path", UNMATCHED_ROUTE)
+    latency_metrics.record(duration, response.status_code, route=route)
+    record_metrics(request.method, route, response.status_code, duration * 1000)
     response.headers["X-Request-Duration-Ms"] = f"{duration * 1000:.2f}"
     return response
 
@@ -116,10 +117,11 @@ def metrics(request: Request):
     """Runtime metrics for monitoring and reporting."""
     accept_header = request.headers.get("accept", "")
     if "text/plain" in accept_header or "application/openmetrics-text" in accept_header:
-        return Response(generate_latest(), media_type="text/plain")
+        return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
     return {
         "status": "ok",
         "latency": latency_metrics.summary(),
+        "routes": latency_metrics.route_summary(),
     }
 
 
@@ -2,6 +2,8 @@ from dataclasses import asdict, dataclass
 from typing import Dict, List
 import time
 
+from memory_diagnostics import register_size
+
 
 @dataclass
 class Memory:
@@ -72,3 +74,7 @@ class MemoryService:
 
 
 memory_service = MemoryService()
+register_size(
+    "memory_service.memory_store",
+    lambda: sum(len(memories) for memories in list(memory_service.memory_store.values())),
+)
@@ -1,76 +1,453 @@
 from __future__ import annotations
 
+import json
 import math
+import os
+import threading
 import time
-from collections import deque
 from threading import Lock
-from typing import Deque, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
+from metrics import pid_alive
 
-def _percentile(sorted_values: List[float], percentile: float) -> float:
-    if not sorted_values:
-        return 0.0
-    if percentile <= 0:
-        return sorted_values[0]
-    if percentile >= 1:
-        return sorted_values[-1]
-    index = (len(sorted_values) - 1) * percentile
-    lower = math.floor(index)
-    upper = math.ceil(index)
-    if lower == upper:
-        return sorted_values[int(index)]
-    weight = index - lower
-    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * weight
+SLOT_SECONDS = 10
+WINDOWS: Dict[str, int] = {"1m": 60, "5m": 300, "1h": 3600}
+DEFAULT_WINDOW = "5m"
+PUBLISH_INTERVAL_SECONDS = 5.0
+VIEW_CACHE_TTL_SECONDS = float(os.getenv("LATENCY_VIEW_CACHE_TTL_SECONDS", "1.0"))
+RELATIVE_ACCURACY = 0.01
+SeriesKey = Tuple[str, str]
+
+
+class DDSketch:
+    """Mergeable quantile sketch with bounded relative error (Masson et al., 2019).
+
+    Values are mapped to logarithmic buckets so each ``add`` is O(1) and any
+    quantile is within ``relative_accuracy`` of the true value.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._multiplier = 1 / math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        if value > self.min_value:
+            key = math.ceil(math.log(value) * self._multiplier)
+            self.bins[key] = self.bins.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "DDSketch") -> None:
+        if other.count == 0:
+            return
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        cumulative = self.zero_count
+        if cumulative > rank:
+            return max(self.min, 0.0)
+        for key in sorted(self.bins):
+            cumulative += self.bins[key]
+            if cumulative > rank:
+                value = 2 * self._gamma**key / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def avg(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def to_compact(self) -> List[Any]:
+        keys = list(self.bins)
+        return [
+            self.zero_count,
+            self.count,
+            self.sum,
+            self.min if self.count else 0.0,
+            self.max if self.count else 0.0,
+            keys,
+            [self.bins[key] for key in keys],
+        ]
+
+    @classmethod
+    def from_compact(cls, data: List[Any], relative_accuracy: float = 0.01) -> "DDSketch":
+        sketch = cls(relative_accuracy=relative_accuracy)
+        zero_count, count, total, minimum, maximum, keys, counts = data
+        sketch.bins = dict(zip(keys, counts))
+        sketch.zero_count = zero_count
+        sketch.count = count
+        sketch.sum = total
+        if count:
+            sketch.min = minimum
+            sketch.max = maximum
+        return sketch
+
+
+class RollingSketch:
+    """Time-sliced sketches so any trailing window can be merged on demand."""
+
+    def __init__(self, horizon_seconds: int = max(WINDOWS.values())) -> None:
+        self.horizon_slots = horizon_seconds // SLOT_SECONDS
+        self.slots: Dict[int, DDSketch] = {}
+        self.errors: Dict[int, int] = {}
+        # Closed slots no longer change, so their encoding is computed once.
+        self._encoded: Dict[int, List[Any]] = {}
+
+    def add(self, value: float, slot: int, is_error: bool) -> None:
+        sketch = self.slots.get(slot)
+        if sketch is None:
+            sketch = self.slots[slot] = DDSketch()
+            self.prune(slot)
+        sketch.add(value)
+        self._encoded.pop(slot, None)
+        if is_error:
+            self.errors[slot] = self.errors.get(slot, 0) + 1
+
+    def prune(self, current_slot: int) -> None:
+        oldest = current_slot - self.horizon_slots
+        for slot in [slot for slot in self.slots if slot <= oldest]:
+            del self.slots[slot]
+            self.errors.pop(slot, None)
+            self._encoded.pop(slot, None)
+
+    def __bool__(self) -> bool:
+        return bool(self.slots)
+
+    def accumulate(self, current_slot: int, into: Dict[str, List[Any]]) -> None:
+        """Merge slots into ``into[window] = [DDSketch, errors]`` for every window."""
+        for slot, sketch in self.slots.items():
+            age = current_slot - slot
+            for name, seconds in WINDOWS.items():
+                if age < seconds // SLOT_SECONDS:
+                    bucket = into.setdefault(name, [DDSketch(), 0])
+                    bucket[0].merge(sketch)
+                    bucket[1] += self.errors.get(slot, 0)
+
+    def to_compact(self, current_slot: int) -> List[Any]:
+        rows = []
+        for slot, sketch in self.slots.items():
+            encoded = self._encoded.get(slot)
+            if encoded is None:
+                encoded = [slot, self.errors.get(slot, 0), sketch.to_compact()]
+                if slot < current_slot:
+                    self._encoded[slot] = encoded
+            rows.append(encoded)
+        return rows
+
+    @classmethod
+    def from_compact(cls, rows: List[Any], relative_accuracy: float) -> "RollingSketch":
+        rolling = cls()
+        for slot, errors, sketch in rows:
+            rolling.slots[slot] = DDSketch.from_compact(sketch, relative_accuracy)
+            if errors:
+                rolling.errors[slot] = errors
+        return rolling
+
+
+def _latency_fields(sketch: DDSketch) -> Dict[str, float]:
+    return {
+        "avg_ms": round(sketch.avg * 1000, 2),
+        "p50_ms": round(sketch.quantile(0.5) * 1000, 2),
+        "p95_ms": round(sketch.quantile(0.95) * 1000, 2),
+        "p99_ms": round(sketch.quantile(0.99) * 1000, 2),
+        "p999_ms": round(sketch.quantile(0.999) * 1000, 2),
+    }
+
+
+class _MergedView:
+    """Per-window sketches for this worker plus every live peer."""
+
+    def __init__(self, current_slot: int) -> None:
+        self.current_slot = current_slot
+        self.count = 0
+        self.error_count = 0
+        self.start_time = math.inf
+        self.overall: Dict[str, List[Any]] = {}
+        self.series: Dict[SeriesKey, Dict[str, List[Any]]] = {}
+
+    def add(
+        self,
+        count: int,
+        error_count: int,
+        start_time: float,
+        overall: RollingSketch,
+        series: Dict[SeriesKey, RollingSketch],
+    ) -> None:
+        self.count += count
+        self.error_count += error_count
+        self.start_time = min(self.start_time, start_time)
+        overall.accumulate(self.current_slot, self.overall)
+        for key, rolling in series.items():
+            rolling.accumulate(self.current_slot, self.series.setdefault(key, {}))
+
+    @staticmethod
+    def window(buckets: Dict[str, List[Any]], name: str) -> Tuple[DDSketch, int]:
+        sketch, errors = buckets.get(name) or (DDSketch(), 0)
+        return sketch, errors
 
 
 class LatencyMetricsStore:
-    def __init__(self, max_samples: int = 5000) -> None:
-        self._samples: Deque[float] = deque(maxlen=max_samples)
+    """Request latency sketches per route/status over rolling 1m/5m/1h windows.
+
+    When ``shared_dir`` is set (``LATENCY_SKETCH_DIR``, falling back to
+    ``PROMETHEUS_MULTIPROC_DIR``) a background thread publishes this worker's
+    sketches there every few seconds and summaries merge every live worker's
+    view. Merged views are cached for ``LATENCY_VIEW_CACHE_TTL_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        shared_dir: Optional[str] = None,
+        view_ttl_seconds: float = VIEW_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._overall = RollingSketch()
+        self._series: Dict[SeriesKey, RollingSketch] = {}
         self._count = 0
         self._error_count = 0
         self._lock = Lock()
         self._start_time = time.time()
+        self._swept_slot = 0
+        self.shared_dir = shared_dir or os.getenv("LATENCY_SKETCH_DIR") or os.getenv(
+            "PROMETHEUS_MULTIPROC_DIR"
+        )
+        self.view_ttl_seconds = view_ttl_seconds
+        self._view: Optional[_MergedView] = None
+        self._view_at = 0.0
+        self._view_lock = Lock()
+        self._peers: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._publisher_pid: Optional[int] = None
+        self._stop = threading.Event()
 
-    def record(self, duration_seconds: float, status_code: int) -> None:
+    def record(self, duration_seconds: float, status_code: int, route: str = "*") -> None:
+        slot = int(time.time() // SLOT_SECONDS)
+        is_error = status_code >= 500
+        key = (route, str(status_code))
         with self._lock:
             self._count += 1
-            if status_code >= 500:
+            if is_error:
                 self._error_count += 1
-            self._samples.append(duration_seconds)
+            if slot != self._swept_slot:
+                self._sweep_locked(slot)
+            self._overall.add(duration_seconds, slot, is_error)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = RollingSketch()
+            series.add(duration_seconds, slot, is_error)
+        if self.shared_dir is not None and self._publisher_pid != os.getpid():
+            self._start_publisher()
 
-    def summary(self) -> Dict[str, float]:
-        with self._lock:
-            samples = list(self._samples)
-            count = self._count
-            error_count = self._error_count
-            uptime_seconds = max(0.0, time.time() - self._start_time)
+    def _sweep_locked(self, slot: int) -> None:
+        # Runs once per slot: expire old slots and forget series that went idle.
+        self._swept_slot = slot
+        self._overall.prune(slot)
+        for key in list(self._series):
+            series = self._series[key]
+            series.prune(slot)
+            if not series:
+                del self._series[key]
 
-        if not samples:
+    def snapshot(self) -> Dict[str, Any]:
+        slot = int(time.time() // SLOT_SECONDS)
+        with self._lock:
             return {
-                "requests": float(count),
-                "errors": float(error_count),
-                "uptime_seconds": round(uptime_seconds, 2),
-                "avg_ms": 0.0,
-                "p50_ms": 0.0,
-                "p95_ms": 0.0,
-                "p99_ms": 0.0,
-                "rps": round((count / uptime_seconds) if uptime_seconds else 0.0, 4),
+                "pid": os.getpid(),
+                "start_time": self._start_time,
+                "count": self._count,
+                "error_count": self._error_count,
+                "relative_accuracy": RELATIVE_ACCURACY,
+                "overall": self._overall.to_compact(slot),
+                "series": [
+                    [route, status, rolling.to_compact(slot)]
+                    for (route, status), rolling in self._series.items()
+                ],
             }
 
-        samples_sorted = sorted(samples)
-        avg = sum(samples_sorted) / len(samples_sorted)
-        p50 = _percentile(samples_sorted, 0.5)
-        p95 = _percentile(samples_sorted, 0.95)
-        p99 = _percentile(samples_sorted, 0.99)
-        rps = (count / uptime_seconds) if uptime_seconds else 0.0
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(str(self.shared_dir), f"latency_{pid}.json")
+
+    def _start_publisher(self) -> None:
+        with self._view_lock:
+            if self._publisher_pid == os.getpid():
+                return
+            self._publisher_pid = os.getpid()
+            self._stop.clear()
+        thread = threading.Thread(
+            target=self._publish_loop, name="latency-sketch-publisher", daemon=True
+        )
+        thread.start()
 
+    def _publish_loop(self) -> None:
+        while True:
+            self.publish()
+            if self._stop.wait(PUBLISH_INTERVAL_SECONDS):
+                return
+
+    def stop_publisher(self) -> None:
+        self._stop.set()
+
+    def publish(self) -> None:
+        snapshot = self.snapshot()
+        try:
+            os.makedirs(str(self.shared_dir), exist_ok=True)
+            path = self._snapshot_path(snapshot["pid"])
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(snapshot, handle, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def _peer_snapshots(self) -> List[Dict[str, Any]]:
+        """Parsed snapshots of live peers; files are re-read only when they change."""
+        if not self.shared_dir or not os.path.isdir(self.shared_dir):
+            return []
+        own_pid = os.getpid()
+        peers = []
+        seen = set()
+        for name in os.listdir(self.shared_dir):
+            if not name.startswith("latency_") or not name.endswith(".json"):
+                continue
+            pid_text = name[len("latency_") : -len(".json")]
+            if not pid_text.isdigit() or int(pid_text) == own_pid:
+                continue
+            path = os.path.join(self.shared_dir, name)
+            if not pid_alive(int(pid_text)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                mtime = os.stat(path).st_mtime_ns
+                cached = self._peers.get(path)
+                if cached is None or cached[0] != mtime:
+                    with open(path, "r", encoding="utf-8") as handle:
+                        data = json.load(handle)
+                    accuracy = data["relative_accuracy"]
+                    parsed = {
+                        "count": data["count"],
+                        "error_count": data["error_count"],
+                        "start_time": data["start_time"],
+                        "overall": RollingSketch.from_compact(data["overall"], accuracy),
+                        "series": {
+                            (route, status): RollingSketch.from_compact(rows, accuracy)
+                            for route, status, rows in data["series"]
+                        },
+                    }
+                    cached = self._peers[path] = (mtime, parsed)
+            except (OSError, ValueError, KeyError):
+                continue
+            seen.add(path)
+            peers.append(cached[1])
+        for path in set(self._peers) - seen:
+            del self._peers[path]
+        return peers
+
+    def _merged_view(self) -> _MergedView:
+        with self._view_lock:
+            now = time.monotonic()
+            if self._view is not None and now - self._view_at < self.view_ttl_seconds:
+                return self._view
+            view = _MergedView(int(time.time() // SLOT_SECONDS))
+            with self._lock:
+                view.add(
+                    self._count,
+                    self._error_count,
+                    self._start_time,
+                    self._overall,
+                    self._series,
+                )
+            for peer in self._peer_snapshots():
+                view.add(
+                    peer["count"],
+                    peer["error_count"],
+                    peer["start_time"],
+                    peer["overall"],
+                    peer["series"],
+                )
+            self._view = view
+            self._view_at = now
+            return view
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals since start plus latency quantiles for each rolling window.
+
+        Top-level ``*_ms`` fields describe the default 5 minute window.
+        """
+        view = self._merged_view()
+        uptime_seconds = max(0.0, time.time() - view.start_time)
+
+        windows: Dict[str, Dict[str, float]] = {}
+        for name, seconds in WINDOWS.items():
+            sketch, errors = view.window(view.overall, name)
+            span = min(float(seconds), uptime_seconds) or float(seconds)
+            windows[name] = {
+                "requests": float(sketch.count),
+                "errors": float(errors),
+                **_latency_fields(sketch),
+                "rps": round(sketch.count / span, 4),
+            }
+
+        default = windows[DEFAULT_WINDOW]
         return {
-            "requests": float(count),
-            "errors": float(error_count),
+            "requests": float(view.count),
+            "errors": float(view.error_count),
             "uptime_seconds": round(uptime_seconds, 2),
-            "avg_ms": round(avg * 1000, 2),
-            "p50_ms": round(p50 * 1000, 2),
-            "p95_ms": round(p95 * 1000, 2),
-            "p99_ms": round(p99 * 1000, 2),
-            "rps": round(rps, 4),
+            "avg_ms": default["avg_ms"],
+            "p50_ms": default["p50_ms"],
+            "p95_ms": default["p95_ms"],
+            "p99_ms": default["p99_ms"],
+            "p999_ms": default["p999_ms"],
+            "rps": round((view.count / uptime_seconds) if uptime_seconds else 0.0, 4),
+            "windows": windows,
         }
+
+    def route_summary(self, window: str = DEFAULT_WINDOW) -> List[Dict[str, Any]]:
+        """Per route/status latency over one of ``WINDOWS``."""
+        if window not in WINDOWS:
+            raise ValueError(f"Unknown window: {window}")
+        view = self._merged_view()
+        rows = []
+        for (route, status), buckets in sorted(view.series.items()):
+            sketch, _ = view.window(buckets, window)
+            if sketch.count == 0:
+                continue
+            rows.append(
+                {
+                    "route": route,
+                    "status": status,
+                    "window": window,
+                    "requests": float(sketch.count),
+                    **_latency_fields(sketch),
+                }
+            )
+        return rows
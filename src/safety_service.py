@@ -1,5 +1,6 @@
 from typing import Dict, List
 
+from memory_diagnostics import register_size
 from src.config import config
 
 
@@ -73,3 +74,4 @@ class SafetyService:
 
 
 safety_service = SafetyService()
+register_size("safety_service.escalation_log", lambda: len(safety_service.escalation_log))
@@ -45,7 +45,8 @@ class EmotionService:
                 "raw_sentiment": emotion.upper(),
             }
             logger.info(
-                "Emotion analyzed", extra={"emotion": emotion, "intensity": intensity}
+                "Emotion analyzed",
+                extra={"emotion": emotion, "intensity": intensity, "log_key": "emotion.analyzed"},
             )
             return payload
         except InvalidInputError:
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import Dict, List
 
+from memory_diagnostics import register_size
 from src.config import config
 from src.utils.exceptions import InvalidInputError, ServiceError
 from src.utils.logger import logger
@@ -37,7 +38,15 @@ class SafetyService:
                 "signals": matched,
                 "user_id": user_id,
             }
-            logger.info("Safety check completed", extra={"user_id": user_id, "risk_score": risk_score})
+            logger.info(
+                "Safety check completed",
+                extra={
+                    "user_id": user_id,
+                    "risk_score": risk_score,
+                    "log_key": "safety.checked",
+                    "crisis": is_critical,
+                },
+            )
             return result
         except InvalidInputError:
             raise
@@ -92,3 +101,4 @@ class SafetyService:
 
 
 safety_service = SafetyService()
+register_size("services.safety_service.escalation_log", lambda: len(safety_service.escalation_log))
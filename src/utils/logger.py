@@ -2,15 +2,29 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+from metrics import LOG_RECORDS_DROPPED, LOG_RECORDS_SUPPRESSED
+from structured_logging import (
+    LogPipeline,
+    PayloadFormatter,
+    build_file_handler,
+    get_sampling_filter,
+)
+
+# Interactions at or above this risk score (SafetyService's critical threshold)
+# bypass log sampling.
+CRISIS_RISK_SCORE = 0.75
 
 
 def setup_logger(name: str, log_level: str = "INFO") -> logging.Logger:
-    """Initialize a logger with console and file handlers."""
+    """Initialize a logger whose console and rotating file output run off-thread.
+
+    Set ``LOG_DIR`` to an empty string to disable the file handler.
+    """
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger
@@ -18,22 +32,21 @@ def setup_logger(name: str, log_level: str = "INFO") -> logging.Logger:
     level = getattr(logging, log_level.upper(), logging.INFO)
     logger.setLevel(level)
 
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    formatter = PayloadFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    log_dir = os.getenv("LOG_DIR", "logs")
+    if log_dir:
+        handlers.append(build_file_handler(os.path.join(log_dir, "namonexus.log")))
+    for handler in handlers:
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
 
-    log_dir = "logs"
-    os.makedirs(log_dir, exist_ok=True)
-    file_handler = logging.FileHandler(
-        os.path.join(log_dir, f"namonexus_{datetime.utcnow().strftime('%Y%m%d')}.log")
+    pipeline = LogPipeline(handlers, on_drop=LOG_RECORDS_DROPPED.inc).start()
+    pipeline.handler.addFilter(
+        get_sampling_filter(lambda reason: LOG_RECORDS_SUPPRESSED.labels(reason=reason).inc())
     )
-    file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
-
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(pipeline.handler)
 
     return logger
 
@@ -57,7 +70,14 @@ def log_interaction(
         "risk_score": risk_score,
         "response_preview": response.get("response", "")[:100],
     }
-    logger.info(json.dumps(log_data))
+    logger.info(
+        "interaction",
+        extra={
+            "log_key": "interaction",
+            "crisis": risk_score >= CRISIS_RISK_SCORE,
+            "payload": log_data,
+        },
+    )
 
 
 def log_error(error_type: str, user_id: str, error_message: str, traceback_str: str) -> None:
@@ -69,4 +89,4 @@ def log_error(error_type: str, user_id: str, error_message: str, traceback_str:
         "error_message": error_message,
         "traceback": traceback_str,
     }
-    logger.error(json.dumps(log_data))
+    logger.error("error", extra={"payload": log_data})
@@ -0,0 +1,90 @@
+"""Per-stage timers feeding a Prometheus histogram and, on request, the response.
+
+``with Span("governor.calibrate"):`` times a block and ``@timed("grid.get_alerts")``
+wraps a sync or async callable. Every span is observed into
+``namo_nexus_stage_latency_ms``; inside ``collect_stage_timings()`` the durations
+are also summed per stage into a dict that debug callers can return. Stage names
+must come from a fixed set, they become label values.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from metrics import STAGE_LATENCY
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "stage_timings", default=None
+)
+_observers: Dict[str, Any] = {}
+
+
+def record_stage(stage: str, elapsed_ms: float) -> None:
+    observer = _observers.get(stage)
+    if observer is None:
+        # Resolving label children costs more than the observation; do it once.
+        observer = _observers[stage] = STAGE_LATENCY.labels(stage=stage)
+    observer.observe(elapsed_ms)
+    timings = _timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + elapsed_ms
+
+
+class Span:
+    __slots__ = ("stage", "_start")
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+        self._start = 0.0
+
+    def __enter__(self) -> "Span":
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        record_stage(self.stage, (perf_counter() - self._start) * 1000.0)
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record_stage(stage, (perf_counter() - start) * 1000.0)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_stage(stage, (perf_counter() - start) * 1000.0)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@contextmanager
+def collect_stage_timings() -> Iterator[Dict[str, float]]:
+    """Collect stage durations (ms) for the current request, including child tasks."""
+    timings: Dict[str, float] = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
@@ -1,14 +1,44 @@
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
+import math
 import os
+import queue
+import threading
+import time
 from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import Optional
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 trace_id_var: ContextVar[str] = ContextVar("trace_id", default="-")
 
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_QUEUE_DROP_POLICY = os.getenv("LOG_QUEUE_DROP_POLICY", "drop_newest")
+DROP_POLICIES = {"drop_newest", "drop_oldest"}
+LOG_ROTATION = os.getenv("LOG_ROTATION", "size")
+SENTINEL_TIMEOUT_SECONDS = 5.0
+LOG_SAMPLING_RELOAD_SECONDS = float(os.getenv("LOG_SAMPLING_RELOAD_SECONDS", "5"))
+
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
 
 class JsonFormatter(logging.Formatter):
     def __init__(self, service_name: str) -> None:
@@ -17,21 +47,427 @@ class JsonFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         payload = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "log_level": record.levelname,
             "service_name": self.service_name,
-            "trace_id": trace_id_var.get(),
+            "trace_id": getattr(record, "trace_id", None) or trace_id_var.get(),
             "message": record.getMessage(),
         }
         if record.exc_info:
             payload["exception"] = self.formatException(record.exc_info)
-        return json.dumps(payload, ensure_ascii=False)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        return _dumps(payload)
+
+
+class PayloadFormatter(logging.Formatter):
+    """Renders ``extra={"payload": {...}}`` as the JSON message on the listener thread.
+
+    Callers hand the dict over as-is, so serialisation happens off the request path.
+    """
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        payload = getattr(record, "payload", None)
+        if payload is not None:
+            record.message = _dumps(payload)
+        return super().formatMessage(record)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller once the queue is full.
+
+    ``drop_newest`` discards the incoming record, ``drop_oldest`` evicts the
+    head of the queue to make room. Discarded records are counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        log_queue: "queue.Queue[logging.LogRecord]",
+        drop_policy: str,
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> None:
+        super().__init__(log_queue)
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown log drop policy: {drop_policy}")
+        self.drop_policy = drop_policy
+        self.on_drop = on_drop
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Copy so handlers later in the chain still see the original record, and
+        # capture request-scoped state here; the listener thread has no context.
+        record = copy.copy(record)
+        # An explicit extra={"trace_id": ...} wins, e.g. for watchdog threads.
+        record.trace_id = getattr(record, "trace_id", None) or trace_id_var.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.drop_policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        with self._dropped_lock:
+            self.dropped += 1
+        if self.on_drop is not None:
+            self.on_drop()
+
+
+class _DrainingQueueListener(QueueListener):
+    """Listener whose stop sentinel always fits, even in a saturated queue."""
+
+    def enqueue_sentinel(self) -> None:
+        try:
+            self.queue.put(self._sentinel, timeout=SENTINEL_TIMEOUT_SECONDS)
+            return
+        except queue.Full:
+            pass
+        while True:
+            try:
+                self.queue.put_nowait(self._sentinel)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class _TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class _SamplingRule:
+    """Keeps ``sample`` of matching records, then caps them at ``rate`` per second."""
+
+    def __init__(
+        self,
+        name: str,
+        sample: float = 1.0,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+    ) -> None:
+        sample = float(sample)
+        if not 0.0 <= sample <= 1.0:
+            raise ValueError(f"Sampling ratio for {name!r} must be within [0, 1]")
+        if rate is not None and float(rate) <= 0:
+            raise ValueError(f"Rate limit for {name!r} must be positive")
+        self.name = name
+        self.sample = sample
+        self.rate = float(rate) if rate is not None else None
+        if burst is not None:
+            self.burst: Optional[float] = float(burst)
+        else:
+            self.burst = max(self.rate, 1.0) if self.rate else None
+        self.bucket = _TokenBucket(self.rate, self.burst) if self.rate else None
+        self.seen = 0
+        self.sampled = 0
+        self.rate_limited = 0
+
+    def admit(self, now: float) -> Optional[str]:
+        """Return the suppression reason, or ``None`` when the record passes."""
+        self.seen += 1
+        # Deterministic sampling: pass whenever ceil(seen * ratio) ticks over,
+        # so the first record always passes and the long-run ratio is exact.
+        if math.ceil(self.seen * self.sample) == math.ceil((self.seen - 1) * self.sample):
+            self.sampled += 1
+            return "sampled"
+        if self.bucket is not None and not self.bucket.take(now):
+            self.rate_limited += 1
+            return "rate_limited"
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample": self.sample,
+            "rate": self.rate,
+            "burst": self.burst,
+            "seen": self.seen,
+            "sampled": self.sampled,
+            "rate_limited": self.rate_limited,
+        }
+
+
+class SamplingFilter(logging.Filter):
+    """Samples and rate-limits chatty INFO/DEBUG events before they are queued.
 
+    ``config`` has the shape::
 
-def configure_logging(service_name: Optional[str] = None) -> None:
+        {"loggers": {"namo_nexus.triage": {"sample": 0.01, "rate": 5}},
+         "messages": {"Ethics calibrated": {"sample": 0.1, "rate": 20, "burst": 40}}}
+
+    Message rules match ``extra={"log_key": ...}`` or a prefix of the unformatted
+    message and take precedence over logger rules, which apply to the named logger
+    and its children. WARNING and above, and records logged with
+    ``extra={"crisis": True}``, always pass. When ``config_path`` is set the file is
+    re-read whenever its mtime changes, so every worker picks up edits without a
+    restart.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Mapping[str, Any]] = None,
+        config_path: Optional[str] = None,
+        on_suppress: Optional[Callable[[str], None]] = None,
+        reload_seconds: float = LOG_SAMPLING_RELOAD_SECONDS,
+    ) -> None:
+        super().__init__()
+        self.on_suppress = on_suppress
+        self.config_path = config_path
+        self.reload_seconds = reload_seconds
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._config: Dict[str, Any] = {}
+        self._loggers: Dict[str, _SamplingRule] = {}
+        self._messages: Dict[str, _SamplingRule] = {}
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        if config is not None:
+            self.configure(config)
+        if config_path:
+            self._reload_from_file(time.monotonic())
+
+    def configure(self, config: Mapping[str, Any]) -> None:
+        """Validate and atomically replace the active rules."""
+        loggers = {
+            name: _SamplingRule(f"logger:{name}", **dict(spec))
+            for name, spec in (config.get("loggers") or {}).items()
+        }
+        messages = {
+            key: _SamplingRule(f"message:{key}", **dict(spec))
+            for key, spec in (config.get("messages") or {}).items()
+        }
+        with self._lock:
+            self._config = {
+                "loggers": dict(config.get("loggers") or {}),
+                "messages": dict(config.get("messages") or {}),
+            }
+            self._loggers = loggers
+            self._messages = messages
+
+    def _reload_from_file(self, now: float) -> None:
+        self._checked_at = now
+        try:
+            mtime = os.stat(self.config_path).st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        try:
+            with open(self.config_path, "r", encoding="utf-8") as handle:
+                self.configure(json.load(handle))
+            self.last_error = None
+        except (OSError, TypeError, ValueError) as exc:
+            # Keep the previous rules; a typo in the file must not silence logging.
+            self.last_error = f"{type(exc).__name__}: {exc}"
+
+    def _match(self, record: logging.LogRecord) -> Optional[_SamplingRule]:
+        messages = self._messages
+        if messages:
+            key = getattr(record, "log_key", None)
+            if key is not None and key in messages:
+                return messages[key]
+            if isinstance(record.msg, str):
+                for prefix, rule in messages.items():
+                    if record.msg.startswith(prefix):
+                        return rule
+        loggers = self._loggers
+        name = record.name
+        while name:
+            rule = loggers.get(name)
+            if rule is not None:
+                return rule
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or getattr(record, "crisis", False):
+            return True
+        # A record that propagates to a second pipeline (src logger, then root) meets
+        # this shared filter again; reuse the first verdict so it is counted once.
+        verdict = getattr(record, "_sampling_verdict", None)
+        if verdict is None:
+            verdict = self._admit(record)
+            record._sampling_verdict = verdict
+        return verdict
+
+    def _admit(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        if self.config_path and now - self._checked_at >= self.reload_seconds:
+            self._reload_from_file(now)
+        if not self._loggers and not self._messages:
+            return True
+        rule = self._match(record)
+        if rule is None:
+            return True
+        with self._lock:
+            reason = rule.admit(now)
+        if reason is None:
+            return True
+        if self.on_suppress is not None:
+            self.on_suppress(reason)
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rules = [*self._messages.values(), *self._loggers.values()]
+            return {
+                "config": self._config,
+                "config_path": self.config_path,
+                "last_error": self.last_error,
+                "rules": {rule.name: rule.stats() for rule in rules},
+            }
+
+
+class LogPipeline:
+    """Bounded queue feeding the real handlers from a background listener."""
+
+    def __init__(
+        self,
+        handlers: List[logging.Handler],
+        queue_size: int = LOG_QUEUE_SIZE,
+        drop_policy: str = LOG_QUEUE_DROP_POLICY,
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+        self.handler = BoundedQueueHandler(self.queue, drop_policy, on_drop=on_drop)
+        self.handlers = handlers
+        self.listener = _DrainingQueueListener(
+            self.queue, *handlers, respect_handler_level=True
+        )
+        self._started = False
+
+    def start(self) -> "LogPipeline":
+        if not self._started:
+            self.listener.start()
+            self._started = True
+            atexit.register(self.stop)
+        return self
+
+    def stop(self) -> None:
+        if self._started:
+            self.listener.stop()
+            self._started = False
+            for handler in self.handlers:
+                handler.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "dropped": self.handler.dropped,
+        }
+
+
+def build_file_handler(
+    path: str,
+    rotation: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    backup_count: Optional[int] = None,
+    when: Optional[str] = None,
+) -> logging.Handler:
+    """Rotating file handler: ``size`` (LOG_FILE_MAX_BYTES) or ``time`` (LOG_ROTATE_WHEN)."""
+    rotation = rotation or LOG_ROTATION
+    backup_count = (
+        backup_count if backup_count is not None else int(os.getenv("LOG_FILE_BACKUP_COUNT", "7"))
+    )
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if rotation == "time":
+        return TimedRotatingFileHandler(
+            path,
+            when=when or os.getenv("LOG_ROTATE_WHEN", "midnight"),
+            backupCount=backup_count,
+            encoding="utf-8",
+            utc=True,
+        )
+    return RotatingFileHandler(
+        path,
+        maxBytes=(
+            max_bytes
+            if max_bytes is not None
+            else int(os.getenv("LOG_FILE_MAX_BYTES", str(50 * 1024 * 1024)))
+        ),
+        backupCount=backup_count,
+        encoding="utf-8",
+    )
+
+
+_pipeline: Optional[LogPipeline] = None
+_sampling_filter: Optional[SamplingFilter] = None
+
+
+def get_log_pipeline() -> Optional[LogPipeline]:
+    return _pipeline
+
+
+def get_sampling_filter(
+    on_suppress: Optional[Callable[[str], None]] = None,
+) -> SamplingFilter:
+    """Process-wide sampling filter shared by every log pipeline.
+
+    Initial rules come from ``LOG_SAMPLING`` (inline JSON) and/or the file named by
+    ``LOG_SAMPLING_FILE``; both are optional and default to passing everything.
+    """
+    global _sampling_filter
+    if _sampling_filter is None:
+        inline = os.getenv("LOG_SAMPLING")
+        _sampling_filter = SamplingFilter(
+            config=json.loads(inline) if inline else None,
+            config_path=os.getenv("LOG_SAMPLING_FILE") or None,
+        )
+    if on_suppress is not None:
+        _sampling_filter.on_suppress = on_suppress
+    return _sampling_filter
+
+
+def configure_logging(
+    service_name: Optional[str] = None,
+    on_drop: Optional[Callable[[], None]] = None,
+    on_suppress: Optional[Callable[[str], None]] = None,
+) -> None:
+    global _pipeline
     resolved_name = service_name or os.getenv("SERVICE_NAME", "namo-nexus-enterprise")
-    handler = logging.StreamHandler()
-    handler.setFormatter(JsonFormatter(resolved_name))
+    formatter = JsonFormatter(resolved_name)
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    log_file = os.getenv("LOG_FILE")
+    if log_file:
+        handlers.append(build_file_handler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    if _pipeline is not None:
+        _pipeline.stop()
+    _pipeline = LogPipeline(handlers, on_drop=on_drop).start()
+    _pipeline.handler.addFilter(get_sampling_filter(on_suppress))
     root_logger = logging.getLogger()
-    root_logger.handlers = [handler]
+    root_logger.handlers = [_pipeline.handler]
     root_logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
@@ -0,0 +1,104 @@
+"""Per-format decode latency: ``decode_audio`` against ``librosa.load``.
+
+Encodes the same speech-like clip as every type in ``ALLOWED_AUDIO_TYPES``.
+WebM and AAC need an ffmpeg binary to encode them and are skipped without one.
+
+Run with ``python -m tests.performance.bench_audio_decode [seconds]``.
+"""
+
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Optional
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+from audio_decoder import FFMPEG_BINARY, decode_audio
+from main import ALLOWED_AUDIO_TYPES
+from tests.test_voice_extractor import speech_like_signal
+
+SOURCE_RATE = 44100
+SNDFILE_ENCODINGS = {
+    "audio/wav": ("WAV", "PCM_16"),
+    "audio/flac": ("FLAC", "PCM_16"),
+    "audio/ogg": ("OGG", "VORBIS"),
+    "audio/mpeg": ("MP3", "MPEG_LAYER_III"),
+}
+FFMPEG_ENCODINGS = {
+    "audio/webm": ["-c:a", "libopus", "-f", "webm"],
+    "audio/aac": ["-c:a", "aac", "-f", "adts"],
+}
+
+
+def _encode(y: np.ndarray, content_type: str) -> Optional[bytes]:
+    if content_type in SNDFILE_ENCODINGS:
+        fmt, subtype = SNDFILE_ENCODINGS[content_type]
+        buffer = io.BytesIO()
+        sf.write(buffer, y, SOURCE_RATE, format=fmt, subtype=subtype)
+        return buffer.getvalue()
+    binary = shutil.which(FFMPEG_BINARY)
+    if binary is None:
+        return None
+    wav = io.BytesIO()
+    sf.write(wav, y, SOURCE_RATE, format="WAV")
+    return subprocess.run(
+        [
+            binary,
+            "-loglevel",
+            "error",
+            "-i",
+            "pipe:0",
+            *FFMPEG_ENCODINGS[content_type],
+            "pipe:1",
+        ],
+        input=wav.getvalue(),
+        capture_output=True,
+        check=True,
+    ).stdout
+
+
+def _best_of(func, repeats: int = 5) -> float:
+    func()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main(duration: float = 30.0) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        y = speech_like_signal(Path(tmp) / "speech.wav", SOURCE_RATE)
+    y = np.tile(y, max(1, int(duration / 5.0)))
+    print(f"source: {len(y) / SOURCE_RATE:.0f}s @ {SOURCE_RATE} Hz -> 16000 Hz mono")
+    print(f"{'type':<12}{'bytes':>10}{'decode_audio':>15}{'librosa.load':>15}")
+    for content_type in sorted(ALLOWED_AUDIO_TYPES):
+        data = _encode(y, content_type)
+        if data is None:
+            print(f"{content_type:<12}{'skipped (no ffmpeg to encode)':>40}")
+            continue
+        ours = _best_of(lambda: decode_audio(data, 16000, content_type))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            try:
+                load_ms = _best_of(
+                    lambda: librosa.load(io.BytesIO(data), sr=16000, mono=True)
+                )
+                theirs = f"{load_ms:12.1f} ms"
+            except Exception as exc:  # noqa: BLE001 - report and carry on
+                theirs = f"failed ({type(exc).__name__})"
+        print(f"{content_type:<12}{len(data):>10}{ours:12.1f} ms{theirs:>15}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 30.0)
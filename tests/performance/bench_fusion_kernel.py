@@ -0,0 +1,81 @@
+"""Scalar multimodal fusion against the vectorized fusion kernel.
+
+Times, for N random messages with voice and facial features:
+
+- ``scalar``: ``MultiModalTriageEngine.multimodal_fusion`` per message;
+- ``batch``: ``multimodal_fusion_batch`` (text analysis per message, the rest
+  vectorized, plus building the MultiModalAnalysis objects);
+- ``kernel``: ``fusion_kernel.fuse`` alone on pre-packed arrays, the cost for
+  offline evaluation that keeps results as arrays.
+
+Run with::
+
+    python -m tests.performance.bench_fusion_kernel [--sizes 1000 10000 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from core_engine import MultiModalTriageEngine
+from fusion_kernel import FACIAL_FEATURES, VOICE_FEATURES, fuse, pack_features
+
+
+def _cases(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    voice = rng.uniform(0.0, 2.5, size=(n, len(VOICE_FEATURES)))
+    facial = rng.uniform(0.0, 1.0, size=(n, len(FACIAL_FEATURES)))
+    return [
+        (
+            "I am feeling anxious about my job",
+            dict(zip([name for name, _ in VOICE_FEATURES], voice[i].tolist())),
+            dict(zip([name for name, _ in FACIAL_FEATURES], facial[i].tolist())),
+        )
+        for i in range(n)
+    ]
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    # Per-message INFO logs would dominate the scalar timing.
+    logging.disable(logging.INFO)
+
+    engine = MultiModalTriageEngine()
+    print(
+        f"{'N':>8}{'scalar ms':>12}{'batch ms':>12}{'kernel ms':>12}{'scalar/kernel':>15}"
+    )
+    for n in args.sizes:
+        cases = _cases(n)
+        voice = pack_features([v for _, v, _ in cases], VOICE_FEATURES)
+        facial = pack_features([f for _, _, f in cases], FACIAL_FEATURES)
+        text = np.full(n, 0.4), np.full(n, 0.7)
+
+        async def scalar():
+            for case in cases:
+                await engine.multimodal_fusion(*case)
+
+        scalar_ms = _timed(lambda: asyncio.run(scalar()))
+        batch_ms = _timed(lambda: asyncio.run(engine.multimodal_fusion_batch(cases)))
+        kernel_ms = _timed(lambda: fuse(*text, *voice, *facial))
+        engine.dhammic_lake.cache.clear()
+        print(
+            f"{n:>8}{scalar_ms:12.1f}{batch_ms:12.1f}{kernel_ms:12.2f}"
+            f"{scalar_ms / kernel_ms:14.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Real-time factor and error rates of each transcription backend on a case set.
+
+The case set is a directory of audio files, each with a reference transcript
+next to it (``case_a_01_v01.mp3`` + ``case_a_01_v01.txt``), e.g. the ``audio/``
+and ``transcripts/`` output of ``scripts/audio_batch_process.py`` after review.
+RTF is inference time over audio duration (below 1 is faster than real time).
+WER is computed on whitespace tokens; Thai is written without spaces between
+words, so CER is reported as well.
+
+Run with::
+
+    python -m tests.performance.bench_transcription --cases DIR \\
+        [--references DIR] [--model base] [--backends openai-whisper faster-whisper]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from audio_decoder import decode_audio
+from transcription_backends import BACKENDS, backend_available, load_backend
+
+SAMPLE_RATE = 16000
+AUDIO_SUFFIXES = {".wav", ".mp3", ".flac", ".ogg", ".webm", ".aac", ".m4a"}
+
+
+def edit_distance(reference: Sequence[str], hypothesis: Sequence[str]) -> int:
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref in enumerate(reference, start=1):
+        current = [i] + [0] * len(hypothesis)
+        for j, hyp in enumerate(hypothesis, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref != hyp),
+            )
+        previous = current
+    return previous[-1]
+
+
+def error_rates(reference: str, hypothesis: str) -> Tuple[float, float]:
+    words, chars = reference.split(), list("".join(reference.split()))
+    wer = edit_distance(words, hypothesis.split()) / max(1, len(words))
+    cer = edit_distance(chars, list("".join(hypothesis.split()))) / max(1, len(chars))
+    return wer, cer
+
+
+def load_cases(cases_dir: Path, references_dir: Path) -> List[Tuple[Path, str]]:
+    cases = []
+    for path in sorted(cases_dir.rglob("*")):
+        if path.suffix.lower() not in AUDIO_SUFFIXES:
+            continue
+        reference = references_dir / f"{path.stem}.txt"
+        if not reference.exists():
+            reference = path.with_suffix(".txt")
+        if reference.exists():
+            cases.append((path, reference.read_text(encoding="utf-8").strip()))
+    return cases
+
+
+def bench_backend(
+    backend: str, model: str, cases: List[Tuple[Path, str]]
+) -> Dict[str, float]:
+    started = time.perf_counter()
+    engine = load_backend(model, backend)
+    load_seconds = time.perf_counter() - started
+    audio_seconds = inference_seconds = wer_total = cer_total = 0.0
+    for path, reference in cases:
+        audio = decode_audio(path.read_bytes(), SAMPLE_RATE)
+        started = time.perf_counter()
+        text = engine.transcribe(audio).text
+        inference_seconds += time.perf_counter() - started
+        audio_seconds += len(audio) / SAMPLE_RATE
+        wer, cer = error_rates(reference, text)
+        wer_total += wer
+        cer_total += cer
+    return {
+        "load_s": load_seconds,
+        "rtf": inference_seconds / max(audio_seconds, 1e-9),
+        "wer": wer_total / len(cases),
+        "cer": cer_total / len(cases),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", required=True, type=Path)
+    parser.add_argument("--references", type=Path, default=None)
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--backends", nargs="+", default=sorted(BACKENDS))
+    args = parser.parse_args()
+
+    cases = load_cases(args.cases, args.references or args.cases)
+    if not cases:
+        raise SystemExit(
+            f"No audio files with reference transcripts under {args.cases}"
+        )
+    print(f"{len(cases)} cases, model={args.model}")
+    print(f"{'backend':<16}{'load s':>8}{'RTF':>8}{'WER':>8}{'CER':>8}")
+    for backend in args.backends:
+        if not backend_available(backend):
+            print(f"{backend:<16}{'not installed':>32}")
+            continue
+        row = bench_backend(backend, args.model, cases)
+        print(
+            f"{backend:<16}{row['load_s']:8.1f}{row['rtf']:8.3f}{row['wer']:8.3f}{row['cer']:8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
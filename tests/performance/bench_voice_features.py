@@ -0,0 +1,125 @@
+"""Benchmark voice feature extraction paths.
+
+Compares the multi-pass original with the single-STFT extractor, the piptrack
+and YIN pitch trackers, and the looped and vectorized tremor index. Stability is
+the spread of each feature across noise realisations of the same signal. A
+longer recording is then analyzed in one pass and in AUDIO_WINDOW_SECONDS
+windows (AUDIO_WINDOW_WORKERS threads), reporting wall time and peak traced
+memory.
+
+Run with ``python -m tests.performance.bench_voice_features [seconds] [long seconds]``.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from tests.test_voice_extractor import (
+    loop_tremor,
+    multi_pass_features,
+    speech_like_signal,
+)
+from voice_extractor import (
+    AUDIO_WINDOW_SECONDS,
+    AUDIO_WINDOW_WORKERS,
+    VoiceExtractor,
+    _frame_rms,
+    _pitch_candidates,
+)
+
+STABILITY_SEEDS = 8
+
+
+def _best_of(func, repeats: int = 5) -> float:
+    func()
+    timings = []
+    for _ in range(repeats):
+        start = time.process_time()
+        func()
+        timings.append(time.process_time() - start)
+    return min(timings) * 1000
+
+
+def _wall_and_peak(func) -> tuple:
+    func()
+    start = time.perf_counter()
+    func()
+    wall_ms = (time.perf_counter() - start) * 1000
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return wall_ms, peak / 2**20
+
+
+def _stability(extractor: VoiceExtractor, y: np.ndarray, sr: int) -> dict:
+    results = []
+    for seed in range(STABILITY_SEEDS):
+        noise = 0.01 * np.random.default_rng(seed).standard_normal(len(y))
+        results.append(extractor._analyze_audio((y + noise).astype(np.float32), sr))
+    return {
+        name: float(np.std([getattr(result, name) for result in results]))
+        for name in ("pitch_mean_hz", "pitch_variance", "tremor_index")
+    }
+
+
+def main(duration: float = 30.0, long_duration: float = 300.0) -> None:
+    sr = 16000
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = speech_like_signal(Path(tmp) / "speech.wav", sr)
+    y = np.tile(clip, max(1, int(duration / 5.0)))
+    print(f"audio: {len(y) / sr:.0f}s @ {sr} Hz")
+
+    single = VoiceExtractor(enable_transcription=False, pitch_tracker="piptrack")
+    yin = VoiceExtractor(enable_transcription=False, pitch_tracker="yin")
+    multi_pass_ms = _best_of(lambda: multi_pass_features(y, sr))
+    single_ms = _best_of(lambda: single._analyze_audio(y, sr))
+    yin_ms = _best_of(lambda: yin._analyze_audio(y, sr))
+    print(f"multi-pass features      : {multi_pass_ms:8.1f} ms CPU")
+    print(f"single-STFT (piptrack)   : {single_ms:8.1f} ms CPU")
+    print(f"single-STFT (yin)        : {yin_ms:8.1f} ms CPU")
+
+    import librosa
+
+    candidates = _pitch_candidates(np.abs(librosa.stft(y)), sr)
+    loop_ms = _best_of(lambda: loop_tremor(candidates))
+    vector_ms = _best_of(lambda: single._detect_tremor(candidates))
+    print(
+        f"tremor over {len(candidates)} candidates: "
+        f"loop {loop_ms:.2f} ms, vectorized {vector_ms:.2f} ms"
+    )
+
+    for name, extractor in (("piptrack", single), ("yin", yin)):
+        spread = _stability(extractor, y, sr)
+        print(
+            f"stability {name:<8} std over {STABILITY_SEEDS} seeds: "
+            + ", ".join(f"{key}={value:.4f}" for key, value in spread.items())
+        )
+
+    long_y = np.tile(clip, max(1, int(long_duration / 5.0)))
+    long_rms = _frame_rms(long_y)  # computed once by analyze_bytes for VAD as well
+    print(
+        f"long audio: {len(long_y) / sr:.0f}s, windows of {AUDIO_WINDOW_SECONDS:.0f}s "
+        f"on {AUDIO_WINDOW_WORKERS} threads"
+    )
+    for name, extractor in (
+        (
+            "one pass",
+            VoiceExtractor(enable_transcription=False, window_seconds=len(long_y) / sr),
+        ),
+        ("windowed", VoiceExtractor(enable_transcription=False)),
+    ):
+        wall_ms, peak_mb = _wall_and_peak(
+            lambda: extractor._analyze_audio(long_y, sr, long_rms)
+        )
+        print(f"{name:<9}: {wall_ms:8.1f} ms wall, peak {peak_mb:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:3]))
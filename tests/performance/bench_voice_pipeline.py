@@ -0,0 +1,320 @@
+"""Voice pipeline benchmark with a stored baseline and regression thresholds.
+
+Times each stage of the pipeline separately on deterministic synthetic speech
+(``tests.generate_dummy_audio.synthetic_speech``) at several durations and
+encodings, and optionally on a local corpus of recordings: decode, frame RMS,
+STFT, piptrack and YIN pitch, onsets, tremor, the full ``_analyze_audio``, and
+transcription when ``--transcribe`` is given and a backend is installed.
+
+For every stage it reports the best-of-N wall time, the real-time factor (wall
+time over audio duration; below 1 is faster than real time) and the peak
+memory traced by ``tracemalloc`` (NumPy and Python allocations, not native
+model memory). Results are compared against a baseline JSON; a stage regresses
+when it is more than ``--threshold`` slower (or ``--memory-threshold`` larger)
+than the baseline and the absolute difference is above the noise floor. The
+exit status is 1 on any regression, so the run can gate an upgrade of librosa
+or NumPy. Baselines are only comparable on the same kind of host; the stored
+host details are printed when they differ.
+
+Run with::
+
+    python -m tests.performance.bench_voice_pipeline [--durations 5 30 120]
+        [--formats wav flac ogg mp3] [--corpus DIR] [--transcribe]
+        [--baseline PATH] [--update-baseline] [--threshold 0.25] [--min-delta-ms 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+from audio_decoder import decode_audio
+from tests.generate_dummy_audio import synthetic_speech
+from transcription_backends import WHISPER_BACKEND, backend_available, load_backend
+from voice_extractor import (
+    HOP_LENGTH,
+    N_FFT,
+    VoiceExtractor,
+    _frame_rms,
+    _mel_basis,
+    _pitch_candidates,
+    _yin_pitch,
+)
+
+SAMPLE_RATE = 16000
+SOURCE_RATE = 44100
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "voice_pipeline.json"
+# name -> (content type, libsndfile format, subtype)
+FORMATS = {
+    "wav": ("audio/wav", "WAV", "PCM_16"),
+    "flac": ("audio/flac", "FLAC", "PCM_16"),
+    "ogg": ("audio/ogg", "OGG", "VORBIS"),
+    "mp3": ("audio/mpeg", "MP3", "MPEG_LAYER_III"),
+}
+CORPUS_TYPES = {
+    ".wav": "audio/wav",
+    ".flac": "audio/flac",
+    ".ogg": "audio/ogg",
+    ".mp3": "audio/mpeg",
+    ".webm": "audio/webm",
+    ".aac": "audio/aac",
+}
+# Differences below these are noise whatever the percentage.
+MIN_REGRESSION_MS = 5.0
+MIN_REGRESSION_MIB = 1.0
+
+Case = Tuple[str, bytes, Optional[str]]
+
+
+def _best_of(func: Callable[[], Any], repeats: int) -> float:
+    func()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def _peak_mib(func: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def synthetic_cases(durations: List[float], formats: List[str]) -> Iterator[Case]:
+    for duration in durations:
+        y = synthetic_speech(duration, SOURCE_RATE, seed=int(duration))
+        for name in formats:
+            content_type, fmt, subtype = FORMATS[name]
+            buffer = io.BytesIO()
+            sf.write(buffer, y, SOURCE_RATE, format=fmt, subtype=subtype)
+            yield f"synthetic/{duration:g}s.{name}", buffer.getvalue(), content_type
+
+
+def corpus_cases(corpus: Path) -> Iterator[Case]:
+    for path in sorted(corpus.rglob("*")):
+        content_type = CORPUS_TYPES.get(path.suffix.lower())
+        if content_type is not None:
+            yield f"corpus/{path.relative_to(corpus).as_posix()}", path.read_bytes(), content_type
+
+
+def bench_case(
+    data: bytes,
+    content_type: Optional[str],
+    repeats: int,
+    transcriber: Any = None,
+) -> Dict[str, Dict[str, float]]:
+    y = decode_audio(data, SAMPLE_RATE, content_type)
+    seconds = len(y) / SAMPLE_RATE
+    rms = _frame_rms(y)
+    S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+    candidates = _pitch_candidates(S, SAMPLE_RATE)
+    extractor = VoiceExtractor(enable_transcription=False)
+
+    def _onsets() -> np.ndarray:
+        mel_db = librosa.power_to_db(_mel_basis(SAMPLE_RATE) @ (S**2))
+        envelope = librosa.onset.onset_strength(
+            S=mel_db, sr=SAMPLE_RATE, hop_length=HOP_LENGTH
+        )
+        return librosa.onset.onset_detect(
+            onset_envelope=envelope, sr=SAMPLE_RATE, hop_length=HOP_LENGTH
+        )
+
+    stages: Dict[str, Callable[[], Any]] = {
+        "decode": lambda: decode_audio(data, SAMPLE_RATE, content_type),
+        "rms": lambda: _frame_rms(y),
+        "stft": lambda: np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH)),
+        "pitch_piptrack": lambda: _pitch_candidates(S, SAMPLE_RATE),
+        "pitch_yin": lambda: _yin_pitch(y, SAMPLE_RATE, rms),
+        "onsets": _onsets,
+        "tremor": lambda: extractor._detect_tremor(candidates),
+        "analyze": lambda: extractor._analyze_audio(y, SAMPLE_RATE, rms),
+    }
+    results = {}
+    for stage, func in stages.items():
+        ms = _best_of(func, repeats)
+        results[stage] = {
+            "ms": round(ms, 3),
+            "rtf": round(ms / 1000 / seconds, 6),
+            "peak_mib": round(_peak_mib(func), 3),
+        }
+    if transcriber is not None:
+        # Model inference is slow and steady; one run after a warm-up is enough.
+        ms = _best_of(lambda: transcriber.transcribe(y), 1)
+        results["transcribe"] = {
+            "ms": round(ms, 3),
+            "rtf": round(ms / 1000 / seconds, 6),
+        }
+    return results
+
+
+def host_info() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "librosa": librosa.__version__,
+        "soundfile": sf.__version__,
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Dict[str, float]]],
+    baseline: Dict[str, Dict[str, Dict[str, float]]],
+    threshold: float,
+    memory_threshold: float,
+    min_delta_ms: float = MIN_REGRESSION_MS,
+) -> List[str]:
+    """Print each stage against the baseline; returns the regressed stages."""
+    regressions = []
+    print(
+        f"{'case':<26}{'stage':<16}{'ms':>10}{'base':>10}{'delta':>8}{'RTF':>9}{'MiB':>8}"
+    )
+    for case, stages in results.items():
+        for stage, current in stages.items():
+            base = baseline.get(case, {}).get(stage)
+            delta, flag = "", ""
+            if base is not None:
+                change = current["ms"] / base["ms"] - 1 if base["ms"] else 0.0
+                delta = f"{change:+.0%}"
+                slower = (
+                    change > threshold and current["ms"] - base["ms"] > min_delta_ms
+                )
+                peak, base_peak = current.get("peak_mib"), base.get("peak_mib")
+                larger = (
+                    peak is not None
+                    and base_peak is not None
+                    and peak > base_peak * (1 + memory_threshold)
+                    and peak - base_peak > MIN_REGRESSION_MIB
+                )
+                if slower or larger:
+                    flag = "  REGRESSION" + (
+                        " (memory)" if larger and not slower else ""
+                    )
+                    regressions.append(f"{case}/{stage}")
+            base_ms = f"{base['ms']:.1f}" if base is not None else "-"
+            peak = current.get("peak_mib")
+            print(
+                f"{case:<26}{stage:<16}{current['ms']:10.1f}{base_ms:>10}{delta:>8}"
+                f"{current['rtf']:9.4f}{(f'{peak:.1f}' if peak is not None else '-'):>8}{flag}"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--durations", nargs="+", type=float, default=[5.0, 30.0, 120.0]
+    )
+    parser.add_argument(
+        "--formats", nargs="+", choices=sorted(FORMATS), default=["wav", "mp3"]
+    )
+    parser.add_argument(
+        "--corpus", type=Path, default=None, help="Directory of recordings"
+    )
+    parser.add_argument(
+        "--transcribe", action="store_true", help=f"Also time {WHISPER_BACKEND}"
+    )
+    parser.add_argument("--model", default=os.getenv("WHISPER_MODEL", "base"))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Allowed slowdown"
+    )
+    parser.add_argument(
+        "--memory-threshold", type=float, default=0.25, help="Allowed growth"
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=MIN_REGRESSION_MS,
+        help="Ignore smaller slowdowns",
+    )
+    args = parser.parse_args()
+
+    transcriber = None
+    if args.transcribe:
+        if not backend_available(WHISPER_BACKEND):
+            print(
+                f"{WHISPER_BACKEND} is not installed; skipping transcription",
+                file=sys.stderr,
+            )
+        else:
+            transcriber = load_backend(args.model, WHISPER_BACKEND)
+
+    cases: List[Case] = list(synthetic_cases(args.durations, args.formats))
+    if args.corpus is not None:
+        cases.extend(corpus_cases(args.corpus))
+    results = {
+        name: bench_case(data, content_type, args.repeats, transcriber)
+        for name, data, content_type in cases
+    }
+
+    baseline: Dict[str, Any] = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("host") != host_info():
+            print(f"baseline host differs: {baseline.get('host')}", file=sys.stderr)
+    regressions = compare(
+        results,
+        baseline.get("results", {}),
+        args.threshold,
+        args.memory_threshold,
+        args.min_delta_ms,
+    )
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        # Corpus recordings are local, so only synthetic cases are stored.
+        stored = {
+            name: stages
+            for name, stages in results.items()
+            if name.startswith("synthetic/")
+        }
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "created": datetime.now(timezone.utc).isoformat(),
+                    "host": host_info(),
+                    "results": stored,
+                },
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if regressions:
+        print(
+            f"{len(regressions)} regression(s): {', '.join(regressions)}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -114,6 +114,29 @@ class TestAudioTriageEndpoint:
         
         assert response.status_code == 422
     
+    def test_audio_triage_unrecognized_content(self):
+        """Test that a declared audio type with non-audio content is rejected before decoding."""
+        response = client.post(
+            "/triage/audio",
+            files={"audio": ("test.wav", b"<html>" + b"x" * 2000, "audio/wav")},
+            data={"user_id": "test"},
+            headers=AUTH_HEADERS,
+        )
+        
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Unrecognized audio content"
+    
+    def test_audio_triage_oversized_file(self):
+        """Test that uploads over the size cap are refused with 413."""
+        response = client.post(
+            "/triage/audio",
+            files={"audio": ("test.wav", b"RIFF" + b"\x00" * (6 * 1024 * 1024), "audio/wav")},
+            data={"user_id": "test"},
+            headers=AUTH_HEADERS,
+        )
+        
+        assert response.status_code == 413
+    
     def test_audio_triage_mp3_format(self):
         """Test audio triage accepts MP3 content type."""
         audio_bytes = create_test_wav()  # Still WAV data but testing content-type handling
@@ -194,3 +217,42 @@ class TestAudioTriageFormValidation:
         payload = response.json()
         assert "session_id" in payload
         assert payload["session_id"].startswith("session_")
+
+
+class TestAudioTriageJobs:
+    """Test cases for the asynchronous /triage/audio/jobs endpoints."""
+    
+    def test_job_is_accepted_and_pollable(self):
+        """The upload is answered with 202 and a job id before triage runs."""
+        with TestClient(app) as lifespan_client:
+            response = lifespan_client.post(
+                "/triage/audio/jobs",
+                files={"audio": ("test.wav", create_test_wav(), "audio/wav")},
+                data={"user_id": "audio_job_001"},
+                headers=AUTH_HEADERS,
+            )
+            
+            assert response.status_code == 202
+            payload = response.json()
+            assert response.headers["Location"] == payload["status_url"]
+            
+            status = lifespan_client.get(payload["status_url"], headers=AUTH_HEADERS)
+            assert status.status_code == 200
+            assert status.json()["job_id"] == payload["job_id"]
+            assert status.json()["status"] in {"queued", "running", "succeeded", "failed"}
+    
+    def test_job_rejects_remote_callback(self):
+        """Callbacks are only delivered to local hosts."""
+        response = client.post(
+            "/triage/audio/jobs",
+            files={"audio": ("test.wav", create_test_wav(), "audio/wav")},
+            data={"user_id": "audio_job_002", "callback_url": "http://example.com/hook"},
+            headers=AUTH_HEADERS,
+        )
+        
+        assert response.status_code == 422
+    
+    def test_unknown_job_is_404(self):
+        response = client.get("/triage/audio/jobs/does-not-exist", headers=AUTH_HEADERS)
+        
+        assert response.status_code == 404
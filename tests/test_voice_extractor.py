@@ -9,6 +9,7 @@ import numpy as np
 import pytest
 import soundfile as sf
 
+from transcription_backends import Transcription
 from voice_extractor import VoiceExtractor, VoiceAnalysisResult, calculate_voice_stress_score
 
 
@@ -122,6 +123,7 @@ class TestVoiceExtractor:
             "pitch_variance", "energy", "speech_rate",
             "pause_ratio", "tremor_index", "pitch_mean_hz",
             "duration_seconds", "transcription", "transcription_language",
+            "timeline",
         }
         assert set(full_dict.keys()) == expected_keys
 
@@ -195,3 +197,337 @@ class TestVoiceStressScore:
         score = calculate_voice_stress_score(extreme)
         
         assert 0 <= score <= 1
+
+
+def multi_pass_features(y: np.ndarray, sr: int) -> dict:
+    """Reference: the original piptrack / rms / onset_detect passes, one STFT each."""
+    import librosa
+
+    pitches, _ = librosa.piptrack(y=y, sr=sr)
+    rms = librosa.feature.rms(y=y)[0]
+    onsets = librosa.onset.onset_detect(y=y, sr=sr)
+    return {"pitch_values": pitches[pitches > 0], "rms": rms, "onsets": onsets}
+
+
+def speech_like_signal(path, sample_rate: int = 16000) -> np.ndarray:
+    """Dummy sine from generate_dummy_audio, amplitude-modulated with light noise."""
+    import contextlib
+
+    import librosa
+
+    from tests.generate_dummy_audio import create_sine_wave
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_sine_wave(str(path), duration=5.0)
+    y, _ = librosa.load(str(path), sr=sample_rate, mono=True)
+    t = np.arange(len(y)) / sample_rate
+    rng = np.random.default_rng(0)
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    return (0.3 * y * envelope + 0.01 * rng.standard_normal(len(y))).astype(np.float32)
+
+
+class TestSingleStftExtraction:
+    """The single-STFT path must match the original multi-pass extraction."""
+
+    def test_pitch_and_onsets_match_multi_pass(self, tmp_path):
+        import librosa
+
+        from voice_extractor import N_FFT, HOP_LENGTH, _mel_basis, _pitch_candidates
+
+        sr = 16000
+        y = speech_like_signal(tmp_path / "speech.wav", sr)
+        reference = multi_pass_features(y, sr)
+
+        S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+        pitch_values = _pitch_candidates(S, sr)
+        envelope = librosa.onset.onset_strength(
+            S=librosa.power_to_db(_mel_basis(sr) @ (S ** 2)), sr=sr
+        )
+        onsets = librosa.onset.onset_detect(onset_envelope=envelope, sr=sr)
+
+        np.testing.assert_allclose(pitch_values, reference["pitch_values"], rtol=1e-6)
+        np.testing.assert_array_equal(onsets, reference["onsets"])
+
+    def test_features_match_multi_pass(self, tmp_path):
+        sr = 16000
+        y = speech_like_signal(tmp_path / "speech.wav", sr)
+        reference = multi_pass_features(y, sr)
+
+        result = VoiceExtractor(enable_transcription=False)._analyze_audio(y, sr)
+
+        pitch_values = reference["pitch_values"]
+        assert result.pitch_mean_hz == pytest.approx(float(np.mean(pitch_values)), rel=1e-6)
+        assert result.pitch_variance == pytest.approx(
+            min(float(np.std(pitch_values)) / 200.0, 1.0), rel=1e-6
+        )
+        assert result.energy == pytest.approx(min(float(np.mean(reference["rms"])) * 10, 1.0))
+        assert result.speech_rate == pytest.approx(
+            min(len(reference["onsets"]) / result.duration_seconds / 6.0, 1.0)
+        )
+
+
+def loop_tremor(pitch_values: np.ndarray) -> float:
+    """Reference: the original per-window Python loop in _detect_tremor."""
+    if len(pitch_values) < 20:
+        return 0.0
+    window_size = min(10, len(pitch_values) // 5)
+    if window_size < 3:
+        return 0.0
+    local_vars = []
+    for i in range(0, len(pitch_values) - window_size, window_size // 2):
+        window = pitch_values[i:i + window_size]
+        if len(window) > 1:
+            local_vars.append(np.std(window))
+    if not local_vars:
+        return 0.0
+    return min(float(np.mean(local_vars)) / 50.0, 1.0)
+
+
+class TestPitchTrackers:
+    """YIN pitch tracking and the vectorized tremor index."""
+
+    @pytest.mark.parametrize("length", [0, 19, 20, 33, 49, 50, 1000, 4097])
+    def test_vectorized_tremor_matches_loop(self, length):
+        rng = np.random.default_rng(length)
+        pitch_values = (200 + 30 * rng.standard_normal(length)).astype(np.float32)
+
+        extractor = VoiceExtractor(enable_transcription=False)
+
+        assert extractor._detect_tremor(pitch_values) == pytest.approx(
+            loop_tremor(pitch_values), rel=1e-6
+        )
+
+    def test_yin_tracks_fundamental(self):
+        sr = 16000
+        t = np.arange(3 * sr) / sr
+        y = (0.2 * np.sin(2 * np.pi * 200 * t) + 0.05 * np.sin(2 * np.pi * 400 * t)).astype(np.float32)
+
+        result = VoiceExtractor(enable_transcription=False, pitch_tracker="yin")._analyze_audio(y, sr)
+
+        assert result.pitch_mean_hz == pytest.approx(200.0, rel=0.01)
+        assert result.pitch_variance < 0.01
+        assert result.tremor_index < 0.05
+
+    def test_yin_marks_silence_unvoiced(self):
+        from voice_extractor import _yin_pitch
+
+        import librosa
+
+        sr = 16000
+        t = np.arange(2 * sr) / sr
+        y = (0.2 * np.sin(2 * np.pi * 150 * t)).astype(np.float32)
+        y[sr // 2 : 3 * sr // 2] = 0.0
+        rms = librosa.feature.rms(y=y, frame_length=2048, hop_length=512)[0]
+
+        f0, voiced = _yin_pitch(y, sr, rms)
+
+        assert len(f0) == len(voiced) == len(rms)
+        middle = len(voiced) // 2
+        assert not voiced[middle - 5 : middle + 5].any()
+        assert voiced[:5].all()
+        assert f0[voiced] == pytest.approx(150.0, rel=0.02)
+
+    def test_unknown_pitch_tracker_rejected(self):
+        with pytest.raises(ValueError):
+            VoiceExtractor(enable_transcription=False, pitch_tracker="crepe")
+
+
+def bursts_with_silence(sample_rate: int = 16000) -> np.ndarray:
+    """1s silence, 1s tone, 2s silence, 1s tone, 1s silence."""
+    t = np.arange(sample_rate) / sample_rate
+    tone = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    silence = np.zeros(sample_rate, dtype=np.float32)
+    return np.concatenate([silence, tone, silence, silence, tone, silence])
+
+
+class _RecordingWhisper:
+    def __init__(self):
+        self.lengths = []
+
+    def transcribe(self, audio, language=None):
+        self.lengths.append(len(audio))
+        return Transcription("heard", language or "th")
+
+
+class TestVoiceActivityTrimming:
+    """Whisper gets only voiced regions; features keep the recording's timing."""
+
+    def test_segments_cover_voiced_runs_with_padding(self):
+        from voice_extractor import HOP_LENGTH, N_FFT, VAD_PADDING_SECONDS, _frame_rms, voiced_segments
+
+        sr = 16000
+        y = bursts_with_silence(sr)
+
+        segments = voiced_segments(_frame_rms(y), sr, len(y))
+
+        assert segments.shape == (2, 2)
+        pad = int(VAD_PADDING_SECONDS * sr)
+        # Centred frames see a tone up to half a window before it starts.
+        slack = N_FFT // 2 + HOP_LENGTH
+        for (start, end), (tone_start, tone_end) in zip(segments, [(sr, 2 * sr), (4 * sr, 5 * sr)]):
+            assert abs(start - (tone_start - pad)) <= slack
+            assert abs(end - (tone_end + pad)) <= slack
+
+    def test_close_segments_are_merged(self):
+        from voice_extractor import _frame_rms, voiced_segments
+
+        sr = 16000
+        y = bursts_with_silence(sr)
+
+        segments = voiced_segments(_frame_rms(y), sr, len(y), min_gap=3.0)
+
+        assert len(segments) == 1
+
+    def test_transcription_sees_speech_but_features_keep_full_timing(self):
+        sr = 16000
+        y = bursts_with_silence(sr)
+        buffer = io.BytesIO()
+        sf.write(buffer, y, sr, format="WAV", subtype="FLOAT")
+        extractor = VoiceExtractor(enable_transcription=False)
+        extractor.enable_transcription = True
+        extractor._whisper_model = whisper = _RecordingWhisper()
+
+        result = extractor.extract_from_bytes(buffer.getvalue())
+        untrimmed = VoiceExtractor(enable_transcription=False)._analyze_audio(y, sr)
+
+        assert result.transcription == "heard"
+        assert whisper.lengths[0] < 0.6 * len(y)
+        assert result.duration_seconds == pytest.approx(6.0)
+        assert result.pause_ratio == untrimmed.pause_ratio
+        assert result.speech_rate == untrimmed.speech_rate
+
+    def test_silent_recording_skips_whisper(self):
+        extractor = VoiceExtractor(enable_transcription=False)
+        extractor.enable_transcription = True
+        extractor._whisper_model = whisper = _RecordingWhisper()
+
+        result = extractor.extract_from_bytes(generate_silent_audio(duration=2.0))
+
+        assert result.transcription == ""
+        assert whisper.lengths == []
+
+
+class _PieceWhisper:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, language=None):
+        self.calls.append((len(audio), language))
+        return Transcription(f"piece{len(self.calls)}", language or "th", 0.9, -0.2)
+
+
+class TestWindowedAnalysis:
+    """Long recordings are analyzed in overlapping windows and transcribed in pieces."""
+
+    def long_signal(self, tmp_path, sr=16000, repeats=8):
+        return np.tile(speech_like_signal(tmp_path / "speech.wav", sr), repeats)
+
+    def test_window_cores_tile_the_frame_grid(self):
+        from voice_extractor import HOP_LENGTH, N_FFT, analysis_windows
+
+        sr = 16000
+        n = 95 * sr + 123
+        windows = analysis_windows(n, sr, window_seconds=30, overlap_seconds=1.0)
+
+        assert windows[0, 2] == 0
+        assert windows[-1, 3] == 1 + n // HOP_LENGTH
+        np.testing.assert_array_equal(windows[1:, 2], windows[:-1, 3])
+        assert (windows[:, 0] % HOP_LENGTH == 0).all()
+        # Frames at the inner core edges see their full N_FFT samples.
+        assert (windows[1:, 2] * HOP_LENGTH - windows[1:, 0] >= N_FFT // 2).all()
+        assert (windows[:-1, 1] - windows[:-1, 3] * HOP_LENGTH >= N_FFT // 2).all()
+        assert len(windows) == 3  # the 5 s tail is folded into the last window
+        assert len(analysis_windows(20 * sr, sr, window_seconds=30)) == 1
+
+    @pytest.mark.parametrize("tracker", ["piptrack", "yin"])
+    def test_windowed_features_match_single_pass(self, tmp_path, tracker):
+        sr = 16000
+        y = self.long_signal(tmp_path, sr)
+
+        single = VoiceExtractor(
+            enable_transcription=False, pitch_tracker=tracker, window_seconds=3600
+        )._analyze_audio(y, sr)
+        windowed = VoiceExtractor(
+            enable_transcription=False, pitch_tracker=tracker, window_seconds=10
+        )._analyze_audio(y, sr)
+
+        assert len(single.timeline) == 1
+        assert len(windowed.timeline) == 4
+        assert windowed.energy == single.energy
+        assert windowed.pause_ratio == single.pause_ratio
+        assert windowed.pitch_mean_hz == pytest.approx(single.pitch_mean_hz, rel=1e-6)
+        assert windowed.pitch_variance == pytest.approx(single.pitch_variance, rel=1e-6)
+        assert windowed.tremor_index == pytest.approx(single.tremor_index, rel=1e-6)
+        assert windowed.speech_rate == single.speech_rate
+
+    def test_timeline_covers_the_recording(self, tmp_path):
+        sr = 16000
+        y = self.long_signal(tmp_path, sr)
+
+        result = VoiceExtractor(enable_transcription=False, window_seconds=10)._analyze_audio(y, sr)
+
+        assert result.timeline[0]["start_seconds"] == 0.0
+        assert result.timeline[-1]["end_seconds"] == pytest.approx(result.duration_seconds)
+        for before, after in zip(result.timeline, result.timeline[1:]):
+            assert before["end_seconds"] == after["start_seconds"]
+        assert all(0.0 <= window["energy"] <= 1.0 for window in result.timeline)
+        assert all(0.0 <= window["tremor_index"] <= 1.0 for window in result.timeline)
+
+    def test_transcription_pieces_cut_at_quiet_points(self):
+        from voice_extractor import split_for_transcription
+
+        sr = 16000
+        t = np.arange(10 * sr) / sr
+        y = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+        y[int(8.5 * sr) : int(8.6 * sr)] = 0.0
+
+        pieces = split_for_transcription(y, sr, max_seconds=9)
+
+        assert [len(piece) for piece in pieces] and sum(len(piece) for piece in pieces) == len(y)
+        assert len(pieces[0]) <= 9 * sr
+        assert 8.5 * sr <= len(pieces[0]) < 8.6 * sr
+        np.testing.assert_array_equal(np.concatenate(pieces), y)
+
+    def test_long_speech_is_transcribed_in_pieces_and_joined(self):
+        import voice_extractor as module
+
+        extractor = VoiceExtractor(enable_transcription=False)
+        extractor.enable_transcription = True
+        extractor._whisper_model = whisper = _PieceWhisper()
+        y = np.full(int(2.5 * module.TRANSCRIBE_WINDOW_SECONDS * 16000), 0.1, dtype=np.float32)
+
+        transcription = extractor._transcribe(y)
+
+        assert transcription.text == "piece1 piece2 piece3"
+        assert transcription.language == "th"
+        # The first piece detects the language; the rest are told it.
+        assert [language for _, language in whisper.calls] == [None, "th", "th"]
+        assert sum(length for length, _ in whisper.calls) == len(y)
+
+
+class _BrokenWhisper:
+    def transcribe(self, audio, language=None):
+        raise RuntimeError("model file truncated")
+
+
+class TestWarmUp:
+    def test_warm_up_runs_one_inference(self):
+        extractor = VoiceExtractor(enable_transcription=False)
+        extractor.enable_transcription = True
+        extractor._whisper_model = whisper = _RecordingWhisper()
+
+        assert extractor.warm_up() == "ready"
+        assert whisper.lengths == [16000]
+
+    def test_failed_warm_up_is_reported(self):
+        extractor = VoiceExtractor(enable_transcription=False)
+        extractor.enable_transcription = True
+        extractor._whisper_model = _BrokenWhisper()
+
+        assert extractor.warm_up() == "failed"
+        assert extractor.model_error == "model file truncated"
+
+    def test_disabled_transcription_needs_no_warm_up(self):
+        extractor = VoiceExtractor(enable_transcription=False)
+
+        assert extractor.warm_up() == "disabled"
@@ -0,0 +1,102 @@
+import io
+import stat
+import sys
+
+import librosa
+import numpy as np
+import pytest
+import soundfile as sf
+
+import audio_decoder
+from audio_decoder import AudioDecodeError, decode_audio
+
+
+def _encode(y: np.ndarray, sample_rate: int, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, y, sample_rate, format=fmt)
+    return buffer.getvalue()
+
+
+def _tone(sample_rate: int, seconds: float = 1.0, channels: int = 1) -> np.ndarray:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    y = 0.3 * np.sin(2 * np.pi * 220 * t)
+    if channels > 1:
+        y = np.stack([y * (1 + 0.1 * c) for c in range(channels)], axis=1)
+    return y.astype(np.float32)
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """An 'ffmpeg' that ignores its input and writes 200k ramp samples as f32le."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "import numpy as np\n"
+        "sys.stdin.buffer.read()\n"
+        "sys.stdout.buffer.write(np.arange(200_000, dtype='<f4').tobytes())\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(audio_decoder, "FFMPEG_BINARY", str(script))
+    return script
+
+
+@pytest.mark.parametrize("fmt", ["WAV", "FLAC", "OGG"])
+def test_sndfile_formats_match_librosa_load(fmt):
+    data = _encode(_tone(44100, channels=2), 44100, fmt)
+
+    y = decode_audio(data, 16000, f"audio/{fmt.lower()}")
+    expected, _ = librosa.load(io.BytesIO(data), sr=16000, mono=True)
+
+    assert y.dtype == np.float32
+    np.testing.assert_allclose(y, expected, atol=1e-6)
+
+
+def test_native_rate_mono_is_not_resampled():
+    data = _encode(_tone(16000), 16000, "WAV")
+
+    np.testing.assert_array_equal(
+        decode_audio(data, 16000), sf.read(io.BytesIO(data), dtype="float32")[0]
+    )
+
+
+def test_ffmpeg_output_is_read_into_growing_buffer(fake_ffmpeg):
+    y = decode_audio(b"\x00" * 2048, 100, "audio/webm")
+
+    np.testing.assert_array_equal(y, np.arange(200_000, dtype=np.float32))
+
+
+def test_ffmpeg_failure_falls_back_to_sndfile(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        audio_decoder, "FFMPEG_BINARY", str(tmp_path / "missing-ffmpeg")
+    )
+    data = _encode(_tone(16000), 16000, "WAV")
+
+    # Mislabelled as AAC: ffmpeg is unavailable, libsndfile still reads it.
+    np.testing.assert_array_equal(
+        decode_audio(data, 16000, "audio/aac"),
+        sf.read(io.BytesIO(data), dtype="float32")[0],
+    )
+
+
+def test_undecodable_bytes_raise(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        audio_decoder, "FFMPEG_BINARY", str(tmp_path / "missing-ffmpeg")
+    )
+
+    with pytest.raises(AudioDecodeError) as excinfo:
+        decode_audio(b"not audio at all" * 100, 16000, "audio/mpeg")
+    assert "ffmpeg" in str(excinfo.value) and "sndfile" in str(excinfo.value)
+
+
+def test_decodes_spooled_file_in_place():
+    import tempfile
+
+    data = _encode(_tone(16000), 16000, "WAV")
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024)
+    spooled.write(data)
+
+    y = decode_audio(spooled, 16000, "audio/wav")
+
+    np.testing.assert_array_equal(y, sf.read(io.BytesIO(data), dtype="float32")[0])
+    assert not spooled.closed
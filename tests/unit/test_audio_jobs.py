@@ -0,0 +1,113 @@
+import asyncio
+import io
+import time
+
+import pytest
+
+from audio_jobs import (
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_SUCCEEDED,
+    AudioJob,
+    AudioJobQueueFull,
+    AudioJobRunner,
+    SQLiteAudioJobStore,
+    validate_callback_url,
+)
+
+
+def _job(job_id: str = "j1", updated_at: float | None = None) -> AudioJob:
+    now = time.time() if updated_at is None else updated_at
+    return AudioJob(job_id, JOB_QUEUED, now, now)
+
+
+def test_sqlite_store_round_trips_and_expires(tmp_path):
+    store = SQLiteAudioJobStore(str(tmp_path / "jobs.db"))
+    store.save(_job("fresh"), ttl_seconds=60)
+    store.save(_job("stale", updated_at=time.time() - 120), ttl_seconds=60)
+
+    assert store.get("fresh").status == JOB_QUEUED
+    assert store.get("stale") is None
+    assert store.purge_expired() == 1
+    assert store.purge_expired() == 0
+
+
+def test_callback_url_must_be_an_allowed_host():
+    hosts = ["localhost", "127.0.0.1"]
+    assert validate_callback_url("http://127.0.0.1:9000/done", hosts)
+    with pytest.raises(ValueError):
+        validate_callback_url("http://example.com/done", hosts)
+    with pytest.raises(ValueError):
+        validate_callback_url("file:///etc/passwd", hosts)
+
+
+async def _wait_for(runner, job_id, statuses, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await runner.get(job_id)
+        if job is not None and job.status in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {statuses}")
+
+
+async def test_runner_processes_jobs_off_the_request(tmp_path):
+    seen = []
+
+    async def process(audio, content_type, params):
+        seen.append((audio.read(), content_type, params["user_id"]))
+        return {"risk_level": "low"}
+
+    runner = AudioJobRunner(SQLiteAudioJobStore(str(tmp_path / "jobs.db")), process)
+    runner.start()
+    try:
+        upload = io.BytesIO(b"RIFF....WAVE")
+        job = await runner.submit(upload, "audio/wav", {"user_id": "u1"})
+        upload.close()  # the request's spool goes away once the 202 is sent
+        assert job.status == JOB_QUEUED
+
+        done = await _wait_for(runner, job.job_id, {JOB_SUCCEEDED})
+    finally:
+        await runner.stop()
+
+    assert done.result == {"risk_level": "low"}
+    assert seen == [(b"RIFF....WAVE", "audio/wav", "u1")]
+
+
+async def test_failed_job_records_the_error(tmp_path):
+    async def process(audio, content_type, params):
+        raise RuntimeError("decoder exploded")
+
+    runner = AudioJobRunner(SQLiteAudioJobStore(str(tmp_path / "jobs.db")), process)
+    runner.start()
+    try:
+        job = await runner.submit(io.BytesIO(b"x"), "audio/wav", {})
+        failed = await _wait_for(runner, job.job_id, {JOB_FAILED})
+    finally:
+        await runner.stop()
+
+    assert failed.error == "decoder exploded"
+    assert failed.result is None
+
+
+async def test_full_queue_rejects_submission(tmp_path):
+    release = asyncio.Event()
+
+    async def process(audio, content_type, params):
+        await release.wait()
+        return {}
+
+    runner = AudioJobRunner(
+        SQLiteAudioJobStore(str(tmp_path / "jobs.db")), process, workers=1, queue_size=1
+    )
+    runner.start()
+    try:
+        first = await runner.submit(io.BytesIO(b"a"), "audio/wav", {})
+        await _wait_for(runner, first.job_id, {"running"})
+        await runner.submit(io.BytesIO(b"b"), "audio/wav", {})
+        with pytest.raises(AudioJobQueueFull):
+            await runner.submit(io.BytesIO(b"c"), "audio/wav", {})
+        release.set()
+        await _wait_for(runner, first.job_id, {JOB_SUCCEEDED})
+    finally:
+        await runner.stop()
@@ -0,0 +1,141 @@
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from audio_upload import SNIFF_BYTES, BodySizeLimitMiddleware, sniff_audio_type
+
+LIMIT = 4096
+
+
+def _encoded_header(fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, np.zeros(16000, dtype=np.float32), 16000, format=fmt)
+    return buffer.getvalue()[:SNIFF_BYTES]
+
+
+@pytest.mark.parametrize(
+    "fmt, expected",
+    [
+        ("WAV", "audio/wav"),
+        ("FLAC", "audio/flac"),
+        ("OGG", "audio/ogg"),
+        ("MP3", "audio/mpeg"),
+    ],
+)
+def test_sniffs_encoded_formats(fmt, expected):
+    assert sniff_audio_type(_encoded_header(fmt)) == expected
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81", "audio/webm"),
+        (b"\xff\xf1\x50\x80", "audio/aac"),
+        (b"\x00\x00\x00\x20ftypM4A ", "audio/aac"),
+        (b"\xff\xfb\x90\x64", "audio/mpeg"),
+        (b"<html><body>", None),
+        (b"", None),
+    ],
+)
+def test_sniffs_magic_bytes(header, expected):
+    assert sniff_audio_type(header) == expected
+
+
+@pytest.fixture
+def upload_app():
+    app = FastAPI()
+    calls = []
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        calls.append(file.size)
+        return {"size": file.size}
+
+    @app.post("/unlimited")
+    async def unlimited(file: UploadFile = File(...)):
+        return {"size": file.size}
+
+    app.add_middleware(BodySizeLimitMiddleware, limits={"/upload": LIMIT})
+    return TestClient(app), calls
+
+
+def test_accepts_body_under_limit(upload_app):
+    client, calls = upload_app
+
+    response = client.post(
+        "/upload", files={"file": ("a.wav", b"x" * 1000, "audio/wav")}
+    )
+
+    assert response.status_code == 200
+    assert calls == [1000]
+
+
+def test_rejects_declared_length_before_reading(upload_app):
+    client, calls = upload_app
+
+    response = client.post(
+        "/upload", files={"file": ("a.wav", b"x" * (2 * LIMIT), "audio/wav")}
+    )
+
+    assert response.status_code == 413
+    assert calls == []
+
+
+def test_rejects_chunked_body_once_limit_is_crossed(upload_app):
+    client, calls = upload_app
+    boundary = "limit-test"
+    head = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="a.wav"\r\n'
+        "Content-Type: audio/wav\r\n\r\n"
+    ).encode()
+
+    def body():
+        yield head
+        for _ in range(64):
+            yield b"x" * 1024
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    response = client.post(
+        "/upload",
+        content=body(),
+        headers={"content-type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "File too large"}
+    assert calls == []
+
+
+def test_other_paths_are_not_limited(upload_app):
+    client, _ = upload_app
+
+    response = client.post(
+        "/unlimited", files={"file": ("a.wav", b"x" * (2 * LIMIT), "audio/wav")}
+    )
+
+    assert response.status_code == 200
+
+
+async def test_middleware_answers_413_when_inner_app_does_not():
+    async def drain(scope, receive, send):
+        while (await receive()).get("more_body"):
+            pass
+
+    chunks = [{"type": "http.request", "body": b"x" * 1024, "more_body": True}] * 8
+    sent = []
+
+    async def receive():
+        return chunks.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = BodySizeLimitMiddleware(drain, limits={"/upload": LIMIT})
+    await middleware({"type": "http", "path": "/upload", "headers": []}, receive, send)
+
+    assert sent[0]["status"] == 413
+    assert len(chunks) == 3
@@ -0,0 +1,138 @@
+import asyncio
+import random
+
+import numpy as np
+
+from core_engine import HarmonicGovernor, MultiModalTriageEngine
+from fusion_kernel import (
+    FACIAL_FEATURES,
+    VOICE_FEATURES,
+    decode_risk_factors,
+    fuse,
+    pack_features,
+)
+
+# The scalar path's thresholds, so both sides of every comparison get exercised.
+_EDGES = [0.0, 0.2, 0.4, 0.5, 0.7, 0.8, 1.0, 2.0, 2.5]
+_MESSAGES = [
+    "I feel fine today",
+    "I am feeling anxious about my job",
+    "I feel hopeless and I want to die",
+    "ไม่อยากอยู่แล้ว",
+    "Work was stressful but okay",
+]
+
+
+def _value(rng: random.Random) -> float:
+    return rng.choice(_EDGES) if rng.random() < 0.3 else rng.uniform(0.0, 2.5)
+
+
+def _features(rng: random.Random, names):
+    roll = rng.random()
+    if roll < 0.2:
+        return None
+    if roll < 0.25:
+        return {}
+    return {name: _value(rng) for name in names if rng.random() < 0.85}
+
+
+def _cases(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    voice_names = [name for name, _ in VOICE_FEATURES]
+    return [
+        (
+            rng.choice(_MESSAGES),
+            _features(rng, voice_names),
+            _features(rng, [name for name, _ in FACIAL_FEATURES]),
+        )
+        for _ in range(n)
+    ]
+
+
+def test_batch_fusion_matches_scalar_path_exactly():
+    engine = MultiModalTriageEngine()
+    cases = _cases(2000)
+
+    async def run():
+        scalar = [await engine.multimodal_fusion(*case) for case in cases]
+        batch = await engine.multimodal_fusion_batch(cases)
+        return scalar, batch
+
+    scalar, batch = asyncio.run(run())
+
+    # Dataclass equality compares every float with ==, i.e. bit for bit.
+    for case, expected, actual in zip(cases, scalar, batch):
+        assert actual == expected, case
+
+
+def test_batch_fusion_stores_the_same_insights_as_scalar_path():
+    scalar_engine, batch_engine = MultiModalTriageEngine(), MultiModalTriageEngine()
+    cases = _cases(200, seed=3) + [("   ", None, None)]
+
+    async def run():
+        for case in cases[:-1]:
+            await scalar_engine.multimodal_fusion(*case)
+        await batch_engine.multimodal_fusion_batch(cases)
+
+    asyncio.run(run())
+
+    def stored(engine):
+        return [entry["data"] for entry in engine.dhammic_lake.cache.values()]
+
+    assert len(stored(batch_engine)) == len(cases) - 1
+    assert stored(batch_engine) == stored(scalar_engine)
+    assert all(key.startswith("triage_") for key in batch_engine.dhammic_lake.cache)
+
+
+def test_kernel_arrays_and_risk_factor_bitmask():
+    voice_values, voice_present = pack_features(
+        [{"energy": 0.1, "tremor": 0.9}, None, {"energy": 0.3, "speech_rate": 3.0}],
+        VOICE_FEATURES,
+    )
+    facial_values, facial_present = pack_features(
+        [None, {"au1": 0.9}, None], FACIAL_FEATURES
+    )
+
+    batch = fuse(
+        np.full(3, 0.1),
+        np.full(3, 0.5),
+        voice_values,
+        voice_present,
+        facial_values,
+        facial_present,
+    )
+
+    assert batch.combined_risk.shape == (3,)
+    assert [decode_risk_factors(int(mask)) for mask in batch.risk_factors] == [
+        ["very_low_energy", "voice_tremor"],
+        [],
+        ["low_energy", "abnormal_speech_rate"],
+    ]
+
+
+def test_invalid_items_are_reported_in_place():
+    results = asyncio.run(
+        MultiModalTriageEngine().multimodal_fusion_batch(
+            [("fine", None, None), ("bad", [0.5], None), ("   ", None, None)]
+        )
+    )
+
+    assert results[0].text_risk >= 0.0
+    assert isinstance(results[1], TypeError)
+    assert isinstance(results[2], ValueError)
+
+
+def test_orchestrate_batch_matches_orchestrate():
+    governor = HarmonicGovernor()
+    cases = _cases(50, seed=11)
+
+    async def run():
+        single = [await governor.orchestrate(*case) for case in cases]
+        return single, await governor.orchestrate_batch(cases)
+
+    single, batch = asyncio.run(run())
+
+    for expected, actual in zip(single, batch):
+        assert actual["multimodal"] == expected["multimodal"]
+        assert actual["ethics"] == expected["ethics"]
+        assert actual["audit"] == expected["audit"]
@@ -0,0 +1,96 @@
+import asyncio
+
+import numpy as np
+
+from language_hints import LanguageHintCache
+from transcription_backends import Transcription
+from voice_extractor import VoiceExtractor
+
+
+def test_confident_detection_becomes_hint_for_user_and_session():
+    hints = LanguageHintCache(min_probability=0.8)
+    assert hints.hint("u1", "s1") is None
+
+    hints.observe("u1", "s1", None, Transcription("สวัสดี", "th", 0.95, -0.3))
+
+    assert hints.hint("u1", "s1") == "th"
+    assert hints.hint("u1", "other-session") == "th"
+
+
+def test_uncertain_detection_keeps_detecting():
+    hints = LanguageHintCache(min_probability=0.8, default_language="en")
+    hints.observe("u1", None, None, Transcription("hm", "th", 0.55, -0.4))
+
+    assert hints.hint("u1") is None
+
+
+def test_low_confidence_hinted_transcript_forces_detection():
+    hints = LanguageHintCache(min_logprob=-1.0)
+    hints.observe("u1", None, None, Transcription("hello", "en", 0.9, -0.2))
+    hints.observe("u1", None, "en", Transcription("hello", "en", None, -0.4))
+    assert hints.hint("u1") == "en"
+
+    hints.observe("u1", None, "en", Transcription("garbled", "en", None, -1.7))
+
+    assert hints.hint("u1") is None
+
+
+def test_session_entry_takes_precedence_over_user():
+    hints = LanguageHintCache()
+    hints.observe("u1", None, None, Transcription("hello", "en", 0.9))
+    hints.observe("u1", "s2", None, Transcription("สวัสดี", "th", 0.9))
+
+    assert hints.hint("u1", "s2") == "th"
+    assert hints.hint("u1", "s3") == "th"  # the user entry was refreshed too
+    hints.observe("u1", "s3", None, Transcription("hello", "en", 0.9))
+    assert hints.hint("u1", "s2") == "th"
+
+
+def test_entries_expire_to_default_language():
+    hints = LanguageHintCache(ttl_seconds=0.0, default_language="th")
+    hints.observe("u1", None, None, Transcription("hello", "en", 0.99))
+
+    assert hints.hint("u1") == "th"
+    assert len(hints) == 0
+
+
+def test_max_entries_bounds_the_cache():
+    hints = LanguageHintCache(max_entries=3)
+    for i in range(5):
+        hints.observe(f"u{i}", None, None, Transcription("hi", "en", 0.9))
+
+    assert len(hints) == 3
+    assert hints.hint("u0") is None
+    assert hints.hint("u4") == "en"
+
+
+class _LanguageRecorder:
+    def __init__(self):
+        self.languages = []
+
+    def transcribe(self, audio, language=None):
+        self.languages.append(language)
+        if language is None:
+            return Transcription("สวัสดี", "th", 0.97, -0.2)
+        return Transcription("สวัสดี", language, None, -0.2)
+
+
+def test_extractor_skips_detection_after_first_clip():
+    extractor = VoiceExtractor(
+        enable_transcription=False, language_hints=LanguageHintCache()
+    )
+    extractor.enable_transcription = True
+    extractor._whisper_model = whisper = _LanguageRecorder()
+    speech = (0.3 * np.sin(2 * np.pi * 220 * np.arange(16000) / 16000)).astype(
+        np.float32
+    )
+
+    async def transcribe_twice():
+        for _ in range(2):
+            hint = extractor._language_hint("u1", "s1")
+            transcription = await extractor.transcribe_async(speech, hint)
+            extractor.language_hints.observe("u1", "s1", hint, transcription)
+
+    asyncio.run(transcribe_twice())
+
+    assert whisper.languages == [None, "th"]
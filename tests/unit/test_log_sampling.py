@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+
+from structured_logging import SamplingFilter
+
+
+def _record(
+    name="namo_nexus.triage", level=logging.INFO, msg="Multimodal fusion done", **extra
+):
+    record = logging.LogRecord(name, level, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_sampling_ratio_is_exact_and_first_record_passes():
+    suppressed = []
+    sampler = SamplingFilter(
+        {"loggers": {"namo_nexus.triage": {"sample": 0.1}}},
+        on_suppress=suppressed.append,
+    )
+
+    passed = [sampler.filter(_record()) for _ in range(100)]
+
+    assert passed[0] is True
+    assert sum(passed) == 10
+    assert suppressed == ["sampled"] * 90
+
+
+def test_message_rule_beats_logger_rule_and_children_inherit():
+    sampler = SamplingFilter(
+        {
+            "loggers": {"namo_nexus": {"sample": 0.0}},
+            "messages": {"ethics.calibrated": {"sample": 1.0}},
+        }
+    )
+
+    assert sampler.filter(_record("namo_nexus.ethics", log_key="ethics.calibrated"))
+    assert not sampler.filter(_record("namo_nexus.triage.child"))
+    assert sampler.filter(_record("uvicorn.access"))
+
+
+def test_token_bucket_caps_burst_then_refills(monkeypatch):
+    clock = {"now": 100.0}
+    monkeypatch.setattr("structured_logging.time.monotonic", lambda: clock["now"])
+    sampler = SamplingFilter(
+        {"messages": {"Multimodal fusion": {"rate": 2, "burst": 3}}}
+    )
+
+    burst = [sampler.filter(_record()) for _ in range(10)]
+    clock["now"] += 1.0
+    refilled = [sampler.filter(_record()) for _ in range(10)]
+
+    assert sum(burst) == 3
+    assert sum(refilled) == 2
+    assert sampler.stats()["rules"]["message:Multimodal fusion"]["rate_limited"] == 15
+
+
+def test_warnings_and_crisis_events_always_pass():
+    sampler = SamplingFilter({"loggers": {"namo_nexus": {"sample": 0.0}}})
+
+    assert sampler.filter(_record(level=logging.WARNING))
+    assert sampler.filter(_record(crisis=True))
+    assert not sampler.filter(_record(crisis=False))
+
+
+def test_config_file_is_reloaded_when_it_changes(tmp_path):
+    path = tmp_path / "sampling.json"
+    path.write_text(
+        json.dumps({"loggers": {"namo_nexus": {"sample": 0.0}}}), encoding="utf-8"
+    )
+    sampler = SamplingFilter(config_path=str(path), reload_seconds=0.0)
+    assert not sampler.filter(_record())
+
+    path.write_text(
+        json.dumps({"loggers": {"namo_nexus": {"sample": 1.0}}}), encoding="utf-8"
+    )
+    os.utime(path, (1, 1))
+    assert sampler.filter(_record())
+
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, (2, 2))
+    assert sampler.filter(_record())
+    assert sampler.stats()["last_error"].startswith("JSONDecodeError")
+
+
+def test_record_propagating_through_two_pipelines_is_sampled_once():
+    sampler = SamplingFilter({"loggers": {"namo_nexus.dual": {"sample": 0.5}}})
+    seen = {"child": [], "parent": []}
+
+    class _Sink(logging.Handler):
+        def __init__(self, key):
+            super().__init__()
+            self.key = key
+            self.addFilter(sampler)
+
+        def emit(self, record):
+            seen[self.key].append(record.getMessage())
+
+    parent = logging.getLogger("namo_nexus.dual")
+    child = logging.getLogger("namo_nexus.dual.child")
+    parent.handlers = [_Sink("parent")]
+    child.handlers = [_Sink("child")]
+    parent.propagate = False
+    child.setLevel(logging.INFO)
+    try:
+        for index in range(10):
+            child.info("event %s", index)
+    finally:
+        parent.handlers = []
+        child.handlers = []
+
+    assert len(seen["child"]) == 5
+    assert seen["parent"] == seen["child"]
+    assert sampler.stats()["rules"]["logger:namo_nexus.dual"]["seen"] == 10
@@ -0,0 +1,47 @@
+import asyncio
+import logging
+import time
+
+from loop_monitor import LoopMonitor
+from structured_logging import trace_id_var
+
+
+def _blocking_scan() -> None:
+    time.sleep(0.3)
+
+
+def test_watchdog_logs_blocking_stack_with_trace_id(caplog):
+    monitor = LoopMonitor(interval=0.02, threshold_ms=100)
+
+    async def handler() -> None:
+        trace_id_var.set("trace-blocked")
+        await asyncio.sleep(0.05)
+        _blocking_scan()
+
+    async def run() -> None:
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await asyncio.create_task(handler())
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    with caplog.at_level(logging.WARNING, logger="namo_nexus.loop_monitor"):
+        asyncio.run(run())
+
+    assert monitor.stalls == 1
+    record = next(r for r in caplog.records if "event_loop_blocked" in r.getMessage())
+    assert "_blocking_scan" in record.getMessage()
+    assert record.trace_id == "trace-blocked"
+    assert not monitor.running
+
+
+def test_idle_loop_reports_no_stalls():
+    monitor = LoopMonitor(interval=0.01, threshold_ms=200)
+
+    async def run() -> None:
+        monitor.start()
+        await asyncio.sleep(0.2)
+        await monitor.stop()
+
+    asyncio.run(run())
+    assert monitor.stalls == 0
@@ -18,6 +18,15 @@ class TestHealthEndpoints:
         assert data.get("status") in {"ready", "degraded"}
         assert "db_ready" in data
         assert "cache_ready" in data
+        assert "model_status" in data
+
+    def test_readyz_waits_for_model_warm_up(self, client: TestClient, monkeypatch):
+        import main
+
+        monkeypatch.setattr(main.voice_extractor, "model_status", "loading")
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
 
     def test_health_legacy(self, client: TestClient):
         """Test legacy /health endpoint."""
@@ -55,6 +64,20 @@ class TestInteractEndpoint:
         assert "risk_level" in data
         assert "session_id" in data
 
+    def test_interact_debug_stage_timings(
+        self, client: TestClient, sample_user_message, auth_headers
+    ):
+        """Per-stage timings are returned only when the debug header is sent."""
+        plain = client.post("/interact", json=sample_user_message, headers=auth_headers)
+        debug = client.post(
+            "/interact",
+            json=sample_user_message,
+            headers={**auth_headers, "X-Debug-Timings": "1"},
+        )
+        assert plain.json()["stage_timings_ms"] is None
+        timings = debug.json()["stage_timings_ms"]
+        assert {"governor.orchestrate", "governor.fusion", "triage.text"} <= set(timings)
+
     def test_interact_missing_message(self, client: TestClient, auth_headers):
         """Test interact with missing message."""
         response = client.post("/interact", json={"user_id": "test"}, headers=auth_headers)
@@ -108,3 +131,79 @@ class TestHarmonicConsole:
         assert "metrics" in data
         assert "recent_sessions" in data
         assert "active_alerts" in data
+
+
+class TestTriageBatchEndpoint:
+    """Test /triage/batch endpoint."""
+
+    def test_batch_streams_results_in_order(self, client: TestClient, auth_headers):
+        import json
+
+        items = [
+            {"user_id": "batch_user", "message": "I am feeling anxious about my job"},
+            {"user_id": "batch_user", "message": ""},
+            {"user_id": "batch_user", "message": "Work was fine today", "session_id": "s-1"},
+        ]
+        response = client.post("/triage/batch", json={"items": items}, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["index"] for line in lines] == [0, 1, 2]
+        assert [line["status"] for line in lines] == ["ok", "error", "ok"]
+        assert "message" in lines[1]["error"]
+        assert lines[2]["result"]["session_id"] == "s-1"
+        assert lines[0]["result"]["risk_level"] in {"low", "moderate", "severe"}
+
+    def test_batch_size_is_limited(self, client: TestClient, auth_headers, monkeypatch):
+        import main
+
+        monkeypatch.setattr(main, "TRIAGE_BATCH_MAX_ITEMS", 2)
+        items = [{"user_id": "batch_user", "message": "hello"}] * 3
+        response = client.post("/triage/batch", json={"items": items}, headers=auth_headers)
+        assert response.status_code == 413
+
+
+    def test_batch_persists_each_chunk_before_yielding(self, monkeypatch):
+        import asyncio
+
+        import main
+        from models import TriageRequest
+
+        monkeypatch.setattr(main, "TRIAGE_BATCH_CHUNK_SIZE", 2)
+        stored = []
+        monkeypatch.setattr(
+            main.engine.grid,
+            "store_sovereign_batch",
+            lambda conversations, alerts: stored.append(len(conversations)),
+        )
+        requests = [
+            TriageRequest(user_id="batch_user", message=f"message {index}")
+            for index in range(4)
+        ]
+
+        async def _first_then_disconnect():
+            results = main.engine.process_triage_batch(requests)
+            first = await results.__anext__()
+            await results.aclose()
+            return first
+
+        first = asyncio.run(_first_then_disconnect())
+        assert first.session_id
+        assert stored == [2]
+
+
+class TestTriageMicroBatching:
+    """Test /triage scored through the micro-batcher."""
+
+    def test_triage_through_batcher(
+        self, client: TestClient, sample_user_message, auth_headers, monkeypatch
+    ):
+        import main
+        from micro_batcher import MicroBatcher
+
+        batcher = MicroBatcher(main.engine.governor.orchestrate_batch, window_ms=1)
+        monkeypatch.setattr(main.engine, "batcher", batcher)
+        response = client.post("/triage", json=sample_user_message, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["risk_level"] in {"low", "moderate", "severe"}
+        assert batcher.stats()["batches"] == 1
@@ -0,0 +1,42 @@
+import pytest
+
+from memory_diagnostics import MemoryDiagnostics, register_size, registry_sizes
+
+_leak = []
+
+
+def _grow_leak() -> None:
+    _leak.extend(bytearray(1024) for _ in range(500))
+
+
+def test_diff_attributes_growth_to_allocating_line():
+    diagnostics = MemoryDiagnostics()
+    diagnostics.start(frames=1)
+    try:
+        baseline = diagnostics.diff(top=5)
+        _grow_leak()
+        deltas = diagnostics.diff(top=5)
+    finally:
+        diagnostics.stop()
+        _leak.clear()
+
+    assert baseline and "size_diff_bytes" not in baseline[0]
+    assert "test_memory_diagnostics.py" in deltas[0]["location"]
+    assert deltas[0]["size_diff_bytes"] >= 500 * 1024
+    assert deltas[0]["count_diff"] >= 500
+
+
+def test_diff_requires_tracing():
+    with pytest.raises(RuntimeError):
+        MemoryDiagnostics().diff()
+
+
+def test_registry_sizes_survive_broken_getters():
+    store = {"a": 1, "b": 2}
+    register_size("test.store", lambda: len(store))
+    register_size("test.broken", lambda: 1 / 0)
+
+    sizes = registry_sizes()
+
+    assert sizes["test.store"] == 2
+    assert sizes["test.broken"] is None
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from metrics import MetricsExporter, record_metrics
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def _record_in_worker(multiproc_dir: Path) -> None:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)}
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from metrics import record_metrics; record_metrics('GET', '/triage', 200, 12.0)",
+        ],
+        cwd=ROOT_DIR,
+        env=env,
+        check=True,
+    )
+
+
+def test_multiprocess_exporter_aggregates_workers(tmp_path):
+    _record_in_worker(tmp_path)
+    _record_in_worker(tmp_path)
+
+    exporter = MetricsExporter(ttl_seconds=0.0, multiproc_dir=str(tmp_path))
+    payload = exporter.render().decode("utf-8")
+
+    assert (
+        'namo_nexus_http_requests_total{method="GET",path="/triage",status="200"} 2.0'
+        in payload
+    )
+    assert "namo_nexus_http_request_latency_ms_count" in payload
+
+
+def test_exporter_caches_payload_within_ttl():
+    exporter = MetricsExporter(ttl_seconds=60.0)
+    first = exporter.render()
+    record_metrics("GET", "/cached-probe", 200, 1.0)
+
+    assert exporter.render() is first
+    exporter.invalidate()
+    assert b"/cached-probe" in exporter.render()
+
+
+def test_reaped_pids_are_forgotten_once_their_files_are_gone(tmp_path):
+    _record_in_worker(tmp_path)
+    exporter = MetricsExporter(ttl_seconds=0.0, multiproc_dir=str(tmp_path))
+
+    dead = exporter.reap_dead_workers()
+    assert len(dead) == 1
+    assert exporter._reaped == set(dead)
+
+    for name in os.listdir(tmp_path):
+        os.remove(tmp_path / name)
+    assert exporter.reap_dead_workers() == []
+    assert exporter._reaped == set()
@@ -0,0 +1,104 @@
+import json
+import os
+import random
+
+from src import metrics_store
+from src.metrics_store import DDSketch, LatencyMetricsStore
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_ddsketch_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-3.0, 1.0) for _ in range(20_000)]
+    sketch = DDSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.95, 0.99, 0.999):
+        exact = _exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= exact * 0.011
+
+
+def test_ddsketch_merge_matches_single_sketch():
+    left, right, combined = DDSketch(), DDSketch(), DDSketch()
+    for value in range(1, 1001):
+        target = left if value % 2 else right
+        target.add(value / 1000)
+        combined.add(value / 1000)
+
+    left.merge(right)
+    restored = DDSketch.from_compact(json.loads(json.dumps(left.to_compact())))
+
+    assert restored.count == combined.count
+    assert restored.quantile(0.99) == combined.quantile(0.99)
+
+
+def test_store_windows_drop_old_requests(monkeypatch):
+    clock = {"now": 10_000.0}
+    monkeypatch.setattr(metrics_store.time, "time", lambda: clock["now"])
+    store = LatencyMetricsStore(shared_dir=None, view_ttl_seconds=0.0)
+
+    store.record(2.0, 200, route="/interact")
+    clock["now"] += 120
+    store.record(0.01, 200, route="/interact")
+    store.record(0.02, 503, route="/reflect")
+
+    summary = store.summary()
+    assert summary["requests"] == 3.0
+    assert summary["windows"]["1m"]["requests"] == 2.0
+    assert summary["windows"]["1m"]["errors"] == 1.0
+    assert summary["windows"]["1m"]["p99_ms"] < 100.0
+    assert summary["windows"]["5m"]["avg_ms"] > 600.0
+    routes = {(row["route"], row["status"]) for row in store.route_summary("1m")}
+    assert routes == {("/interact", "200"), ("/reflect", "503")}
+
+
+def test_idle_series_are_evicted(monkeypatch):
+    clock = {"now": 10_000.0}
+    monkeypatch.setattr(metrics_store.time, "time", lambda: clock["now"])
+    store = LatencyMetricsStore(shared_dir=None, view_ttl_seconds=0.0)
+
+    for index in range(100):
+        store.record(0.01, 404, route=f"/scan/{index}")
+    clock["now"] += 2 * 3600
+    store.record(0.01, 200, route="/interact")
+
+    assert list(store._series) == [("/interact", "200")]
+
+
+def test_merged_view_is_cached_between_reads():
+    store = LatencyMetricsStore(shared_dir=None, view_ttl_seconds=60.0)
+    store.record(0.01, 200, route="/interact")
+    assert store.summary()["windows"]["1m"]["requests"] == 1.0
+
+    store.record(0.02, 200, route="/interact")
+
+    assert store.summary()["windows"]["1m"]["requests"] == 1.0
+    assert store.route_summary()[0]["requests"] == 1.0
+
+
+def test_store_merges_live_peers_and_reaps_dead_ones(tmp_path):
+    peer = LatencyMetricsStore(shared_dir=None)
+    peer.record(0.05, 200, route="/interact")
+    live = peer.snapshot()
+    live["pid"] = os.getppid()
+    (tmp_path / f"latency_{live['pid']}.json").write_text(
+        json.dumps(live), encoding="utf-8"
+    )
+    dead_file = tmp_path / "latency_999999999.json"
+    dead_file.write_text(json.dumps({**live, "pid": 999_999_999}), encoding="utf-8")
+
+    store = LatencyMetricsStore(shared_dir=str(tmp_path), view_ttl_seconds=0.0)
+    try:
+        store.record(0.01, 200, route="/interact")
+        summary = store.summary()
+    finally:
+        store.stop_publisher()
+
+    assert summary["requests"] == 2.0
+    assert summary["windows"]["1m"]["requests"] == 2.0
+    assert not dead_file.exists()
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+from micro_batcher import MicroBatcher
+
+
+class _Scorer:
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, items):
+        self.batches.append(list(items))
+        return [ValueError(item) if item == "bad" else item.upper() for item in items]
+
+
+def test_concurrent_items_share_one_batch_and_keep_order():
+    scorer = _Scorer()
+    batcher = MicroBatcher(scorer, window_ms=5, max_size=32)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(item) for item in ["a", "b", "c"]))
+
+    assert asyncio.run(run()) == ["A", "B", "C"]
+    assert scorer.batches == [["a", "b", "c"]]
+    assert batcher.stats()["avg_batch_size"] == 3
+
+
+def test_full_batch_is_dispatched_without_waiting_for_the_window():
+    scorer = _Scorer()
+    batcher = MicroBatcher(scorer, window_ms=10_000, max_size=2)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.submit("a"), batcher.submit("b")), timeout=1
+        )
+
+    assert asyncio.run(run()) == ["A", "B"]
+
+
+def test_urgent_item_bypasses_the_window_with_what_is_waiting():
+    scorer = _Scorer()
+    batcher = MicroBatcher(scorer, window_ms=10_000, max_size=32)
+
+    async def run():
+        waiting = asyncio.ensure_future(batcher.submit("a"))
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        urgent = await batcher.submit("crisis", urgent=True)
+        return urgent, await waiting, time.perf_counter() - started
+
+    urgent, waiting, elapsed = asyncio.run(run())
+
+    assert (urgent, waiting) == ("CRISIS", "A")
+    assert elapsed < 1
+    assert scorer.batches == [["a", "crisis"]]
+
+
+def test_item_errors_reach_only_their_caller():
+    batcher = MicroBatcher(_Scorer(), window_ms=1)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit("ok"), batcher.submit("bad"), return_exceptions=True
+        )
+
+    ok, bad = asyncio.run(run())
+    assert ok == "OK"
+    assert isinstance(bad, ValueError)
+
+
+def test_failed_batch_call_fails_every_caller():
+    async def broken(items):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(broken, window_ms=1)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+
+
+def test_short_result_list_fails_every_caller():
+    async def short(items):
+        return [item.upper() for item in items[:-1]]
+
+    batcher = MicroBatcher(short, window_ms=1)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(
+                batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+            ),
+            timeout=5,
+        )
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+
+
+def test_cancelled_scoring_fails_waiting_callers():
+    async def hang(items):
+        await asyncio.sleep(60)
+
+    batcher = MicroBatcher(hang, window_ms=1)
+
+    async def run():
+        callers = asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+        await asyncio.sleep(0.05)
+        for task in list(batcher._tasks):
+            task.cancel()
+        return await asyncio.wait_for(callers, timeout=5)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
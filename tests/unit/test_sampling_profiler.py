@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from sampling_profiler import ProfilerBusyError, SamplingProfiler
+
+
+def _spin_in_grid_lookup(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_collect_returns_collapsed_stacks_for_worker_threads():
+    stop = threading.Event()
+    worker = threading.Thread(
+        target=_spin_in_grid_lookup, args=(stop,), name="anyio-worker"
+    )
+    worker.start()
+    try:
+        collapsed = SamplingProfiler().collect(seconds=0.2, hz=200)
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = [
+        line for line in collapsed.splitlines() if line.startswith("anyio-worker;")
+    ]
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert "_spin_in_grid_lookup (" in stack
+    assert int(count) > 0
+
+
+def test_idle_threads_are_skipped_unless_requested():
+    stop = threading.Event()
+    parked = threading.Thread(target=stop.wait, name="parked")
+    parked.start()
+    try:
+        profiler = SamplingProfiler()
+        busy_only = profiler.collect(seconds=0.05, hz=100)
+        with_idle = profiler.collect(seconds=0.05, hz=100, include_idle=True)
+    finally:
+        stop.set()
+        parked.join()
+
+    assert "parked;" not in busy_only
+    assert "parked;" in with_idle
+
+
+def test_concurrent_profiles_are_rejected():
+    profiler = SamplingProfiler()
+    runner = threading.Thread(target=profiler.collect, args=(0.3,))
+    runner.start()
+    time.sleep(0.05)
+    try:
+        with pytest.raises(ProfilerBusyError):
+            profiler.collect(seconds=0.01)
+    finally:
+        runner.join()
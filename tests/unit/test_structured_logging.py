@@ -0,0 +1,123 @@
+import json
+import logging
+import threading
+import time
+
+from structured_logging import (
+    JsonFormatter,
+    LogPipeline,
+    PayloadFormatter,
+    trace_id_var,
+)
+
+
+class _GatedHandler(logging.Handler):
+    """Sink that blocks on ``gate`` to simulate slow stdout/disk."""
+
+    def __init__(self, gate: threading.Event) -> None:
+        super().__init__()
+        self.gate = gate
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.gate.wait(timeout=5)
+        self.records.append(self.format(record))
+
+
+def _logger_for(pipeline: LogPipeline, name: str) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [pipeline.handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_slow_sink_does_not_block_and_drops_overflow():
+    gate = threading.Event()
+    sink = _GatedHandler(gate)
+    drops = []
+    pipeline = LogPipeline(
+        [sink], queue_size=4, drop_policy="drop_newest", on_drop=lambda: drops.append(1)
+    ).start()
+    logger = _logger_for(pipeline, "namo_nexus.test.slow")
+
+    start = time.perf_counter()
+    for index in range(50):
+        logger.info("event %s", index)
+    elapsed = time.perf_counter() - start
+    dropped = pipeline.stats()["dropped"]
+
+    gate.set()
+    pipeline.stop()
+
+    assert elapsed < 0.5
+    assert dropped >= 40
+    assert len(drops) == dropped
+    assert len(sink.records) == 50 - dropped
+
+
+def test_stop_succeeds_when_queue_is_saturated():
+    gate = threading.Event()
+    sink = _GatedHandler(gate)
+    pipeline = LogPipeline([sink], queue_size=2, drop_policy="drop_oldest").start()
+    logger = _logger_for(pipeline, "namo_nexus.test.saturated")
+    for index in range(10):
+        logger.info("event %s", index)
+
+    threading.Timer(0.2, gate.set).start()
+    pipeline.stop()
+
+    assert not pipeline.listener._thread
+
+
+def test_prepare_does_not_mutate_callers_record():
+    gate = threading.Event()
+    gate.set()
+    sink = _GatedHandler(gate)
+    pipeline = LogPipeline([sink], queue_size=10, drop_policy="drop_newest").start()
+    record = logging.LogRecord(
+        "namo", logging.INFO, __file__, 1, "value=%s", (42,), None
+    )
+
+    pipeline.handler.handle(record)
+    pipeline.stop()
+
+    assert record.msg == "value=%s"
+    assert record.args == (42,)
+    assert sink.records == ["value=42"]
+
+
+def test_trace_id_is_captured_on_the_calling_thread():
+    gate = threading.Event()
+    gate.set()
+    sink = _GatedHandler(gate)
+    sink.setFormatter(JsonFormatter("test-service"))
+    pipeline = LogPipeline([sink], queue_size=10, drop_policy="drop_oldest").start()
+    logger = _logger_for(pipeline, "namo_nexus.test.trace")
+
+    token = trace_id_var.set("trace-123")
+    try:
+        logger.info("request_completed status=%s", 200)
+    finally:
+        trace_id_var.reset(token)
+    pipeline.stop()
+
+    payload = json.loads(sink.records[0])
+    assert payload["trace_id"] == "trace-123"
+    assert payload["message"] == "request_completed status=200"
+
+
+def test_payload_is_serialised_by_the_listener():
+    gate = threading.Event()
+    gate.set()
+    sink = _GatedHandler(gate)
+    sink.setFormatter(PayloadFormatter("%(levelname)s %(message)s"))
+    pipeline = LogPipeline([sink], queue_size=10, drop_policy="drop_newest").start()
+    logger = _logger_for(pipeline, "namo_nexus.test.payload")
+
+    logger.info("interaction", extra={"payload": {"user_id": "u1", "risk_score": 0.2}})
+    pipeline.stop()
+
+    level, _, message = sink.records[0].partition(" ")
+    assert level == "INFO"
+    assert json.loads(message) == {"user_id": "u1", "risk_score": 0.2}
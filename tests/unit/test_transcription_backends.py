@@ -0,0 +1,92 @@
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+from transcription_backends import (
+    FasterWhisperBackend,
+    OpenAIWhisperBackend,
+    backend_available,
+    load_backend,
+)
+
+
+@pytest.fixture
+def fake_faster_whisper(monkeypatch):
+    created = []
+
+    class WhisperModel:
+        def __init__(self, model_name, device, compute_type, cpu_threads):
+            created.append((model_name, device, compute_type, cpu_threads))
+
+        def transcribe(self, audio, language, task, beam_size):
+            segments = (
+                SimpleNamespace(text=t, avg_logprob=p)
+                for t, p in [(" สวัสดี", -0.2), (" ครับ ", -0.4)]
+            )
+            return segments, SimpleNamespace(
+                language=language or "th",
+                language_probability=1.0 if language else 0.93,
+            )
+
+    module = types.ModuleType("faster_whisper")
+    module.WhisperModel = WhisperModel
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    return created
+
+
+@pytest.fixture
+def fake_openai_whisper(monkeypatch):
+    class Model:
+        dims = SimpleNamespace(n_mels=80)
+        device = "cpu"
+
+        def detect_language(self, mel):
+            return None, {"en": 0.7, "th": 0.2}
+
+        def transcribe(self, audio, language, task):
+            return {
+                "text": " hello ",
+                "language": language,
+                "segments": [{"avg_logprob": -0.5}],
+            }
+
+    class Mel:
+        def to(self, device):
+            return self
+
+    module = types.ModuleType("whisper")
+    module.load_model = lambda name: Model()
+    module.pad_or_trim = lambda audio: audio
+    module.log_mel_spectrogram = lambda audio, n_mels: Mel()
+    monkeypatch.setitem(sys.modules, "whisper", module)
+
+
+def test_faster_whisper_defaults_to_int8_cpu(fake_faster_whisper):
+    backend = load_backend("small", "faster-whisper")
+
+    assert isinstance(backend, FasterWhisperBackend)
+    assert fake_faster_whisper == [("small", "cpu", "int8", 0)]
+    assert backend.transcribe([0.0]) == pytest.approx(("สวัสดี ครับ", "th", 0.93, -0.3))
+    assert backend.transcribe([0.0], language="th").language_probability is None
+
+
+def test_faster_whisper_settings_are_configurable(fake_faster_whisper):
+    FasterWhisperBackend("tiny", compute_type="int8_float32", cpu_threads=2)
+
+    assert fake_faster_whisper == [("tiny", "cpu", "int8_float32", 2)]
+
+
+def test_openai_whisper_reports_detection_probability(fake_openai_whisper):
+    backend = load_backend("base", "openai-whisper")
+
+    assert isinstance(backend, OpenAIWhisperBackend)
+    assert backend.transcribe([0.0]) == ("hello", "en", 0.7, -0.5)
+    assert backend.transcribe([0.0], language="th") == ("hello", "th", None, -0.5)
+
+
+def test_unknown_backend_is_rejected():
+    assert not backend_available("whisper.cpp")
+    with pytest.raises(ValueError):
+        load_backend("base", "whisper.cpp")
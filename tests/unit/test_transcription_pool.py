@@ -0,0 +1,87 @@
+import os
+import signal
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from transcription_backends import Transcription, TranscriptionBackend
+from transcription_pool import TranscriptionPool, TranscriptionQueueFull
+
+
+class _FakeBackend(TranscriptionBackend):
+    name = "fake"
+
+    def transcribe(self, audio, language=None):
+        time.sleep(float(audio[0]))
+        return Transcription(
+            f"{len(audio)} samples", language or "th", None if language else 0.9
+        )
+
+
+def load_fake_model(model_name: str) -> _FakeBackend:
+    return _FakeBackend()
+
+
+@pytest.fixture
+def pool():
+    pool = TranscriptionPool("fake", workers=1, queue_size=1, loader=load_fake_model)
+    yield pool
+    pool.shutdown()
+
+
+def test_transcribes_in_worker_process(pool):
+    assert pool.submit([0.0, 0.0, 0.0]).result(timeout=60) == (
+        "3 samples",
+        "th",
+        0.9,
+        None,
+    )
+    assert pool.in_flight == 0
+
+
+def test_language_hint_reaches_worker(pool):
+    assert pool.submit([0.0], language="en").result(timeout=60) == (
+        "1 samples",
+        "en",
+        None,
+        None,
+    )
+
+
+def test_rejects_when_workers_and_queue_are_full(pool):
+    pool.submit([0.0]).result(timeout=60)  # warm the worker up
+    running = pool.submit([0.5])
+    queued = pool.submit([0.0])
+
+    assert pool.saturated
+    with pytest.raises(TranscriptionQueueFull) as excinfo:
+        pool.submit([0.0])
+    assert excinfo.value.retry_after >= 1.0
+
+    running.result(timeout=60)
+    queued.result(timeout=60)
+    assert not pool.saturated
+
+
+def test_warm_up_starts_the_workers(pool):
+    pool.warm_up([0.0])
+
+    assert pool.stats()["started"]
+    assert pool.in_flight == 0
+
+
+def test_recovers_after_a_worker_is_killed(pool):
+    pool.submit([0.0]).result(timeout=60)  # warm the worker up
+    broken_executor = pool._executor
+    running = pool.submit([30.0])
+    time.sleep(0.5)  # let the worker pick the job up
+
+    for pid in list(broken_executor._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    with pytest.raises(BrokenProcessPool):
+        running.result(timeout=60)
+    assert pool.submit([0.0, 0.0]).result(timeout=60)[0] == "2 samples"
+    assert pool._executor is not broken_executor
+    assert pool.in_flight == 0
@@ -0,0 +1,83 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from core_engine import HarmonicGovernor
+from database import GridIntelligence
+
+
+@pytest.fixture
+def grid(tmp_path, monkeypatch):
+    # Plain SQLite: these tests are about batching, not encryption.
+    monkeypatch.delenv("DB_CIPHER_KEY", raising=False)
+    return GridIntelligence(str(tmp_path / "batch.db"))
+
+
+def _conversation(session_id: str, message: str) -> dict:
+    return {
+        "user_id": "user-1",
+        "session_id": session_id,
+        "message": message,
+        "response": "response",
+        "risk_level": "severe",
+        "dharma_score": 0.5,
+        "multimodal": {"combined_risk": 0.9, "confidence": 0.9},
+    }
+
+
+def _count(grid: GridIntelligence, table: str) -> int:
+    return grid.db_pool.execute(f"SELECT COUNT(*) FROM {table}")[0][0]
+
+
+def test_store_sovereign_batch_writes_conversations_and_alerts(grid):
+    conversations = [_conversation("s1", "one"), _conversation("s2", "two")]
+
+    grid.store_sovereign_batch(conversations, [conversations[1]])
+
+    assert _count(grid, "conversations") == 2
+    assert _count(grid, "crisis_alerts") == 1
+
+
+def test_execute_batch_rolls_back_every_statement(grid):
+    conversation = grid._conversation_params(_conversation("s1", "one"))
+
+    with pytest.raises(sqlite3.IntegrityError):
+        grid.db_pool.execute_batch(
+            [
+                (grid._CONVERSATION_INSERT, [conversation]),
+                ("INSERT INTO crisis_alerts (id) VALUES (?)", [(1,), (1,)]),
+            ]
+        )
+
+    assert _count(grid, "conversations") == 0
+    assert _count(grid, "crisis_alerts") == 0
+
+
+def test_orchestrate_batch_stores_one_insight_per_item():
+    governor = HarmonicGovernor()
+    lake = governor.agents["triage"].dhammic_lake
+
+    asyncio.run(governor.orchestrate_batch([("I feel fine today", None, None)] * 20))
+
+    assert sum(key.startswith("orchestrate_") for key in lake.cache) == 20
+
+
+def test_orchestrate_batch_keeps_order_and_reports_failed_items():
+    governor = HarmonicGovernor()
+
+    results = asyncio.run(
+        governor.orchestrate_batch(
+            [
+                ("I feel fine today", None, None),
+                ("bad features", "not a dict", None),
+                ("I feel hopeless", None, None),
+            ]
+        )
+    )
+
+    assert isinstance(results[1], TypeError)
+    assert (
+        results[0]["multimodal"].combined_risk <= results[2]["multimodal"].combined_risk
+    )
+    assert {"multimodal", "ethics", "audit"} <= results[0].keys() & results[2].keys()
@@ -0,0 +1,106 @@
+import asyncio
+import io
+
+import numpy as np
+import soundfile as sf
+
+from voice_cache import VoiceResultCache, content_key
+from voice_extractor import VoiceExtractor
+
+
+def _wav(freq: float = 220.0) -> bytes:
+    t = np.arange(16000) / 16000
+    buffer = io.BytesIO()
+    sf.write(
+        buffer,
+        (0.3 * np.sin(2 * np.pi * freq * t)).astype(np.float32),
+        16000,
+        format="WAV",
+    )
+    return buffer.getvalue()
+
+
+def test_key_covers_content_and_settings():
+    audio = _wav()
+    settings = {"sample_rate": 16000, "pitch_tracker": "piptrack"}
+
+    assert content_key(audio, settings) == content_key(io.BytesIO(audio), settings)
+    assert content_key(audio, settings) != content_key(_wav(330.0), settings)
+    assert content_key(audio, settings) != content_key(
+        audio, {**settings, "pitch_tracker": "yin"}
+    )
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = VoiceResultCache(max_entries=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    cache.get("a")
+    cache.set("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
+
+
+def test_disk_tier_survives_restart_and_respects_byte_limit(tmp_path):
+    cache = VoiceResultCache(
+        max_entries=1, disk_dir=str(tmp_path), disk_max_bytes=10_000
+    )
+    for i in range(3):
+        cache.set(f"{i:064x}", {"pitch_mean_hz": 200.0 + i})
+
+    reopened = VoiceResultCache(
+        max_entries=1, disk_dir=str(tmp_path), disk_max_bytes=60
+    )
+
+    assert reopened.stats()["disk_bytes"] <= 60
+    assert reopened.get(f"{2:064x}") == {"pitch_mean_hz": 202.0}
+    assert reopened.get(f"{0:064x}") is None
+
+
+def test_transcripts_stay_in_memory_only(tmp_path):
+    cache = VoiceResultCache(disk_dir=str(tmp_path))
+    cache.set("a" * 64, {"pitch_mean_hz": 200.0, "transcription": "private words"})
+    cache.set("b" * 64, {"pitch_mean_hz": 210.0, "transcription": None})
+
+    assert cache.get("a" * 64)["transcription"] == "private words"
+    assert cache.stats()["disk_entries"] == 1
+    assert not any(
+        b"private words" in path.read_bytes() for path in tmp_path.rglob("*.json")
+    )
+    reopened = VoiceResultCache(disk_dir=str(tmp_path))
+    assert reopened.get("a" * 64) is None
+    assert reopened.get("b" * 64) == {"pitch_mean_hz": 210.0, "transcription": None}
+
+
+def test_repeat_upload_is_served_from_cache(monkeypatch):
+    extractor = VoiceExtractor(
+        enable_transcription=False, result_cache=VoiceResultCache()
+    )
+    calls = []
+    analyze = extractor.analyze_bytes
+    monkeypatch.setattr(
+        extractor, "analyze_bytes", lambda *args: calls.append(args) or analyze(*args)
+    )
+    audio = _wav()
+
+    first = extractor.extract_from_bytes(audio)
+    second = extractor.extract_from_bytes(io.BytesIO(audio))
+
+    assert len(calls) == 1
+    assert second.to_full_dict() == first.to_full_dict()
+
+
+def test_extract_async_caches_only_successful_analysis():
+    cache = VoiceResultCache()
+    extractor = VoiceExtractor(enable_transcription=False, result_cache=cache)
+
+    asyncio.run(extractor.extract_async(b"\x00" * 2000))
+    assert cache.stats()["memory_entries"] == 0
+
+    result = asyncio.run(extractor.extract_async(_wav(), "audio/wav"))
+    cached = asyncio.run(extractor.extract_async(_wav(), "audio/wav"))
+
+    assert cache.stats()["memory_entries"] == 1
+    assert cached.to_full_dict() == result.to_full_dict()
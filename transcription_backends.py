@@ -0,0 +1,140 @@
+"""Speech-to-text backends behind one ``transcribe(audio, language)`` interface.
+
+``WHISPER_BACKEND`` picks the implementation, ``WHISPER_MODEL`` the model size:
+
+- ``openai-whisper``: the reference PyTorch implementation.
+- ``faster-whisper``: CTranslate2 inference, int8 on CPU by default
+  (``WHISPER_COMPUTE_TYPE``), with ``WHISPER_CPU_THREADS`` intra-op threads per
+  model (0 lets CTranslate2 decide).
+
+Backends load their model in the constructor, so build them where they will run:
+in each transcription worker process, or lazily in-process.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+from typing import Any, Dict, List, NamedTuple, Optional, Type
+
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "openai-whisper")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", "5"))
+
+
+class Transcription(NamedTuple):
+    text: str
+    language: str
+    # Probability of ``language``; None when it was given as a hint, not detected.
+    language_probability: Optional[float] = None
+    # Mean per-segment average token log-probability; None without segments.
+    avg_logprob: Optional[float] = None
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+class TranscriptionBackend:
+    name = ""
+    module = ""  # the package that has to be importable
+
+    def transcribe(self, audio: Any, language: Optional[str] = None) -> Transcription:
+        """Transcribe 16 kHz mono float32 audio.
+
+        With ``language`` set, the language-detection pass is skipped.
+        """
+        raise NotImplementedError
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    name = "openai-whisper"
+    module = "whisper"
+
+    def __init__(self, model_name: str) -> None:
+        import whisper
+
+        self.model = whisper.load_model(model_name)
+
+    def _detect_language(self, audio: Any) -> "tuple[str, float]":
+        # The same pass transcribe() runs internally, kept so we see the probability.
+        import whisper
+
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(audio), self.model.dims.n_mels
+        )
+        _, probs = self.model.detect_language(mel.to(self.model.device))
+        language = max(probs, key=probs.get)
+        return language, float(probs[language])
+
+    def transcribe(self, audio: Any, language: Optional[str] = None) -> Transcription:
+        probability = None
+        if language is None:
+            language, probability = self._detect_language(audio)
+        result = self.model.transcribe(audio, language=language, task="transcribe")
+        return Transcription(
+            result.get("text", "").strip(),
+            result.get("language") or language,
+            probability,
+            _mean([segment["avg_logprob"] for segment in result.get("segments", [])]),
+        )
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    name = "faster-whisper"
+    module = "faster_whisper"
+
+    def __init__(
+        self,
+        model_name: str,
+        compute_type: str = WHISPER_COMPUTE_TYPE,
+        cpu_threads: int = WHISPER_CPU_THREADS,
+        beam_size: int = WHISPER_BEAM_SIZE,
+    ) -> None:
+        from faster_whisper import WhisperModel
+
+        self.beam_size = beam_size
+        self.model = WhisperModel(
+            model_name, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads
+        )
+
+    def transcribe(self, audio: Any, language: Optional[str] = None) -> Transcription:
+        segments, info = self.model.transcribe(
+            audio, language=language, task="transcribe", beam_size=self.beam_size
+        )
+        # segments is a generator; decoding happens while it is consumed.
+        segments = list(segments)
+        return Transcription(
+            "".join(segment.text for segment in segments).strip(),
+            info.language or "unknown",
+            info.language_probability if language is None else None,
+            _mean([segment.avg_logprob for segment in segments]),
+        )
+
+
+BACKENDS: Dict[str, Type[TranscriptionBackend]] = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def backend_available(backend: str = WHISPER_BACKEND) -> bool:
+    """Whether ``backend`` is known and its package is installed (without importing it)."""
+    factory = BACKENDS.get(backend)
+    if factory is None:
+        return False
+    return importlib.util.find_spec(factory.module) is not None
+
+
+def load_backend(
+    model_name: str, backend: str = WHISPER_BACKEND
+) -> TranscriptionBackend:
+    """Build ``backend`` with ``model_name``; the default loader for worker processes."""
+    try:
+        factory = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown WHISPER_BACKEND {backend!r}; expected one of {sorted(BACKENDS)}"
+        ) from None
+    return factory(model_name)
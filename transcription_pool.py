@@ -0,0 +1,202 @@
+"""Dedicated process pool for Whisper transcription with bounded admission.
+
+Each worker process loads its transcription backend (see
+``transcription_backends``) once in the pool initializer, so inference
+never runs in the API's threadpool or contends for its GIL. At most
+``workers + queue_size`` jobs are admitted; past that ``submit`` raises
+``TranscriptionQueueFull`` straight away so the API can answer 503 with a
+``Retry-After`` estimate instead of queueing without bound. If a worker
+dies (OOM kill, segfault in a native decoder) the jobs it held fail with
+``BrokenProcessPool`` and the next submission starts a fresh pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple
+
+from metrics import (
+    TRANSCRIPTION_INFERENCE,
+    TRANSCRIPTION_QUEUE_WAIT,
+    TRANSCRIPTION_REJECTED,
+)
+from transcription_backends import Transcription, TranscriptionBackend, load_backend
+
+WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS", "2"))
+WHISPER_QUEUE_SIZE = int(os.getenv("WHISPER_QUEUE_SIZE", "8"))
+
+logger = logging.getLogger("namo_nexus.transcription")
+
+_worker_model: Optional[TranscriptionBackend] = None
+
+
+class TranscriptionQueueFull(RuntimeError):
+    """Raised when every worker is busy and the submission queue is full."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Transcription queue is full")
+        self.retry_after = retry_after
+
+
+def _init_worker(
+    loader: Callable[[str], TranscriptionBackend], model_name: str
+) -> None:
+    global _worker_model
+    _worker_model = loader(model_name)
+
+
+def _transcribe_in_worker(
+    audio: Any, submitted_at: float, language: Optional[str] = None
+) -> Tuple[Transcription, float, float]:
+    started_at = time.time()
+    transcription = _worker_model.transcribe(audio, language)
+    inference = time.time() - started_at
+    return transcription, started_at - submitted_at, inference
+
+
+class TranscriptionPool:
+    def __init__(
+        self,
+        model_name: str,
+        workers: int = WHISPER_WORKERS,
+        queue_size: int = WHISPER_QUEUE_SIZE,
+        loader: Callable[[str], TranscriptionBackend] = load_backend,
+    ) -> None:
+        self.model_name = model_name
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_size)
+        self.loader = loader
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        self._in_flight = 0
+        self._avg_inference = 5.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def start(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs threads can deadlock.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.loader, self.model_name),
+                )
+                logger.info(
+                    "transcription_pool_started workers=%d capacity=%d model=%s",
+                    self.workers,
+                    self.capacity,
+                    self.model_name,
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Drop ``executor`` after a worker died so the next ``start`` replaces it."""
+        with self._executor_lock:
+            if self._executor is not executor:
+                return  # already replaced by another caller
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.warning("transcription_pool_broken restarting model=%s", self.model_name)
+
+    def _submit_to_executor(self, *args: Any) -> Tuple[Future, ProcessPoolExecutor]:
+        executor = self.start()
+        try:
+            return executor.submit(*args), executor
+        except BrokenProcessPool:
+            self._discard(executor)
+        executor = self.start()
+        return executor.submit(*args), executor
+
+    def warm_up(self, audio: Any) -> None:
+        """Start every worker and transcribe ``audio`` once per worker, blocking.
+
+        Meant for startup, before requests arrive, so it bypasses admission.
+        """
+        executor = self.start()
+        futures = [
+            executor.submit(_transcribe_in_worker, audio, time.time())
+            for _ in range(self.workers)
+        ]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    @property
+    def saturated(self) -> bool:
+        return self._in_flight >= self.capacity
+
+    def retry_after(self) -> float:
+        """Seconds until a slot is likely to free up, from the average inference time."""
+        backlog = max(1, self._in_flight - self.workers + 1)
+        return max(1.0, self._avg_inference * backlog / self.workers)
+
+    def submit(
+        self, audio: Any, language: Optional[str] = None
+    ) -> "Future[Transcription]":
+        if not self._slots.acquire(blocking=False):
+            TRANSCRIPTION_REJECTED.inc()
+            raise TranscriptionQueueFull(self.retry_after())
+        with self._count_lock:
+            self._in_flight += 1
+        try:
+            inner, executor = self._submit_to_executor(
+                _transcribe_in_worker, audio, time.time(), language
+            )
+        except Exception:
+            self._release()
+            raise
+        outer: "Future[Transcription]" = Future()
+
+        def _done(future: Future) -> None:
+            self._release()
+            try:
+                transcription, waited, inference = future.result()
+            except BaseException as exc:  # noqa: BLE001 - surfaced to the caller
+                if isinstance(exc, BrokenProcessPool):
+                    self._discard(executor)
+                outer.set_exception(exc)
+                return
+            TRANSCRIPTION_QUEUE_WAIT.observe(max(0.0, waited) * 1000.0)
+            TRANSCRIPTION_INFERENCE.observe(inference * 1000.0)
+            self._avg_inference = 0.8 * self._avg_inference + 0.2 * inference
+            outer.set_result(transcription)
+
+        inner.add_done_callback(_done)
+        return outer
+
+    def _release(self) -> None:
+        with self._count_lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    async def transcribe(
+        self, audio: Any, language: Optional[str] = None
+    ) -> Transcription:
+        return await asyncio.wrap_future(self.submit(audio, language))
+
+    def stats(self) -> dict:
+        return {
+            "started": self._executor is not None,
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+            "avg_inference_seconds": round(self._avg_inference, 3),
+        }
@@ -0,0 +1,188 @@
+"""Content-addressed cache for voice analysis results.
+
+Keys are the SHA-256 of the encoded audio plus every extractor setting that
+changes the output, so a retried upload or a replayed case file maps to the same
+entry while a different model or pitch tracker does not. Values are
+``VoiceAnalysisResult.to_full_dict()`` including the transcription. An
+in-memory LRU sits in front of an optional on-disk tier; both are bounded, the
+disk one by total bytes with least-recently-used files removed first.
+
+The disk tier is plain JSON, so results carrying a transcription are kept in
+memory only; what a caller said never lands on disk outside the encrypted
+database.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional
+
+from memory_diagnostics import register_size
+from metrics import VOICE_CACHE_LOOKUPS
+
+if TYPE_CHECKING:
+    from audio_decoder import AudioSource
+
+VOICE_CACHE_ENTRIES = int(os.getenv("VOICE_CACHE_ENTRIES", "256"))
+VOICE_CACHE_DIR = os.getenv("VOICE_CACHE_DIR", "")
+VOICE_CACHE_DISK_MAX_BYTES = int(
+    os.getenv("VOICE_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024))
+)
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+logger = logging.getLogger("namo_nexus.voice_cache")
+
+
+def content_key(source: "AudioSource", settings: Mapping[str, Any]) -> str:
+    """SHA-256 over the audio bytes followed by the canonical settings JSON.
+
+    File objects are hashed in chunks from the start and rewound afterwards.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    else:
+        source.seek(0)
+        for chunk in iter(lambda: source.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+        source.seek(0)
+    digest.update(b"\0")
+    digest.update(json.dumps(dict(settings), sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class VoiceResultCache:
+    def __init__(
+        self,
+        max_entries: int = VOICE_CACHE_ENTRIES,
+        disk_dir: Optional[str] = VOICE_CACHE_DIR or None,
+        disk_max_bytes: int = VOICE_CACHE_DISK_MAX_BYTES,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # key -> file size, least recently used first
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        if self.disk_dir is not None:
+            self._load_disk_index()
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _load_disk_index(self) -> None:
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.disk_dir.glob("??/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk_index[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                VOICE_CACHE_LOOKUPS.labels(result="memory").inc()
+                return dict(value)
+            value = self._read_disk(key)
+            if value is not None:
+                self._remember(key, value)
+                VOICE_CACHE_LOOKUPS.labels(result="disk").inc()
+                return dict(value)
+        VOICE_CACHE_LOOKUPS.labels(result="miss").inc()
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._remember(key, dict(value))
+            if self.disk_dir is not None and not value.get("transcription"):
+                self._write_disk(key, value)
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.disk_dir is None or key not in self._disk_index:
+            return None
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except (OSError, ValueError) as exc:
+            logger.warning("voice_cache_read_failed key=%s error=%s", key, exc)
+            self._forget_disk(key)
+            return None
+        self._disk_index.move_to_end(key)
+        return value
+
+    def _write_disk(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning("voice_cache_write_failed key=%s error=%s", key, exc)
+            return
+        self._disk_bytes += len(payload) - self._disk_index.pop(key, 0)
+        self._disk_index[key] = len(payload)
+        self._evict_disk()
+
+    def _forget_disk(self, key: str) -> None:
+        self._disk_bytes -= self._disk_index.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.disk_max_bytes and self._disk_index:
+            self._forget_disk(next(iter(self._disk_index)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk_index):
+                self._forget_disk(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "disk_entries": len(self._disk_index),
+            "disk_bytes": self._disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes if self.disk_dir is not None else 0,
+        }
+
+
+def build_voice_cache_from_env() -> Optional[VoiceResultCache]:
+    """VOICE_CACHE_ENTRIES=0 disables caching; VOICE_CACHE_DIR adds the disk tier."""
+    if VOICE_CACHE_ENTRIES <= 0:
+        return None
+    cache = VoiceResultCache()
+    register_size("voice_cache.memory_entries", lambda: len(cache._memory))
+    register_size("voice_cache.disk_entries", lambda: len(cache._disk_index))
+    return cache
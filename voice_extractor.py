@@ -13,18 +13,49 @@ Optionally transcribes audio to text using OpenAI Whisper.
 
 from __future__ import annotations
 
-import io
+import asyncio
+import functools
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import List, NamedTuple, Optional, Tuple
+
+from language_hints import LanguageHintCache
+from memory_diagnostics import register_size
+from transcription_backends import (
+    WHISPER_BACKEND,
+    WHISPER_COMPUTE_TYPE,
+    Transcription,
+    TranscriptionBackend,
+    backend_available,
+    load_backend,
+)
+from transcription_pool import WHISPER_WORKERS, TranscriptionPool, TranscriptionQueueFull
+from voice_cache import VoiceResultCache, build_voice_cache_from_env, content_key
 
 logger = logging.getLogger("namo_nexus.voice")
 
+# Feature extraction gets its own threads so audio load cannot starve the
+# default executor used by text triage and database calls.
+AUDIO_FEATURE_WORKERS = int(os.getenv("AUDIO_FEATURE_WORKERS", "2"))
+_feature_executor = ThreadPoolExecutor(
+    max_workers=AUDIO_FEATURE_WORKERS, thread_name_prefix="audio-features"
+)
+# Windows of one long recording are analyzed concurrently on these threads
+# (STFT, pitch and onset work is mostly NumPy/FFT code that releases the GIL).
+AUDIO_WINDOW_WORKERS = int(os.getenv("AUDIO_WINDOW_WORKERS", str(min(4, os.cpu_count() or 1))))
+_window_executor = ThreadPoolExecutor(
+    max_workers=AUDIO_WINDOW_WORKERS, thread_name_prefix="audio-windows"
+)
+
 # Graceful degradation for Librosa/Numpy (Fix for Windows/Python 3.13 issues)
 try:
     import librosa
     import numpy as np
+    from audio_decoder import AudioSource, decode_audio
     LIBROSA_AVAILABLE = True
 except (ImportError, OSError, RuntimeError) as e:
     logger.error(f"Audio processing libraries (Librosa/Numpy) not available: {e}")
@@ -35,13 +66,247 @@ except (ImportError, OSError, RuntimeError) as e:
     np = MockNp()
 
 
+# Part of every result cache key: bump it whenever _analyze_audio starts
+# returning different features for the same audio.
+VOICE_FEATURES_VERSION = 2
+
+# Analysis frame shared by every feature (librosa's defaults), so one STFT
+# serves pitch, energy, onsets and pauses.
+N_FFT = 2048
+HOP_LENGTH = 512
+PITCH_FMIN_HZ = 150.0
+PITCH_FMAX_HZ = 4000.0
+PITCH_THRESHOLD = 0.1
+# YIN searches the range of the human speaking voice.
+YIN_FMIN_HZ = 65.0
+YIN_FMAX_HZ = 500.0
+# RMS below this counts as a pause; YIN frames below it are unvoiced.
+SILENCE_THRESHOLD = 0.02
+
+# Whisper only sees voiced regions (RMS above SILENCE_THRESHOLD), each padded
+# so word onsets and tails survive; regions closer than the gap are merged.
+VAD_TRIM_ENABLED = os.getenv("VAD_TRIM_ENABLED", "true").lower() == "true"
+VAD_PADDING_SECONDS = float(os.getenv("VAD_PADDING_SECONDS", "0.25"))
+VAD_MIN_GAP_SECONDS = float(os.getenv("VAD_MIN_GAP_SECONDS", "0.5"))
+
+# Recordings longer than AUDIO_WINDOW_SECONDS are analyzed in windows. Each
+# window carries AUDIO_WINDOW_OVERLAP_SECONDS (at least N_FFT samples) of context
+# on both sides and only keeps the frames centred in its own core, so the
+# features match a single pass over the whole recording.
+AUDIO_WINDOW_SECONDS = float(os.getenv("AUDIO_WINDOW_SECONDS", "30"))
+AUDIO_WINDOW_OVERLAP_SECONDS = float(os.getenv("AUDIO_WINDOW_OVERLAP_SECONDS", "1.0"))
+# Longer speech is split for Whisper (whose own context is 30 s) at the quietest
+# hop near each limit; the pieces are transcribed in parallel and joined.
+TRANSCRIBE_WINDOW_SECONDS = float(os.getenv("TRANSCRIBE_WINDOW_SECONDS", "30"))
+
+# "piptrack" keeps every spectral peak; "yin" gives one f0 per voiced frame.
+PITCH_TRACKERS = ("piptrack", "yin")
+VOICE_PITCH_TRACKER = os.getenv("VOICE_PITCH_TRACKER", "piptrack").lower()
+
+
+@functools.lru_cache(maxsize=8)
+def _mel_basis(sr: int) -> "np.ndarray":
+    return librosa.filters.mel(sr=sr, n_fft=N_FFT)
+
+
+def _pitch_candidates(S: "np.ndarray", sr: int) -> "np.ndarray":
+    """Equivalent of ``librosa.piptrack(S=S, sr=sr)`` followed by ``pitches[pitches > 0]``."""
+    return _pitch_peaks(S, sr)[2]
+
+
+def _pitch_peaks(
+    S: "np.ndarray", sr: int
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Bin rows, frame columns and frequencies of the piptrack pitch candidates.
+    
+    Equivalent of ``librosa.piptrack(S=S, sr=sr)`` followed by ``pitches[pitches > 0]``.
+
+    piptrack interpolates every bin of the spectrum and then discards all but
+    the thresholded local maxima inside [fmin, fmax). Here the peak search is
+    restricted to that band (plus one neighbour row each side, so the stencils
+    see the same values) and the parabolic interpolation runs only at the peaks.
+    Candidates come out in the same frequency-major order.
+    """
+    n_bins = S.shape[0]
+    freqs = librosa.fft_frequencies(sr=sr, n_fft=N_FFT)
+    band = np.flatnonzero((freqs >= PITCH_FMIN_HZ) & (freqs < min(PITCH_FMAX_HZ, sr / 2)))
+    if band.size == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0, dtype=S.dtype)
+    lo, hi = int(band[0]), int(band[-1]) + 1
+    lo_pad, hi_pad = max(lo - 1, 0), min(hi + 1, n_bins)
+
+    ref = PITCH_THRESHOLD * S.max(axis=0, keepdims=True)
+    window = S[lo_pad:hi_pad]
+    peaks = librosa.util.localmax(window * (window > ref), axis=0)[lo - lo_pad : hi - lo_pad]
+    rows, cols = np.nonzero(peaks)
+    rows += lo
+
+    # librosa's parabolic stencil; the first and last bins never shift.
+    interior = (rows > 0) & (rows < n_bins - 1)
+    up = S[np.minimum(rows + 1, n_bins - 1), cols]
+    down = S[np.maximum(rows - 1, 0), cols]
+    a = up + down - 2 * S[rows, cols]
+    b = (up - down) / 2
+    valid = interior & (np.abs(b) < np.abs(a))
+    shift = np.zeros_like(a)
+    np.divide(-b, a, out=shift, where=valid)
+    return rows, cols, ((rows + shift) * float(sr) / N_FFT).astype(S.dtype)
+
+
+def _yin_pitch(y: "np.ndarray", sr: int, rms: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """One YIN f0 estimate per analysis frame plus a voiced flag per frame.
+
+    YIN always returns a period, even for silence or noise, so a frame counts
+    as voiced only when its RMS clears the pause threshold and the estimate is
+    not pinned to either end of the search range.
+    """
+    # Same N_FFT/HOP_LENGTH frames as rms, so the voicing mask lines up frame for
+    # frame. Reflect padding: zero-padded edge frames hold half a frame of
+    # silence, which YIN reads as a spurious high f0 while rms still counts
+    # them as voiced.
+    f0 = librosa.yin(
+        y,
+        fmin=YIN_FMIN_HZ,
+        fmax=YIN_FMAX_HZ,
+        sr=sr,
+        frame_length=N_FFT,
+        hop_length=HOP_LENGTH,
+        pad_mode="reflect",
+    )
+    n = min(len(f0), len(rms))
+    f0 = f0[:n]
+    voiced = (rms[:n] >= SILENCE_THRESHOLD) & (f0 > YIN_FMIN_HZ) & (f0 < YIN_FMAX_HZ)
+    return f0, voiced
+
+
+def _frame_rms(y: "np.ndarray") -> "np.ndarray":
+    return librosa.feature.rms(y=y, frame_length=N_FFT, hop_length=HOP_LENGTH)[0]
+
+
+def voiced_segments(
+    rms: "np.ndarray",
+    sr: int,
+    n_samples: int,
+    padding: float = VAD_PADDING_SECONDS,
+    min_gap: float = VAD_MIN_GAP_SECONDS,
+) -> "np.ndarray":
+    """``[start, end)`` sample ranges of the voiced runs in ``rms``, padded and merged.
+
+    Returns an ``(n, 2)`` integer array, empty when no frame clears the
+    silence threshold.
+    """
+    voiced = (rms >= SILENCE_THRESHOLD).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], voiced, [0])))
+    first, last = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    if first.size == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    pad = int(padding * sr)
+    starts = np.maximum(first * HOP_LENGTH - pad, 0)
+    ends = np.minimum(last * HOP_LENGTH + pad, n_samples)
+    # A run starts a new segment only when the silence before it is long enough.
+    opens = np.concatenate(([True], starts[1:] - ends[:-1] > int(min_gap * sr)))
+    heads = np.flatnonzero(opens)
+    tails = np.append(heads[1:] - 1, len(ends) - 1)
+    return np.stack([starts[heads], ends[tails]], axis=1)
+
+
+def analysis_windows(
+    n_samples: int,
+    sr: int,
+    window_seconds: float = AUDIO_WINDOW_SECONDS,
+    overlap_seconds: float = AUDIO_WINDOW_OVERLAP_SECONDS,
+) -> "np.ndarray":
+    """``(start, end, first, last)`` rows: window samples and core frames.
+    
+    The cores ``[first, last)`` tile the HOP_LENGTH frame grid; ``[start, end)``
+    adds the context on both sides and starts on a hop boundary. A recording
+    no longer than one window is a single window without context.
+    """
+    n_frames = 1 + n_samples // HOP_LENGTH
+    core = max(1, int(window_seconds * sr) // HOP_LENGTH)
+    context = -(-max(int(overlap_seconds * sr), N_FFT) // HOP_LENGTH)
+    firsts = np.arange(0, n_frames, core)
+    if len(firsts) > 1 and n_frames - firsts[-1] < core // 2:
+        firsts = firsts[:-1]  # fold a short tail into the previous window
+    lasts = np.append(firsts[1:], n_frames)
+    starts = np.maximum(firsts - context, 0) * HOP_LENGTH
+    ends = np.minimum((lasts + context) * HOP_LENGTH, n_samples)
+    return np.stack([starts, ends, firsts, lasts], axis=1)
+
+
+def split_for_transcription(
+    y: "np.ndarray", sr: int, max_seconds: float = TRANSCRIBE_WINDOW_SECONDS
+) -> List["np.ndarray"]:
+    """Consecutive views of ``y`` of at most ``max_seconds`` each.
+    
+    Every cut falls on the lowest-energy hop in the last quarter of the piece,
+    so words are rarely split and no overlap has to be reconciled.
+    """
+    limit = int(max_seconds * sr)
+    if len(y) <= limit:
+        return [y]
+    pieces = []
+    start = 0
+    while len(y) - start > limit:
+        search = start + limit * 3 // 4
+        frames = (start + limit - search) // HOP_LENGTH
+        energy = np.square(y[search : search + frames * HOP_LENGTH]).reshape(frames, HOP_LENGTH)
+        cut = search + int(np.argmin(energy.sum(axis=1))) * HOP_LENGTH
+        pieces.append(y[start:cut])
+        start = cut
+    pieces.append(y[start:])
+    return pieces
+
+
+def join_transcriptions(parts: List[Transcription]) -> Transcription:
+    """Stitch the transcriptions of consecutive pieces into one."""
+    if len(parts) == 1:
+        return parts[0]
+    logprobs = [part.avg_logprob for part in parts if part.avg_logprob is not None]
+    return Transcription(
+        " ".join(part.text for part in parts if part.text),
+        parts[0].language,
+        parts[0].language_probability,
+        sum(logprobs) / len(logprobs) if logprobs else None,
+    )
+
+
+class _WindowFeatures(NamedTuple):
+    first: int
+    last: int
+    pitch_values: "np.ndarray"
+    # Sort key restoring single-pass candidate order across windows.
+    pitch_order: "np.ndarray"
+    onset_envelope: "np.ndarray"
+
+
+def speech_only(y: "np.ndarray", segments: "np.ndarray") -> "np.ndarray":
+    """The samples inside ``segments``, joined; ``y`` itself when nothing is cut."""
+    if len(segments) == 1 and segments[0, 0] == 0 and segments[0, 1] >= len(y):
+        return y
+    return np.concatenate([y[start:end] for start, end in segments]) if len(segments) else y[:0]
+
+
 # Whisper is optional - will gracefully degrade if not available
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-    logger.warning("Whisper not installed. Speech-to-text will be disabled.")
+WHISPER_AVAILABLE = backend_available(WHISPER_BACKEND)
+if not WHISPER_AVAILABLE:
+    logger.warning(
+        "Transcription backend %s not installed. Speech-to-text will be disabled.",
+        WHISPER_BACKEND,
+    )
+
+# The API warms the model up in the background at startup (readiness waits for
+# it) so the first audio request after a deploy does not pay for the load.
+WHISPER_WARMUP = os.getenv("WHISPER_WARMUP", "true").lower() == "true"
+WHISPER_WARMUP_SECONDS = 1.0
+# In-process transcription only: load the model when this module is imported, so
+# a server that forks its workers after importing the app (gunicorn --preload)
+# shares the weights copy-on-write instead of loading one copy per worker.
+WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "false").lower() == "true"
+
+# VoiceExtractor.model_status values. "cold" loads on the first request.
+MODEL_STATUSES = ("disabled", "cold", "loading", "ready", "failed")
 
 
 @dataclass
@@ -63,6 +328,9 @@ class VoiceAnalysisResult:
     transcription: Optional[str] = None
     transcription_language: Optional[str] = None
     
+    # Per analysis window: start/end seconds, energy, pause ratio, pitch, tremor
+    timeline: Optional[List[dict]] = None
+    
     def to_voice_features_dict(self) -> dict:
         """Convert to format expected by TriageRequest.voice_features."""
         return {
@@ -83,6 +351,7 @@ class VoiceAnalysisResult:
             "duration_seconds": self.duration_seconds,
             "transcription": self.transcription,
             "transcription_language": self.transcription_language,
+            "timeline": self.timeline,
         }
 
 
@@ -107,6 +376,12 @@ class VoiceExtractor:
         sample_rate: int = 16000,
         whisper_model: str = "base",
         enable_transcription: bool = True,
+        transcription_backend: str = WHISPER_BACKEND,
+        transcription_pool: Optional[TranscriptionPool] = None,
+        pitch_tracker: str = VOICE_PITCH_TRACKER,
+        result_cache: Optional[VoiceResultCache] = None,
+        language_hints: Optional[LanguageHintCache] = None,
+        window_seconds: float = AUDIO_WINDOW_SECONDS,
     ) -> None:
         """Initialize the voice extractor.
         
@@ -114,33 +389,272 @@ class VoiceExtractor:
             sample_rate: Target sample rate for audio processing (default 16kHz)
             whisper_model: Whisper model size ('tiny', 'base', 'small', 'medium', 'large')
             enable_transcription: Whether to enable speech-to-text
+            transcription_backend: 'openai-whisper' or 'faster-whisper' (see transcription_backends)
+            transcription_pool: Worker processes for Whisper; None runs it in-process
+            pitch_tracker: 'piptrack' (spectral peaks) or 'yin' (one f0 per voiced frame)
+            result_cache: Memoizes results by audio content and these settings
+            language_hints: Remembers each speaker's language so Whisper can skip detection
+            window_seconds: Longer recordings are analyzed in parallel windows of this length
         """
+        if pitch_tracker not in PITCH_TRACKERS:
+            raise ValueError(f"pitch_tracker must be one of {PITCH_TRACKERS}, got {pitch_tracker!r}")
         self.sample_rate = sample_rate
-        self.enable_transcription = enable_transcription and WHISPER_AVAILABLE
+        self.pitch_tracker = pitch_tracker
+        self.enable_transcription = enable_transcription and backend_available(
+            transcription_backend
+        )
+        self.transcription_backend = transcription_backend
+        self.transcription_pool = transcription_pool
+        self.result_cache = result_cache
+        self.language_hints = language_hints
+        self.window_seconds = window_seconds
         self._whisper_model = None
         self._whisper_model_name = whisper_model
+        self._whisper_lock = threading.Lock()
+        self.model_status = "cold" if self.enable_transcription else "disabled"
+        self.model_error: Optional[str] = None
     
-    def _get_whisper_model(self):
-        """Lazy load Whisper model."""
+    def _get_whisper_model(self) -> Optional[TranscriptionBackend]:
+        """Lazy load the transcription backend."""
         if self._whisper_model is None and self.enable_transcription:
-            logger.info(f"Loading Whisper model: {self._whisper_model_name}")
-            self._whisper_model = whisper.load_model(self._whisper_model_name)
+            with self._whisper_lock:
+                # A warm-up and a request may both get here; only one loads.
+                if self._whisper_model is None:
+                    logger.info(
+                        f"Loading {self.transcription_backend} model: {self._whisper_model_name}"
+                    )
+                    self._whisper_model = load_backend(
+                        self._whisper_model_name, self.transcription_backend
+                    )
         return self._whisper_model
+
+    def warm_up(self) -> str:
+        """Load the model and run one short inference, blocking; returns model_status.
+
+        In pool mode every worker process is started and loads its own copy.
+        Failures are logged and reported as "failed"; requests then retry the
+        load lazily as before.
+        """
+        if not self.enable_transcription:
+            return self.model_status
+        self.model_status = "loading"
+        started = time.perf_counter()
+        # Quiet noise rather than zeros, so the decoder takes its usual path.
+        rng = np.random.default_rng(0)
+        audio = (0.001 * rng.standard_normal(int(self.sample_rate * WHISPER_WARMUP_SECONDS))).astype(
+            np.float32
+        )
+        try:
+            if self.transcription_pool is not None:
+                self.transcription_pool.warm_up(audio)
+            else:
+                self._get_whisper_model().transcribe(audio)
+        except Exception as exc:  # noqa: BLE001 - reported through model_status
+            logger.exception("whisper_warmup_failed model=%s", self._whisper_model_name)
+            self.model_error = str(exc)
+            self.model_status = "failed"
+        else:
+            logger.info(
+                "whisper_warmup_complete model=%s seconds=%.1f",
+                self._whisper_model_name,
+                time.perf_counter() - started,
+            )
+            self.model_error = None
+            self.model_status = "ready"
+        return self.model_status
+
+    def schedule_warm_up(self) -> Optional["asyncio.Task[str]"]:
+        """Run warm_up on a thread of the running loop; model_status is "loading" at once."""
+        if not self.enable_transcription:
+            return None
+        self.model_status = "loading"
+        return asyncio.get_running_loop().create_task(asyncio.to_thread(self.warm_up))
     
     def extract_from_bytes(
         self,
-        audio_bytes: bytes,
+        audio_bytes: AudioSource,
         transcribe: bool = True,
+        content_type: Optional[str] = None,
     ) -> VoiceAnalysisResult:
         """Extract features from audio bytes.
         
         Args:
             audio_bytes: Raw audio file bytes (WAV, MP3, etc.)
             transcribe: Whether to transcribe audio to text
+            content_type: Declared MIME type, used to pick the decoder
             
         Returns:
             VoiceAnalysisResult with extracted features
         """
+        transcribe = transcribe and self.enable_transcription
+        key = None
+        if self.result_cache is not None:
+            key = self.cache_key(audio_bytes, transcribe)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return VoiceAnalysisResult(**cached)
+        
+        result, y = self.analyze_bytes(audio_bytes, content_type)
+        if y is None:
+            return result
+        
+        # Optionally transcribe
+        if transcribe:
+            try:
+                transcription = self._transcribe(y, self._language_hint())
+                result.transcription = transcription.text
+                result.transcription_language = transcription.language
+            except Exception as e:
+                logger.warning(f"Transcription failed: {e}")
+                return result
+        
+        if key is not None:
+            self.result_cache.set(key, result.to_full_dict())
+        return result
+    
+    def cache_key(self, audio_bytes: AudioSource, transcribe: bool = True) -> str:
+        """Content address of ``audio_bytes`` under the current extractor settings."""
+        transcribe = transcribe and self.enable_transcription
+        return content_key(
+            audio_bytes,
+            {
+                "version": VOICE_FEATURES_VERSION,
+                "sample_rate": self.sample_rate,
+                "pitch_tracker": self.pitch_tracker,
+                "window_seconds": self.window_seconds,
+                "whisper_model": self._whisper_model_name if transcribe else None,
+                "whisper_backend": self.transcription_backend if transcribe else None,
+                "whisper_compute_type": (
+                    WHISPER_COMPUTE_TYPE
+                    if transcribe and self.transcription_backend == "faster-whisper"
+                    else None
+                ),
+                "vad_trim": VAD_TRIM_ENABLED if transcribe else None,
+                "transcribe_window_seconds": TRANSCRIBE_WINDOW_SECONDS if transcribe else None,
+            },
+        )
+    
+    def _cached_result(
+        self, audio_bytes: AudioSource
+    ) -> Tuple[Optional[str], Optional[VoiceAnalysisResult]]:
+        if self.result_cache is None:
+            return None, None
+        key = self.cache_key(audio_bytes)
+        cached = self.result_cache.get(key)
+        return key, VoiceAnalysisResult(**cached) if cached is not None else None
+    
+    def _language_hint(
+        self, user_id: Optional[str] = None, session_id: Optional[str] = None
+    ) -> Optional[str]:
+        if self.language_hints is None:
+            return None
+        if user_id is None:
+            return self.language_hints.default_language
+        return self.language_hints.hint(user_id, session_id)
+    
+    async def extract_async(
+        self,
+        audio_bytes: AudioSource,
+        content_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> VoiceAnalysisResult:
+        """Features plus transcription without blocking the event loop.
+        
+        A repeat of audio already analyzed with the same settings is answered
+        from ``result_cache``. Results are cached only when analysis and, if
+        enabled, transcription both succeeded. With ``user_id`` the speaker's
+        remembered language is passed to Whisper instead of detecting it.
+        
+        Raises:
+            TranscriptionQueueFull: when the worker pool cannot take more jobs
+        """
+        loop = asyncio.get_running_loop()
+        key, cached = await loop.run_in_executor(
+            _feature_executor, self._cached_result, audio_bytes
+        )
+        if cached is not None:
+            return cached
+        
+        pool = self.transcription_pool
+        if self.enable_transcription and pool is not None and pool.saturated:
+            raise TranscriptionQueueFull(pool.retry_after())
+        
+        result, y = await self.analyze_bytes_async(audio_bytes, content_type)
+        if y is None:
+            return result
+        
+        if self.enable_transcription:
+            hint = self._language_hint(user_id, session_id)
+            try:
+                transcription = await self.transcribe_async(y, hint)
+                result.transcription = transcription.text
+                result.transcription_language = transcription.language
+                if self.language_hints is not None and user_id is not None and len(y):
+                    self.language_hints.observe(user_id, session_id, hint, transcription)
+            except TranscriptionQueueFull:
+                raise
+            except Exception as e:
+                logger.warning(f"Transcription failed: {e}")
+                return result
+        
+        if key is not None:
+            self.result_cache.set(key, result.to_full_dict())
+        return result
+    
+    async def analyze_bytes_async(
+        self, audio_bytes: AudioSource, content_type: Optional[str] = None
+    ) -> Tuple[VoiceAnalysisResult, Optional[np.ndarray]]:
+        """Run ``analyze_bytes`` on the dedicated audio feature threads."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _feature_executor, self.analyze_bytes, audio_bytes, content_type
+        )
+    
+    async def transcribe_async(
+        self, y: np.ndarray, language: Optional[str] = None
+    ) -> Transcription:
+        """Transcribe without blocking the event loop.
+        
+        Raises:
+            TranscriptionQueueFull: when the worker pool cannot take more jobs
+        """
+        if len(y) == 0:
+            return Transcription("", "")
+        pool = self.transcription_pool
+        if pool is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_feature_executor, self._transcribe, y, language)
+        
+        pieces = [piece.astype(np.float32) for piece in split_for_transcription(y, self.sample_rate)]
+        first = await pool.transcribe(pieces[0], language)
+        # The rest reuse the first piece's language and run across the pool's
+        # workers, at most one per worker from this recording.
+        slots = asyncio.Semaphore(pool.workers)
+        
+        async def _piece(audio: np.ndarray) -> Transcription:
+            async with slots:
+                return await pool.transcribe(audio, language or first.language)
+        
+        rest = await asyncio.gather(*(_piece(piece) for piece in pieces[1:]))
+        return join_transcriptions([first, *rest])
+    
+    def analyze_bytes(
+        self, audio_bytes: AudioSource, content_type: Optional[str] = None
+    ) -> Tuple[VoiceAnalysisResult, Optional[np.ndarray]]:
+        """Decode and analyze audio without transcribing it.
+        
+        ``audio_bytes`` may also be a seekable binary file object, such as an
+        upload's spooled file, which is decoded without copying it to bytes.
+        
+        WAV/FLAC/OGG are read by libsndfile and compressed formats are
+        decoded and resampled by one ffmpeg pipe (see ``audio_decoder``).
+        
+        Returns:
+            The features, computed on the full recording, and the 16kHz
+            waveform to transcribe: only its voiced regions unless
+            VAD_TRIM_ENABLED is off. None when decoding or analysis failed.
+        """
         if not LIBROSA_AVAILABLE:
             logger.warning("Librosa unavailable. Returning dummy voice features.")
             return VoiceAnalysisResult(
@@ -152,18 +666,14 @@ class VoiceExtractor:
                 pitch_mean_hz=0.0,
                 duration_seconds=1.0,
                 transcription="[Audio analysis unavailable - Librosa missing]"
-            )
+            ), None
 
-        # Load audio with librosa
         try:
-            y, sr = librosa.load(
-                io.BytesIO(audio_bytes),
-                sr=self.sample_rate,
-                mono=True,
-            )
+            y = decode_audio(audio_bytes, self.sample_rate, content_type)
+            rms = _frame_rms(y)
             
             # Extract acoustic features
-            result = self._analyze_audio(y, sr)
+            return self._analyze_audio(y, self.sample_rate, rms), self._speech(y, rms)
         except Exception as e:
             logger.error(f"Audio processing failed: {e}")
             return VoiceAnalysisResult(
@@ -175,18 +685,7 @@ class VoiceExtractor:
                 pitch_mean_hz=0.0,
                 duration_seconds=1.0,
                 transcription=f"[Audio analysis failed: {e}]"
-            )
-        
-        # Optionally transcribe
-        if transcribe and self.enable_transcription:
-            try:
-                text, lang = self._transcribe(y)
-                result.transcription = text
-                result.transcription_language = lang
-            except Exception as e:
-                logger.warning(f"Transcription failed: {e}")
-        
-        return result
+            ), None
     
     def extract_from_file(
         self,
@@ -217,7 +716,8 @@ class VoiceExtractor:
 
         try:
             y, sr = librosa.load(file_path, sr=self.sample_rate, mono=True)
-            result = self._analyze_audio(y, sr)
+            rms = _frame_rms(y)
+            result = self._analyze_audio(y, sr, rms)
         except Exception as e:
             logger.error(f"Audio processing failed: {e}")
             return VoiceAnalysisResult(
@@ -233,20 +733,35 @@ class VoiceExtractor:
         
         if transcribe and self.enable_transcription:
             try:
-                text, lang = self._transcribe(y)
-                result.transcription = text
-                result.transcription_language = lang
+                transcription = self._transcribe(self._speech(y, rms), self._language_hint())
+                result.transcription = transcription.text
+                result.transcription_language = transcription.language
             except Exception as e:
                 logger.warning(f"Transcription failed: {e}")
         
         return result
     
-    def _analyze_audio(self, y: np.ndarray, sr: int) -> VoiceAnalysisResult:
+    def _speech(self, y: np.ndarray, rms: np.ndarray) -> np.ndarray:
+        """The part of ``y`` worth transcribing."""
+        if not VAD_TRIM_ENABLED:
+            return y
+        speech = speech_only(y, voiced_segments(rms, self.sample_rate, len(y)))
+        logger.debug(
+            "vad_trim speech_seconds=%.2f recording_seconds=%.2f",
+            len(speech) / self.sample_rate,
+            len(y) / self.sample_rate,
+        )
+        return speech
+    
+    def _analyze_audio(
+        self, y: np.ndarray, sr: int, rms: Optional[np.ndarray] = None
+    ) -> VoiceAnalysisResult:
         """Core audio analysis logic.
         
         Args:
             y: Audio time series (mono)
             sr: Sample rate
+            rms: Frame RMS of ``y`` on the N_FFT/HOP_LENGTH grid, if already computed
             
         Returns:
             VoiceAnalysisResult with acoustic features
@@ -254,7 +769,7 @@ class VoiceExtractor:
         duration = len(y) / sr
         
         # Handle very short or silent audio
-        if duration < 0.5 or np.max(np.abs(y)) < 0.001:
+        if duration < 0.5 or max(float(y.max()), -float(y.min())) < 0.001:
             return VoiceAnalysisResult(
                 pitch_variance=0.5,
                 energy=0.0,
@@ -265,9 +780,28 @@ class VoiceExtractor:
                 duration_seconds=duration,
             )
         
-        # Pitch analysis using piptrack
-        pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-        pitch_values = pitches[pitches > 0]
+        # Energy analysis (RMS). Time-domain on the same frame grid: the
+        # spectral estimate is Hann-weighted and would shift the pause threshold.
+        if rms is None:
+            rms = _frame_rms(y)
+        energy_mean = float(np.mean(rms))
+        # Normalize: typical voice RMS 0.01-0.1 -> 0-1
+        energy = min(energy_mean * 10, 1.0)
+        
+        # Spectral features per window: only AUDIO_WINDOW_WORKERS windows'
+        # spectrograms exist at once, however long the recording is.
+        windows = analysis_windows(len(y), sr, self.window_seconds)
+        analyze = functools.partial(self._analyze_window, y, sr, rms)
+        if len(windows) == 1:
+            parts = [analyze(windows[0])]
+        else:
+            parts = list(_window_executor.map(analyze, windows))
+        
+        # Pitch analysis
+        pitch_values = np.concatenate([part.pitch_values for part in parts])
+        if len(parts) > 1:
+            order = np.concatenate([part.pitch_order for part in parts])
+            pitch_values = pitch_values[np.argsort(order, kind="stable")]
         
         if len(pitch_values) > 0:
             pitch_mean = float(np.mean(pitch_values))
@@ -278,22 +812,19 @@ class VoiceExtractor:
             pitch_mean = 0.0
             pitch_variance = 0.5  # Default to neutral
         
-        # Energy analysis (RMS)
-        rms = librosa.feature.rms(y=y)[0]
-        energy_mean = float(np.mean(rms))
-        # Normalize: typical voice RMS 0.01-0.1 -> 0-1
-        energy = min(energy_mean * 10, 1.0)
-        
-        # Speech rate via onset detection
+        # Speech rate via onset detection. Peaks are picked on the joined
+        # envelope, whose normalization spans the whole recording.
         # More onsets per second = faster speech
-        onsets = librosa.onset.onset_detect(y=y, sr=sr)
+        onset_envelope = np.concatenate([part.onset_envelope for part in parts])
+        onsets = librosa.onset.onset_detect(
+            onset_envelope=onset_envelope, sr=sr, hop_length=HOP_LENGTH
+        )
         onsets_per_second = len(onsets) / duration if duration > 0 else 0
         # Typical speech: 2-6 syllables per second
         speech_rate = min(onsets_per_second / 6.0, 1.0)
         
         # Pause analysis
-        silence_threshold = 0.02
-        silent_frames = np.sum(rms < silence_threshold)
+        silent_frames = np.sum(rms < SILENCE_THRESHOLD)
         pause_ratio = float(silent_frames / len(rms)) if len(rms) > 0 else 0.0
         
         # Tremor detection (short-term pitch instability)
@@ -307,8 +838,49 @@ class VoiceExtractor:
             tremor_index=tremor_index,
             pitch_mean_hz=pitch_mean,
             duration_seconds=duration,
+            timeline=[self._window_summary(part, rms, sr, duration) for part in parts],
         )
     
+    def _analyze_window(
+        self, y: np.ndarray, sr: int, rms: np.ndarray, window: np.ndarray
+    ) -> _WindowFeatures:
+        """Pitch candidates and onset strength of the frames in one window's core."""
+        start, end, first, last = (int(value) for value in window)
+        offset = start // HOP_LENGTH
+        lo, hi = first - offset, last - offset
+        segment = y[start:end]
+        
+        # One STFT feeds pitch tracking and onset strength
+        S = np.abs(librosa.stft(segment, n_fft=N_FFT, hop_length=HOP_LENGTH))
+        
+        if self.pitch_tracker == "yin":
+            f0, voiced = _yin_pitch(segment, sr, rms[offset : offset + S.shape[1]])
+            frames = np.flatnonzero(voiced[lo:hi]) + lo
+            pitch_values = f0[frames]
+            pitch_order = frames + offset
+        else:
+            rows, cols, pitch_values = _pitch_peaks(S[:, lo:hi], sr)
+            # Frequency-major, like a single pass over the whole recording.
+            pitch_order = (rows.astype(np.int64) << 32) | (cols + first)
+        
+        mel_db = librosa.power_to_db(_mel_basis(sr) @ (S ** 2))
+        onset_envelope = librosa.onset.onset_strength(S=mel_db, sr=sr, hop_length=HOP_LENGTH)
+        return _WindowFeatures(first, last, pitch_values, pitch_order, onset_envelope[lo:hi])
+    
+    def _window_summary(
+        self, part: _WindowFeatures, rms: np.ndarray, sr: int, duration: float
+    ) -> dict:
+        window_rms = rms[part.first : part.last]
+        has_pitch = len(part.pitch_values) > 0
+        return {
+            "start_seconds": part.first * HOP_LENGTH / sr,
+            "end_seconds": min(part.last * HOP_LENGTH / sr, duration),
+            "energy": min(float(np.mean(window_rms)) * 10, 1.0),
+            "pause_ratio": float(np.mean(window_rms < SILENCE_THRESHOLD)),
+            "pitch_mean_hz": float(np.mean(part.pitch_values)) if has_pitch else 0.0,
+            "tremor_index": self._detect_tremor(part.pitch_values),
+        }
+    
     def _detect_tremor(self, pitch_values: np.ndarray) -> float:
         """Detect voice tremor from short-term pitch instability.
         
@@ -329,47 +901,44 @@ class VoiceExtractor:
         if window_size < 3:
             return 0.0
         
-        local_vars = []
-        for i in range(0, len(pitch_values) - window_size, window_size // 2):
-            window = pitch_values[i:i + window_size]
-            if len(window) > 1:
-                local_vars.append(np.std(window))
-        
-        if not local_vars:
-            return 0.0
+        # Windows start every window_size // 2 samples, stopping short of the last full one
+        windows = np.lib.stride_tricks.sliding_window_view(pitch_values, window_size)
+        local_vars = np.std(windows[: len(pitch_values) - window_size : window_size // 2], axis=1)
         
         # High local variance = tremor
         # Normalize: typical tremor std 10-50 Hz -> 0-1
         mean_local_var = float(np.mean(local_vars))
         return min(mean_local_var / 50.0, 1.0)
     
-    def _transcribe(self, y: np.ndarray) -> Tuple[str, str]:
+    def _transcribe(self, y: np.ndarray, language: Optional[str] = None) -> Transcription:
         """Transcribe audio using Whisper.
         
         Args:
             y: Audio time series (must be 16kHz mono)
+            language: Language hint; None runs Whisper's language detection
             
         Returns:
-            Tuple of (transcription text, detected language)
+            Transcription with text, language and confidence
         """
-        model = self._get_whisper_model()
-        if model is None:
-            return "", ""
-        
-        # Whisper expects float32 audio
-        audio = y.astype(np.float32)
-        
-        # Transcribe with automatic language detection
-        result = model.transcribe(
-            audio,
-            language=None,  # Auto-detect
-            task="transcribe",
-        )
+        if len(y) == 0:
+            return Transcription("", "")  # nothing voiced, so nothing for Whisper to hear
+        model = None
+        if self.transcription_pool is None:
+            model = self._get_whisper_model()
+            if model is None:
+                return Transcription("", "")
         
-        text = result.get("text", "").strip()
-        language = result.get("language", "unknown")
-        
-        return text, language
+        # Long speech goes in pieces, each after the first in its language.
+        parts: List[Transcription] = []
+        for piece in split_for_transcription(y, self.sample_rate):
+            hint = language or (parts[0].language if parts else None)
+            # Whisper expects float32 audio
+            audio = piece.astype(np.float32)
+            if model is None:
+                parts.append(self.transcription_pool.submit(audio, hint).result())
+            else:
+                parts.append(model.transcribe(audio, hint))
+        return join_transcriptions(parts)
 
 
 def calculate_voice_stress_score(features: VoiceAnalysisResult) -> float:
@@ -423,8 +992,30 @@ def calculate_voice_stress_score(features: VoiceAnalysisResult) -> float:
 WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
 ENABLE_TRANSCRIPTION = os.getenv("ENABLE_TRANSCRIPTION", "true").lower() == "true"
 
+# Whisper runs in WHISPER_WORKERS processes; set it to 0 to keep it in-process.
+transcription_pool = (
+    TranscriptionPool(
+        WHISPER_MODEL, loader=functools.partial(load_backend, backend=WHISPER_BACKEND)
+    )
+    if ENABLE_TRANSCRIPTION and WHISPER_AVAILABLE and WHISPER_WORKERS > 0
+    else None
+)
+
+# Repeat uploads are answered from here; see voice_cache for the settings.
+voice_result_cache = build_voice_cache_from_env()
+
+# Detected languages per user/session, passed back to Whisper as hints.
+language_hints = LanguageHintCache()
+register_size("voice.language_hints", lambda: len(language_hints))
+
 # Singleton instance
 voice_extractor = VoiceExtractor(
     whisper_model=WHISPER_MODEL,
     enable_transcription=ENABLE_TRANSCRIPTION,
+    transcription_pool=transcription_pool,
+    result_cache=voice_result_cache,
+    language_hints=language_hints,
 )
+
+if WHISPER_PRELOAD and transcription_pool is None and voice_extractor.enable_transcription:
+    voice_extractor._get_whisper_model()